@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Newest-first sort of export rows: string date parsing vs epoch keys.
+
+`legacy` is the old exporter sort, which calls the try/except `parse_date`
+cascade for every row on every sort. `epoch` builds `Announcement` records
+(dates parsed once, memoized) and sorts on their `ts`. `batch` parses the
+same strings with `DateParser.parse_many`. Timestamps repeat the way real
+announcements do (many share a minute), in the `dd/mm/YYYY hh:mm:ss AM`
+layout that the old cascade reached last.
+
+Run from the project root:
+    python -m benchmarks.bench_dates
+    python -m benchmarks.bench_dates --rows 1000000 --layout iso
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import List
+
+import pandas  # noqa: F401  (parse_many's vectorized path; import kept out of timings)
+
+from scraper.dates import DateParser, sort_key
+from scraper.records import Announcement
+
+
+def legacy_parse_date(s: str) -> datetime:
+    if not s:
+        return datetime.min
+    try:
+        return datetime.fromisoformat(s)
+    except Exception:
+        pass
+    fmts = [
+        "%Y-%m-%dT%H:%M:%S",
+        "%Y-%m-%d %H:%M:%S",
+        "%d/%m/%Y %I:%M:%S %p",
+        "%d/%m/%Y",
+    ]
+    for f in fmts:
+        try:
+            return datetime.strptime(s, f)
+        except Exception:
+            continue
+    return datetime.min
+
+
+def _dates(n: int, layout: str, seed: int = 7) -> List[str]:
+    rnd = random.Random(seed)
+    fmt = "%Y-%m-%dT%H:%M:%S" if layout == "iso" else "%d/%m/%Y %I:%M:%S %p"
+    # ~20 announcements per distinct minute
+    minutes = max(1, n // 20)
+    base = datetime(2000, 1, 1).timestamp()
+    stamps = [
+        datetime.fromtimestamp(base + rnd.randrange(25 * 365 * 1440) * 60).strftime(fmt)
+        for _ in range(minutes)
+    ]
+    return [rnd.choice(stamps) for _ in range(n)]
+
+
+def run(args: argparse.Namespace) -> None:
+    dates = _dates(args.rows, args.layout)
+    print(f"{args.rows} rows, {len(set(dates))} distinct timestamps ({args.layout})")
+
+    rows = [{"Tanggal_Pengumuman": d} for d in dates]
+    t0 = time.perf_counter()
+    rows.sort(key=lambda r: legacy_parse_date(r["Tanggal_Pengumuman"]), reverse=True)
+    legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    records = [Announcement("BBRI", "x", d) for d in dates]
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    records.sort(key=lambda a: sort_key(a.ts), reverse=True)
+    resort = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    DateParser().parse_many(dates)
+    batch = time.perf_counter() - t0
+
+    assert [r["Tanggal_Pengumuman"] for r in rows] == [a.tanggal for a in records]
+    print(f"legacy sort (parse per row)     {legacy:8.3f}s")
+    print(f"epoch: build records + parse    {build:8.3f}s")
+    print(f"epoch: sort on stored ts        {resort:8.3f}s")
+    print(f"batch parse_many                {batch:8.3f}s")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--rows", type=int, default=200_000)
+    p.add_argument("--layout", choices=["iso", "dmy"], default="dmy")
+    run(p.parse_args())
+
+
+if __name__ == "__main__":
+    main()
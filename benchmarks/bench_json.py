@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the JSON backends on GetAnnouncement payloads.
+
+Times decoding of response bodies and the indented encode used for
+storage-state rewrites, for every backend that is installed (stdlib `json`,
+orjson, msgspec). Payloads are the recorded responses in the on-disk
+response cache when it has any, files given with `--payload`, or a
+synthetic page otherwise.
+
+Run from the project root:
+    python -m benchmarks.bench_json
+    python -m benchmarks.bench_json --payload resp1.json resp2.json --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from benchmarks.bench_sweep import _synthetic_corpus
+from scraper import jsonlib
+from scraper.cache import DEFAULT_CACHE_PATH
+
+
+def _cached_bodies(path: Path, limit: int) -> List[bytes]:
+    if not path.exists():
+        return []
+    conn = sqlite3.connect(str(path))
+    try:
+        rows = conn.execute(
+            "SELECT body FROM responses ORDER BY size DESC LIMIT ?", (limit,)
+        ).fetchall()
+    except sqlite3.Error:
+        return []
+    finally:
+        conn.close()
+    return [bytes(r[0]) for r in rows]
+
+
+def _load_payloads(args: argparse.Namespace) -> List[bytes]:
+    if args.payload:
+        return [Path(p).read_bytes() for p in args.payload]
+    bodies = _cached_bodies(Path(args.cache), args.limit)
+    if bodies:
+        print(f"Using {len(bodies)} recorded response(s) from {args.cache}")
+        return bodies
+    print("No recorded responses found; using a synthetic 1000-reply page")
+    replies = _synthetic_corpus(1000)
+    return [jsonlib.dumps({"ResultCount": len(replies), "Replies": replies})]
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(args: argparse.Namespace) -> None:
+    payloads = _load_payloads(args)
+    total = sum(len(p) for p in payloads)
+    decoded = [jsonlib.loads(p) for p in payloads]
+
+    print(f"{len(payloads)} payload(s), {total} bytes; best of {args.repeat}")
+    print(f"{'backend':<10} {'decode ms':>10} {'MB/s':>8} {'encode ms':>10}")
+    for name in jsonlib._BACKENDS:
+        picked, impl = jsonlib._select(name)
+        if picked != name:
+            continue
+        loads, dumps = impl["loads"], impl["dumps"]
+        dec = _time(lambda: [loads(p) for p in payloads], args.repeat)
+        enc = _time(lambda: [dumps(d, True) for d in decoded], args.repeat)
+        mbps = total / dec / 1e6 if dec else float("inf")
+        print(f"{name:<10} {dec * 1e3:>10.2f} {mbps:>8.1f} {enc * 1e3:>10.2f}")
+    print(f"active backend: {jsonlib.BACKEND}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--payload", nargs="*", help="Recorded response body files")
+    p.add_argument("--cache", default=str(DEFAULT_CACHE_PATH))
+    p.add_argument("--limit", type=int, default=20, help="Max cached bodies to use")
+    p.add_argument("--repeat", type=int, default=20)
+    run(p.parse_args())
+
+
+if __name__ == "__main__":
+    main()
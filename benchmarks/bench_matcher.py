@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Keyword-matching throughput: per-call regex work vs a compiled KeywordMatcher.
+
+`legacy` is the old `filter_reply` body, which re-normalizes every keyword
+and rebuilds its patterns for each reply. `matcher` is one `KeywordMatcher`
+built up front. `batch` classifies whole pages with `classify_replies`, and
+`stored` does the same over replies carrying a precomputed `search_text`
+(re-classifying saved announcements).
+Replies are drawn round-robin from a synthetic pool, so 10^6 replies don't
+need 10^6 distinct dicts in memory.
+
+Run from the project root:
+    python -m benchmarks.bench_matcher
+    python -m benchmarks.bench_matcher --counts 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from itertools import cycle, islice
+from typing import Callable, Dict, Iterable, List
+
+from benchmarks.bench_sweep import _synthetic_corpus
+from scraper.idx_api import DEFAULT_KEYWORDS
+from scraper.matcher import (
+    KeywordMatcher,
+    add_search_text,
+    classify_replies,
+    normalize_keyword,
+)
+
+
+def legacy_filter_reply(reply: Dict, keywords: Iterable[str]) -> bool:
+    if not reply:
+        return False
+    normalized_keywords = [
+        re.sub(r"[^0-9a-z]+", " ", normalize_keyword(k)) for k in keywords if k
+    ]
+    if not normalized_keywords:
+        return False
+    peng = reply.get("pengumuman") or {}
+    candidates = []
+    for key in ("JudulPengumuman", "PerihalPengumuman", "NoPengumuman", "Kode_Emiten"):
+        v = peng.get(key)
+        if v:
+            candidates.append(str(v))
+    for att in reply.get("attachments") or []:
+        orig = att.get("OriginalFilename") or att.get("PDFFilename")
+        if orig:
+            candidates.append(str(orig))
+    hay_norm = re.sub(r"[^0-9a-z]+", " ", "\n".join(candidates).lower())
+    for k in normalized_keywords:
+        if k and k in hay_norm:
+            return True
+    return False
+
+
+def _throughput(check: Callable[[Dict], bool], pool: List[Dict], n: int):
+    t0 = time.perf_counter()
+    hits = sum(1 for rep in islice(cycle(pool), n) if check(rep))
+    wall = time.perf_counter() - t0
+    return n / wall, hits
+
+
+def _batch_throughput(
+    matcher: KeywordMatcher, pool: List[Dict], n: int, page: int
+):
+    replies = cycle(pool)
+    t0 = time.perf_counter()
+    hits = done = 0
+    while done < n:
+        batch = list(islice(replies, min(page, n - done)))
+        hits += sum(classify_replies(batch, matcher))
+        done += len(batch)
+    wall = time.perf_counter() - t0
+    return n / wall, hits
+
+
+def run(args: argparse.Namespace) -> None:
+    pool = _synthetic_corpus(args.pool)
+    stored_pool = [dict(r) for r in pool]
+    add_search_text(stored_pool)
+    keywords = list(DEFAULT_KEYWORDS)
+    matcher = KeywordMatcher(keywords)
+    modes = {
+        "legacy": lambda rep: legacy_filter_reply(rep, keywords),
+        "matcher": matcher.match_reply,
+    }
+    print(f"{len(keywords)} keywords, pool of {len(pool)} distinct replies")
+    print(f"{'replies':>9} {'mode':<8} {'replies/s':>12} {'matches':>8}")
+    for n in args.counts:
+        results = {}
+        for name, check in modes.items():
+            rate, hits = _throughput(check, pool, n)
+            results[name] = hits
+            print(f"{n:>9} {name:<8} {rate:>12,.0f} {hits:>8}")
+        rate, hits = _batch_throughput(matcher, pool, n, args.page_size)
+        results["batch"] = hits
+        print(f"{n:>9} {'batch':<8} {rate:>12,.0f} {hits:>8}")
+        rate, hits = _batch_throughput(matcher, stored_pool, n, args.page_size)
+        results["stored"] = hits
+        print(f"{n:>9} {'stored':<8} {rate:>12,.0f} {hits:>8}")
+        assert len(set(results.values())) == 1, "modes disagree"
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--counts", type=int, nargs="+", default=[100_000, 1_000_000])
+    p.add_argument("--pool", type=int, default=10_000)
+    p.add_argument("--page-size", type=int, default=1000, help="Batch size")
+    run(p.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Memory held by collected export rows: nested dicts vs `Announcement` records.
+
+Replies are generated one at a time and fed through each collection path,
+so only what the path retains (rows plus any dedup set) is measured with
+`tracemalloc`. `replies` is the cost of keeping the raw API replies around,
+for reference. `dicts` is the old `collect_rows` body: one dict per row and
+a (kode, judul, tanggal) tuple per seen key. `records` is the current
+`collect_rows`, which keeps no dedup set (`write_rows_csv` dedups).
+
+Run from the project root:
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --counts 100000 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import tracemalloc
+from typing import Callable, Dict, Iterator, List
+
+from export_idx_keywords_csv import collect_rows
+
+EMITENS = ["BBRI", "BBCA", "TLKM", "ASII", "BMRI", "GOTO", "UNVR", "ANTM"]
+
+
+def _replies(n: int, seed: int = 7) -> Iterator[Dict]:
+    rnd = random.Random(seed)
+    for i in range(n):
+        # codes arrive padded and freshly decoded, as in API payloads
+        kode = rnd.choice(EMITENS) + " "
+        yield {
+            "pengumuman": {
+                "Id2": str(100000 + i),
+                "NoPengumuman": "%05d/BEI.PP1/%02d-2024" % (i % 99999, i % 12 + 1),
+                "TglPengumuman": "2024-%02d-%02dT%02d:%02d:00"
+                % (i % 12 + 1, i % 28 + 1, i % 24, i % 60),
+                "JudulPengumuman": "Keterbukaan Informasi %d Penawaran Tender" % i,
+                "PerihalPengumuman": "Perihal %d" % i,
+                "Kode_Emiten": kode,
+                "JenisPengumuman": "Keterbukaan Informasi",
+            },
+            "attachments": [
+                {"OriginalFilename": "lampiran_%d.pdf" % i, "PDFFilename": "x.pdf"}
+            ],
+        }
+
+
+def _legacy_collect(replies, rows: List[Dict[str, str]], seen) -> None:
+    for r in replies:
+        peng = r.get("pengumuman") or {}
+        kode = (peng.get("Kode_Emiten") or "").strip()
+        judul = (peng.get("JudulPengumuman") or "").strip()
+        tanggal = (peng.get("TglPengumuman") or "").strip()
+        key = (kode, judul, tanggal)
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append(
+            {
+                "Kode_Emiten": kode,
+                "Judul_Pengumuman": judul,
+                "Tanggal_Pengumuman": tanggal,
+            }
+        )
+
+
+def _retained(build: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+
+def run(args: argparse.Namespace) -> None:
+    print(f"{'rows':>9} {'mode':<8} {'MiB':>9} {'bytes/row':>10}")
+    for n in args.counts:
+
+        def keep_replies():
+            return list(_replies(n))
+
+        def dicts():
+            rows, seen = [], set()
+            _legacy_collect(_replies(n), rows, seen)
+            return rows, seen
+
+        def records():
+            rows = []
+            collect_rows(_replies(n), rows)
+            return rows
+
+        for name, build in (
+            ("replies", keep_replies),
+            ("dicts", dicts),
+            ("records", records),
+        ):
+            used = _retained(build)
+            print(f"{n:>9} {name:<8} {used / 2**20:>9.1f} {used / n:>10.0f}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--counts", type=int, nargs="+", default=[100_000])
+    run(p.parse_args())
+
+
+if __name__ == "__main__":
+    main()
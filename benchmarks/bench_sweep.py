@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Compare per-keyword queries against a single unfiltered sweep.
+
+Reports API request count, response bytes and wall time for both modes over
+the same date window. By default it hits the live IDX API; `--simulate`
+replays a synthetic corpus through a fake session with a fixed per-request
+latency so the comparison can run offline.
+
+Run from the project root:
+    python -m benchmarks.bench_sweep --date-from 20251010 --date-to 20251013
+    python -m benchmarks.bench_sweep --simulate --announcements 400 --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from scraper.idx_api import (
+    DEFAULT_KEYWORDS,
+    IdxClient,
+    fetch_matching_announcements,
+    fetch_replies_for_keyword,
+    filter_reply,
+)
+from scraper.ratelimit import RateLimiter
+
+
+class _SimResponse:
+    def __init__(self, payload: Dict) -> None:
+        self.status_code = 200
+        self.content = json.dumps(payload).encode("utf-8")
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int = 1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+    def json(self) -> Dict:
+        return self._payload
+
+
+def _synthetic_corpus(n: int, seed: int = 7) -> List[Dict]:
+    rnd = random.Random(seed)
+    filler = ["Laporan Keuangan", "Penyampaian Bukti Iklan", "Public Expose", "RUPS"]
+    replies = []
+    for i in range(n):
+        words = [rnd.choice(filler)]
+        if rnd.random() < 0.3:
+            words.append(rnd.choice(DEFAULT_KEYWORDS))
+        replies.append(
+            {
+                "pengumuman": {
+                    "Id2": str(i),
+                    "NoPengumuman": f"{i:05d}/BEI/2025",
+                    "Kode_Emiten": rnd.choice(["BBRI", "TLKM", "ASII", "GOTO"]),
+                    "JudulPengumuman": " ".join(words),
+                    "PerihalPengumuman": " ".join(words),
+                    "TglPengumuman": "2025-10-%02dT08:00:00" % (10 + i % 4),
+                },
+                "attachments": [{"OriginalFilename": f"dokumen_{i}.pdf"}],
+            }
+        )
+    return replies
+
+
+def _simulated_client(corpus: List[Dict], latency: float) -> IdxClient:
+    session = requests.Session()
+
+    def fake_get(url, params=None, headers=None, timeout=None, stream=False):
+        time.sleep(latency)
+        if not params:
+            return _SimResponse({})
+        kw = params.get("keyword") or ""
+        hits = [r for r in corpus if filter_reply(r, [kw])] if kw else corpus
+        start = int(params["indexFrom"])
+        size = int(params["pageSize"])
+        return _SimResponse(
+            {"ResultCount": len(hits), "Replies": hits[start : start + size]}
+        )
+
+    session.get = fake_get
+    # the simulated server needs no protecting
+    return IdxClient(session=session, rate_limiter=RateLimiter(rate=0))
+
+
+def _key(reply: Dict) -> str:
+    peng = reply.get("pengumuman") or {}
+    return peng.get("Id2") or json.dumps(peng, sort_keys=True)
+
+
+def run(args: argparse.Namespace) -> None:
+    corpus: Optional[List[Dict]] = (
+        _synthetic_corpus(args.announcements) if args.simulate else None
+    )
+
+    def new_client() -> IdxClient:
+        if corpus is not None:
+            return _simulated_client(corpus, args.latency)
+        return IdxClient(pool_size=max(10, args.concurrency))
+
+    results = []
+
+    client = new_client()
+    t0 = time.perf_counter()
+    seen = set()
+    for kw in DEFAULT_KEYWORDS:
+        for rep in fetch_replies_for_keyword(
+            kw, args.date_from, args.date_to, page_size=10000, client=client
+        ):
+            seen.add(_key(rep))
+    results.append(("per-keyword", client.stats, time.perf_counter() - t0, len(seen)))
+
+    client = new_client()
+    t0 = time.perf_counter()
+    seen = set()
+    for rep in fetch_matching_announcements(
+        DEFAULT_KEYWORDS,
+        args.date_from,
+        args.date_to,
+        page_size=args.page_size,
+        client=client,
+        concurrency=args.concurrency,
+    ):
+        seen.add(_key(rep))
+    results.append(("sweep", client.stats, time.perf_counter() - t0, len(seen)))
+
+    print(f"{'mode':<12} {'requests':>9} {'bytes':>12} {'wall s':>8} {'matches':>8}")
+    for name, stats, wall, n in results:
+        # the warm-up GET is a request too
+        reqs = stats["api_requests"] + stats["warmups"]
+        print(f"{name:<12} {reqs:>9} {stats['bytes_received']:>12} {wall:>8.2f} {n:>8}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--date-from", default="20251010")
+    p.add_argument("--date-to", default="20251013")
+    p.add_argument("--page-size", type=int, default=1000, help="Sweep page size")
+    p.add_argument("--concurrency", type=int, default=1)
+    p.add_argument(
+        "--simulate", action="store_true", help="Use a synthetic offline corpus"
+    )
+    p.add_argument("--announcements", type=int, default=400)
+    p.add_argument("--latency", type=float, default=0.2, help="Simulated seconds/request")
+    run(p.parse_args())
+
+
+if __name__ == "__main__":
+    main()
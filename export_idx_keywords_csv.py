@@ -10,10 +10,10 @@ from __future__ import annotations
 
 import argparse
 import csv
-import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Union
+from urllib.parse import urlencode
 
 import requests
 import os
@@ -30,7 +30,48 @@ except Exception:
     # python-dotenv not installed or .env not present — that's fine.
     pass
 
-from scraper.idx_api import DEFAULT_KEYWORDS, fetch_replies_for_keyword
+from scraper.idx_api import (
+    DEFAULT_KEYWORDS,
+    IDX_API_URL,
+    IdxClient,
+    fetch_matching_announcements,
+    iter_new_replies,
+    iter_replies_for_keyword,
+)
+from scraper import jsonlib
+from scraper.async_engine import DEFAULT_PAGES, AsyncPageEngine
+from scraper.breaker import TransportBreaker
+from scraper.browser_pool import fetch_json_batch
+from scraper.cache import DEFAULT_CACHE_PATH, DEFAULT_TTL, ResponseCache
+from scraper.columnar import FORMATS as COLUMNAR_FORMATS
+from scraper.columnar import write_store as write_columnar_store
+from scraper.config import config_path
+from scraper.extsort import DEFAULT_MEMORY_BUDGET, ExternalSorter
+from scraper.dates import from_epoch, sort_key, to_epoch
+from scraper.http2 import Http2Session
+from scraper.jsonlib import read_json, write_json
+from scraper.matcher import KeywordMatcher
+from scraper.parallel import ordered_map, split_concurrency
+from scraper.ratelimit import (
+    DEFAULT_BURST,
+    DEFAULT_RATE,
+    RETRY_STATUSES,
+    configure_rate_limiter,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from scraper.records import (
+    ID2_FIELD,
+    JUDUL_FIELD,
+    KEYWORDS_FIELD,
+    KODE_FIELD,
+    TANGGAL_FIELD,
+    Announcement,
+)
+from scraper import seen_index
+from scraper.seen_index import DEFAULT_SEEN_INDEX_PATH, SeenIndex
+from scraper.store import DEFAULT_STORE_PATH, AnnouncementStore
+from scraper.watermark import DEFAULT_WATERMARK_PATH, NEW, Watermark
 
 # Optional keyring support for secure credential storage
 try:
@@ -44,12 +85,8 @@ import subprocess
 
 # Default paths for Playwright storage state and exported cookies
 # Use XDG_CONFIG_HOME or ~/.config/idx-scraper for persistent storage (cron/CI friendly)
-_config_base = (
-    Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config") / "idx-scraper"
-)
-_config_base.mkdir(parents=True, exist_ok=True)
-DEFAULT_STORAGE_STATE = _config_base / "playwright_storage_state.json"
-DEFAULT_COOKIE_EXPORT = _config_base / "session_cookies.json"
+DEFAULT_STORAGE_STATE = config_path("playwright_storage_state.json")
+DEFAULT_COOKIE_EXPORT = config_path("session_cookies.json")
 
 
 def storage_state_has_auth(path: Path) -> bool:
@@ -58,7 +95,7 @@ def storage_state_has_auth(path: Path) -> bool:
     if not path or not path.exists():
         return False
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = read_json(path)
     except Exception:
         return False
     try:
@@ -202,11 +239,9 @@ def perform_interactive_login_and_save(
                 try:
                     ss = context.storage_state()
                     # write immediately so callers can inspect
-                    storage_path.write_text(json.dumps(ss, indent=2), encoding="utf-8")
+                    write_json(storage_path, ss)
                     cookie_dump = {"cookies": ss.get("cookies", [])}
-                    DEFAULT_COOKIE_EXPORT.write_text(
-                        json.dumps(cookie_dump, indent=2), encoding="utf-8"
-                    )
+                    write_json(DEFAULT_COOKIE_EXPORT, cookie_dump)
                     # detect auth token in storage
                     has_auth = False
                     for c in ss.get("cookies", []) or []:
@@ -243,13 +278,9 @@ def perform_interactive_login_and_save(
                         pass
                     try:
                         ss = context.storage_state()
-                        storage_path.write_text(
-                            json.dumps(ss, indent=2), encoding="utf-8"
-                        )
+                        write_json(storage_path, ss)
                         cookie_dump = {"cookies": ss.get("cookies", [])}
-                        DEFAULT_COOKIE_EXPORT.write_text(
-                            json.dumps(cookie_dump, indent=2), encoding="utf-8"
-                        )
+                        write_json(DEFAULT_COOKIE_EXPORT, cookie_dump)
                         print(f"Saved Playwright storage state to {storage_path}")
                         try:
                             browser.close()
@@ -294,7 +325,7 @@ def session_from_storage_state(path: Path) -> Optional[requests.Session]:
     if not path or not path.exists():
         return None
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = read_json(path)
     except Exception:
         return None
     cookies = data.get("cookies") or []
@@ -316,24 +347,12 @@ def session_from_storage_state(path: Path) -> Optional[requests.Session]:
 
 
 def parse_date(s: str) -> datetime:
-    if not s:
-        return datetime.min
-    try:
-        return datetime.fromisoformat(s)
-    except Exception:
-        pass
-    fmts = [
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-        "%d/%m/%Y %I:%M:%S %p",
-        "%d/%m/%Y",
-    ]
-    for f in fmts:
-        try:
-            return datetime.strptime(s, f)
-        except Exception:
-            continue
-    return datetime.min
+    """Parse an announcement date (any layout `scraper.dates` knows).
+
+    Naive, read as UTC wall-clock time; `datetime.min` if unparseable.
+    """
+    ts = to_epoch(s)
+    return datetime.min if ts is None else from_epoch(ts)
 
 
 def session_from_cookie_header(cookie_header: str) -> requests.Session:
@@ -348,6 +367,229 @@ def session_from_cookie_header(cookie_header: str) -> requests.Session:
     return s
 
 
+OUTPUT_FIELDS = [KODE_FIELD, JUDUL_FIELD, TANGGAL_FIELD]
+# rows being collected for export: a plain list or an `export_rows()` sink
+ExportRows = Union[List[Announcement], ExternalSorter]
+
+# separator of the optional Keywords column listing every matched keyword
+KEYWORDS_SEPARATOR = "|"
+
+# page size for --sweep, which pages through every announcement in the window
+SWEEP_PAGE_SIZE = 1000
+# API pages `keyword_replies` requests per bulk call, and so holds at once
+KEYWORD_PAGES_PER_CALL = 32
+
+
+def _mark_failed(watermark: Optional[Watermark]) -> None:
+    # a lost page must not let the watermark move past its replies
+    if watermark is not None:
+        watermark.mark_failed()
+
+
+def collect_rows(
+    replies: Iterable[Dict],
+    rows: ExportRows,
+    watermark: Optional[Watermark] = None,
+    tagger: Optional[KeywordMatcher] = None,
+    store: Optional[AnnouncementStore] = None,
+    index: Optional[SeenIndex] = None,
+) -> None:
+    """Append an `Announcement` for each of `replies` to `rows`. Shared by
+    every fetch mode. Duplicates are left to `write_rows_csv`, which drops
+    them while streaming the sorted rows out, so no dedup set grows with
+    the export.
+
+    With a `watermark` (incremental mode) replies it has already seen are
+    skipped and new ones are recorded on it for the next run. With a
+    `tagger` each new row also gets a `Keywords` column listing every keyword
+    the announcement matches (one matching pass per row). A `store` receives
+    every reply (upserted by Id2, so repeats are harmless). With a persistent
+    `index` replies whose Id2 was already exported unchanged, in this run or
+    an earlier one, are skipped; edited ones are exported again."""
+    for r in replies:
+        if store is not None:
+            store.add(r)
+        if watermark is not None:
+            if watermark.classify(r) != NEW:
+                continue
+            watermark.observe(r)
+        if index is not None and index.check_and_add(r) == seen_index.SEEN:
+            continue
+        a = Announcement.from_reply(r)
+        if not a.kode and not a.judul:
+            continue
+        if tagger is not None:
+            a.keywords = KEYWORDS_SEPARATOR.join(tagger.keywords_in_reply(r))
+        rows.append(a)
+
+
+def iter_rows_csv(path: Path) -> Iterator[Dict[str, str]]:
+    """Stream rows previously written by `write_rows_csv` (none if missing)."""
+    if not path.exists():
+        return
+    fields = OUTPUT_FIELDS + [KEYWORDS_FIELD, ID2_FIELD]
+    with path.open("r", newline="", encoding="utf-8") as f:
+        for r in csv.DictReader(f, delimiter=";"):
+            yield {k: r.get(k) or "" for k in fields}
+
+
+def read_rows_csv(path: Path) -> List[Dict[str, str]]:
+    """Read rows previously written by `write_rows_csv` (empty if missing)."""
+    return list(iter_rows_csv(path))
+
+
+def export_rows(
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+) -> ExternalSorter[Announcement]:
+    """Row sink sorting newest first within `memory_budget` bytes.
+
+    Rows beyond the budget are spilled to sorted temporary runs and merged
+    when `write_rows_csv` streams them out.
+    """
+    return ExternalSorter(
+        key=lambda a: sort_key(a.ts),
+        encode=Announcement.to_fields,
+        decode=Announcement.from_fields,
+        size=Announcement.approx_size,
+        memory_budget=memory_budget,
+        reverse=True,
+    )
+
+
+def _unique(rows: Iterable[Announcement]) -> Iterator[Announcement]:
+    # rows arrive sorted by date, and duplicates share their date string,
+    # so only keys within the current timestamp need remembering
+    current: object = object()
+    keys: Set[Announcement] = set()
+    for a in rows:
+        if a.ts != current:
+            current = a.ts
+            keys = set()
+        if a not in keys:
+            keys.add(a)
+            yield a
+
+
+def write_rows_csv(
+    rows: ExportRows,
+    output_path: Path,
+    merge: bool = False,
+    keywords_column: bool = False,
+    index: Optional[SeenIndex] = None,
+) -> int:
+    """Sort `rows` newest first and write them as a `;`-delimited CSV.
+
+    `rows` is a list, sorted in place, or an `export_rows()` sink, whose
+    sorted runs are merged straight into the file. Rows repeating a
+    kode/judul/tanggal key are dropped (the first one wins). With
+    `merge=True` rows already in `output_path` are kept and the new rows are
+    merged in. `keywords_column` adds the `Keywords` column (`|`-separated).
+    With a seen `index` an `Id2` column is written too, and merged rows
+    whose Id2 the index found CHANGED are dropped, so an edited
+    announcement replaces its earlier row instead of sitting next to it.
+    The file is replaced once complete. Returns the number of rows written."""
+    if merge:
+        replaced = index.changed if index is not None else set()
+        for r in iter_rows_csv(output_path):
+            a = Announcement.from_row(r)
+            if a.id2 is None or a.id2 not in replaced:
+                rows.append(a)
+    if isinstance(rows, list):
+        rows.sort(key=lambda a: sort_key(a.ts), reverse=True)
+        ordered: Iterable[Announcement] = rows
+    else:
+        ordered = iter(rows)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output_path.with_name(output_path.name + ".tmp")
+    n = 0
+    try:
+        with tmp.open("w", newline="", encoding="utf-8") as f:
+            fields = list(OUTPUT_FIELDS)
+            if keywords_column:
+                fields.append(KEYWORDS_FIELD)
+            if index is not None:
+                fields.append(ID2_FIELD)
+            writer = csv.DictWriter(
+                f, fieldnames=fields, delimiter=";", extrasaction="ignore"
+            )
+            writer.writeheader()
+            for a in _unique(ordered):
+                writer.writerow(a.row())
+                n += 1
+        tmp.replace(output_path)
+    finally:
+        if isinstance(rows, ExternalSorter):
+            rows.close()
+        if tmp.exists():
+            tmp.unlink()
+    return n
+
+
+def _api_url(
+    keyword: str, index_from: int, page_size: int, date_from: str, date_to: str
+) -> str:
+    return IDX_API_URL + "?" + urlencode(
+        {
+            "keyword": keyword,
+            "indexFrom": index_from,
+            "pageSize": page_size,
+            "dateFrom": date_from,
+            "dateTo": date_to,
+        }
+    )
+
+
+def keyword_replies(
+    fetch_many: Callable[[List[str]], Dict[str, Dict]],
+    keywords: List[str],
+    date_from: str,
+    date_to: str,
+    page_size: int = 100,
+    watermark: Optional[Watermark] = None,
+    pages_per_call: int = KEYWORD_PAGES_PER_CALL,
+) -> Iterator[List[Dict]]:
+    """Yield every keyword's replies, one page at a time, in keyword order.
+
+    Pages go out in bulk `fetch_many(urls)` calls of at most
+    `pages_per_call` URLs: first the first pages of that many keywords, then
+    those keywords' remaining page offsets (from each `ResultCount`). So
+    only one call's pages are held at once, whatever the window's size.
+    `fetch_many` returns `{url: data}`, with `{}` for a page it gave up on;
+    any such page marks `watermark` failed.
+    """
+    pages_per_call = max(1, pages_per_call)
+    failed = 0
+    for i in range(0, len(keywords), pages_per_call):
+        group = keywords[i : i + pages_per_call]
+        first_urls = [_api_url(kw, 0, page_size, date_from, date_to) for kw in group]
+        first = fetch_many(first_urls)
+        rest_urls: List[str] = []
+        for kw, url in zip(group, first_urls):
+            data = first[url]
+            if not data:
+                failed += 1
+            total = data.get("ResultCount") or 0
+            rest_urls.extend(
+                _api_url(kw, offset, page_size, date_from, date_to)
+                for offset in range(page_size, int(total), page_size)
+            )
+            yield data.get("Replies") or []
+        if rest_urls:
+            print(f"Fetching {len(rest_urls)} further page(s)")
+        for j in range(0, len(rest_urls), pages_per_call):
+            chunk = rest_urls[j : j + pages_per_call]
+            rest = fetch_many(chunk)
+            for url in chunk:
+                data = rest[url]
+                if not data:
+                    failed += 1
+                yield data.get("Replies") or []
+    if failed:
+        print(f"  {failed} page(s) could not be fetched")
+        _mark_failed(watermark)
+
+
 def browser_fetch_all(
     keywords: List[str],
     output_path: Path,
@@ -355,14 +597,26 @@ def browser_fetch_all(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     proxy_url: Optional[str] = None,
+    cache: Optional[ResponseCache] = None,
+    watermark: Optional[Watermark] = None,
+    store: Optional[AnnouncementStore] = None,
+    index: Optional[SeenIndex] = None,
+    batch_concurrency: int = 0,
+    tag_keywords: bool = False,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
 ) -> int:
+    """Fetch all keywords through a headed browser after a manual challenge.
+
+    With `batch_concurrency` > 0 every keyword (and every further page) is
+    fetched in batched in-page calls instead of one evaluate per keyword.
+    """
     try:
         from playwright.sync_api import sync_playwright
     except Exception as e:
         raise RuntimeError("Playwright not available: %s" % e)
 
-    rows: List[Dict[str, str]] = []
-    seen: Set[Tuple[str, str, str]] = set()
+    rows = export_rows(memory_budget)
+    tagger = KeywordMatcher(keywords) if tag_keywords else None
 
     from datetime import datetime, timedelta
 
@@ -392,13 +646,11 @@ def browser_fetch_all(
         # After user interaction, save storage state so future non-interactive runs can reuse it
         try:
             ss = context.storage_state()
-            DEFAULT_STORAGE_STATE.write_text(json.dumps(ss, indent=2), encoding="utf-8")
+            write_json(DEFAULT_STORAGE_STATE, ss)
             print(f"Saved Playwright storage state to {DEFAULT_STORAGE_STATE}")
             # Also write a cookie-only export for requests-based reuse
             cookie_dump = {"cookies": ss.get("cookies", [])}
-            DEFAULT_COOKIE_EXPORT.write_text(
-                json.dumps(cookie_dump, indent=2), encoding="utf-8"
-            )
+            write_json(DEFAULT_COOKIE_EXPORT, cookie_dump)
             print(f"Wrote cookies to {DEFAULT_COOKIE_EXPORT}")
         except Exception as e:
             print("Failed saving storage state:", e)
@@ -419,63 +671,56 @@ def browser_fetch_all(
             except Exception as e:
                 print("Debug fetch failed:", e)
 
-        for kw in keywords:
-            print("Browser fetching:", kw)
-            api_url = (
-                "https://www.idx.co.id/primary/ListedCompany/GetAnnouncement"
-                + f"?keyword={kw}&indexFrom=0&pageSize=100&dateFrom={date_from}&dateTo={date_to}"
-            )
-            try:
-                text = page.evaluate(
-                    "(u) => fetch(u, {headers:{'Accept':'application/json','X-Requested-With':'XMLHttpRequest','Referer':'https://www.idx.co.id/'}}).then(r=>r.text())",
-                    api_url,
+        if batch_concurrency > 0:
+            print(f"Browser batch fetching {len(keywords)} keywords")
+            for replies in keyword_replies(
+                lambda urls: fetch_json_batch(
+                    page, urls, batch_concurrency, cache=cache
+                ),
+                keywords,
+                date_from,
+                date_to,
+                watermark=watermark,
+            ):
+                collect_rows(replies, rows, watermark, tagger, store, index)
+        else:
+            for kw in keywords:
+                print("Browser fetching:", kw)
+                api_url = (
+                    "https://www.idx.co.id/primary/ListedCompany/GetAnnouncement"
+                    + f"?keyword={kw}&indexFrom=0&pageSize=100&dateFrom={date_from}&dateTo={date_to}"
                 )
-                data = json.loads(text)
-            except Exception as e:
-                print("  fetch error:", e)
-                data = {}
+                cached = cache.get_url(api_url) if cache is not None else None
+                try:
+                    if cached is not None:
+                        data = jsonlib.loads(cached)
+                    else:
+                        get_rate_limiter().acquire()
+                        text = page.evaluate(
+                            "(u) => fetch(u, {headers:{'Accept':'application/json','X-Requested-With':'XMLHttpRequest','Referer':'https://www.idx.co.id/'}}).then(r=>r.text())",
+                            api_url,
+                        )
+                        data = jsonlib.loads(text)
+                        if cache is not None:
+                            cache.put_url(api_url, text.encode("utf-8"))
+                except Exception as e:
+                    print("  fetch error:", e)
+                    _mark_failed(watermark)
+                    data = {}
 
-            replies = data.get("Replies") or []
-            for r in replies:
-                peng = r.get("pengumuman") or r.get("Pengumuman") or {}
-                kode = (peng.get("Kode_Emiten") or r.get("Kode_Emiten") or "").strip()
-                judul = (
-                    peng.get("JudulPengumuman") or peng.get("Judul_Pengumuman") or ""
-                ).strip()
-                tanggal = (
-                    peng.get("TglPengumuman") or peng.get("Tanggal") or ""
-                ).strip()
-                key = (kode, judul, tanggal)
-                if not kode and not judul:
-                    continue
-                if key in seen:
-                    continue
-                seen.add(key)
-                rows.append(
-                    {
-                        "Kode_Emiten": kode,
-                        "Judul_Pengumuman": judul,
-                        "Tanggal_Pengumuman": tanggal,
-                    }
+                collect_rows(
+                    data.get("Replies") or [], rows, watermark, tagger, store, index
                 )
 
         browser.close()
 
-    # sort by date desc
-    rows.sort(key=lambda r: parse_date(r.get("Tanggal_Pengumuman") or ""), reverse=True)
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["Kode_Emiten", "Judul_Pengumuman", "Tanggal_Pengumuman"],
-            delimiter=";",
-        )
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
-
-    return len(rows)
+    return write_rows_csv(
+        rows,
+        output_path,
+        merge=watermark is not None or index is not None,
+        keywords_column=tag_keywords,
+        index=index,
+    )
 
 
 def playwright_automated_fetch_all(
@@ -487,20 +732,32 @@ def playwright_automated_fetch_all(
     date_to: Optional[str] = None,
     auth_token: Optional[str] = None,
     proxy_url: Optional[str] = None,
+    cache: Optional[ResponseCache] = None,
+    watermark: Optional[Watermark] = None,
+    store: Optional[AnnouncementStore] = None,
+    index: Optional[SeenIndex] = None,
+    batch_concurrency: int = 0,
+    tag_keywords: bool = False,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
 ) -> int:
     """Use Playwright to automatically fetch all keywords using the browser (no manual interaction).
 
     This launches a browser context (headless by default), navigates to the IDX site to allow the
     site to set required client state, then uses page.evaluate to fetch the JSON API for each
-    keyword. The storage state is saved after the run.
+    keyword. The storage state is saved after the run. Responses found in
+    `cache` are reused instead of being fetched again. With `batch_concurrency`
+    > 0 all keywords and their further pages are fetched in batched in-page
+    calls (see `keyword_replies`).
     """
     try:
         from playwright.sync_api import sync_playwright
     except Exception as e:
         raise RuntimeError("Playwright not available: %s" % e)
 
-    rows: List[Dict[str, str]] = []
-    seen: Set[Tuple[str, str, str]] = set()
+    rows = export_rows(memory_budget)
+    tagger = KeywordMatcher(keywords) if tag_keywords else None
+    # shared with every other transport in this process
+    limiter = get_rate_limiter()
 
     from datetime import datetime, timedelta
 
@@ -541,9 +798,7 @@ def playwright_automated_fetch_all(
         storage_state_obj = None
         try:
             if DEFAULT_STORAGE_STATE.exists():
-                storage_state_obj = json.loads(
-                    DEFAULT_STORAGE_STATE.read_text(encoding="utf-8")
-                )
+                storage_state_obj = read_json(DEFAULT_STORAGE_STATE)
         except Exception:
             storage_state_obj = None
 
@@ -662,177 +917,261 @@ def playwright_automated_fetch_all(
                 "Performed initial navigation; context cookies:", len(context.cookies())
             )
 
-        for kw in keywords:
-            print("Browser fetching (automated):", kw)
-            api_url = (
-                "https://www.idx.co.id/primary/ListedCompany/GetAnnouncement"
-                + f"?keyword={kw}&indexFrom=0&pageSize=100&dateFrom={date_from}&dateTo={date_to}"
-            )
-            # Prefer using Playwright's APIRequest via the browser context (shares cookies and low-level
-            # networking) which often succeeds where page.evaluate fetch gets an HTML challenge.
-            import time
+        if batch_concurrency > 0:
+            print(f"Browser batch fetching {len(keywords)} keywords (automated)")
+            for replies in keyword_replies(
+                lambda urls: fetch_json_batch(
+                    page, urls, batch_concurrency, cache=cache
+                ),
+                keywords,
+                date_from,
+                date_to,
+                watermark=watermark,
+            ):
+                collect_rows(replies, rows, watermark, tagger, store, index)
+        else:
+            for kw in keywords:
+                print("Browser fetching (automated):", kw)
+                api_url = (
+                    "https://www.idx.co.id/primary/ListedCompany/GetAnnouncement"
+                    + f"?keyword={kw}&indexFrom=0&pageSize=100&dateFrom={date_from}&dateTo={date_to}"
+                )
+                # Prefer using Playwright's APIRequest via the browser context (shares cookies and low-level
+                # networking) which often succeeds where page.evaluate fetch gets an HTML challenge.
+                headers = {
+                    "Accept": "application/json, text/plain, */*",
+                    "X-Requested-With": "XMLHttpRequest",
+                    "Referer": "https://www.idx.co.id/",
+                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0 Safari/537.36",
+                    "Sec-Fetch-Site": "same-origin",
+                    "Sec-Fetch-Mode": "cors",
+                    "Sec-Fetch-Dest": "empty",
+                }
 
-            headers = {
-                "Accept": "application/json, text/plain, */*",
-                "X-Requested-With": "XMLHttpRequest",
-                "Referer": "https://www.idx.co.id/",
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0 Safari/537.36",
-                "Sec-Fetch-Site": "same-origin",
-                "Sec-Fetch-Mode": "cors",
-                "Sec-Fetch-Dest": "empty",
-            }
-
-            data = {}
-            text = None
-
-            request_obj = getattr(context, "request", None)
-            # If an auth token was provided, prefer page.evaluate fetch which can
-            # read localStorage (auth._token.local) and allow client-side JS to
-            # include the token in requests. Otherwise prefer context.request.
-            # prefer page.evaluate when either an explicit auth_token was provided
-            # or the loaded storage state contains an auth token in cookies/localStorage
-            prefer_page_eval = bool(auth_token)
-            try:
-                if not prefer_page_eval and storage_state_obj:
-                    # check cookies
-                    for c in storage_state_obj.get("cookies", []):
-                        if c.get("name") == "auth._token.local":
-                            prefer_page_eval = True
-                            break
-                if not prefer_page_eval and storage_state_obj:
-                    for origin in storage_state_obj.get("origins", []):
-                        for kv in origin.get("localStorage", []):
-                            if kv.get("name") == "auth._token.local":
+                data = {}
+                text = None
+
+                request_obj = getattr(context, "request", None)
+                # If an auth token was provided, prefer page.evaluate fetch which can
+                # read localStorage (auth._token.local) and allow client-side JS to
+                # include the token in requests. Otherwise prefer context.request.
+                # prefer page.evaluate when either an explicit auth_token was provided
+                # or the loaded storage state contains an auth token in cookies/localStorage
+                prefer_page_eval = bool(auth_token)
+                try:
+                    if not prefer_page_eval and storage_state_obj:
+                        # check cookies
+                        for c in storage_state_obj.get("cookies", []):
+                            if c.get("name") == "auth._token.local":
                                 prefer_page_eval = True
                                 break
-                        if prefer_page_eval:
-                            break
-            except Exception:
-                # best-effort only
-                pass
-            if not prefer_page_eval and request_obj is not None:
-                # use context.request which shares storage state and cookies
-                for attempt in range(3):
-                    try:
-                        resp = request_obj.get(api_url, headers=headers)
-                        text = resp.text()
-                    except Exception as e:
-                        print("  request attempt", attempt + 1, "error:", e)
-                        text = None
-                    if not text:
-                        time.sleep(1)
-                        continue
-
-                    stripped = text.strip()
-                    if stripped.startswith("{") or stripped.startswith("["):
+                    if not prefer_page_eval and storage_state_obj:
+                        for origin in storage_state_obj.get("origins", []):
+                            for kv in origin.get("localStorage", []):
+                                if kv.get("name") == "auth._token.local":
+                                    prefer_page_eval = True
+                                    break
+                            if prefer_page_eval:
+                                break
+                except Exception:
+                    # best-effort only
+                    pass
+                cached = cache.get_url(api_url) if cache is not None else None
+                if cached is not None:
+                    data = jsonlib.loads(cached)
+                elif not prefer_page_eval and request_obj is not None:
+                    # use context.request which shares storage state and cookies
+                    for attempt in range(3):
+                        limiter.acquire()
                         try:
-                            data = json.loads(text)
-                            break
+                            resp = request_obj.get(api_url, headers=headers)
+                            text = resp.text()
                         except Exception as e:
-                            print("  json parse error:", e)
-                            data = {}
-                            break
-                    else:
-                        excerpt = (
-                            (stripped[:400] + "...")
-                            if len(stripped) > 400
-                            else stripped
-                        )
-                        print(
-                            "  non-json response (likely HTML/Cloudflare). excerpt:",
-                            excerpt,
-                        )
-                        time.sleep(2)
-                        continue
-            else:
-                # Use page.evaluate-based fetch (may pick up localStorage auth token)
-                for attempt in range(3):
-                    try:
-                        text = page.evaluate(
-                            "(u) => fetch(u, {headers:{'Accept':'application/json','X-Requested-With':'XMLHttpRequest','Referer':'https://www.idx.co.id/'} , credentials: 'include'}).then(r=>r.text())",
-                            api_url,
-                        )
-                    except Exception as e:
-                        print("  fetch attempt", attempt + 1, "error:", e)
-                        text = None
-                    if not text:
-                        time.sleep(1)
-                        continue
-                    stripped = text.strip()
-                    if stripped.startswith("{") or stripped.startswith("["):
+                            print("  request attempt", attempt + 1, "error:", e)
+                            resp = None
+                            text = None
+                        if resp is not None and resp.status in RETRY_STATUSES:
+                            print("  throttled (HTTP %s); backing off" % resp.status)
+                            limiter.backoff(
+                                attempt, parse_retry_after(resp.headers.get("retry-after"))
+                            )
+                            text = None
+                            continue
+                        if not text:
+                            limiter.backoff(attempt)
+                            continue
+
+                        stripped = text.strip()
+                        if stripped.startswith("{") or stripped.startswith("["):
+                            try:
+                                data = jsonlib.loads(text)
+                                break
+                            except Exception as e:
+                                print("  json parse error:", e)
+                                data = {}
+                                break
+                        else:
+                            excerpt = (
+                                (stripped[:400] + "...")
+                                if len(stripped) > 400
+                                else stripped
+                            )
+                            print(
+                                "  non-json response (likely HTML/Cloudflare). excerpt:",
+                                excerpt,
+                            )
+                            # challenge page: back off harder than for a plain error
+                            limiter.backoff(attempt + 1)
+                            continue
+                else:
+                    # Use page.evaluate-based fetch (may pick up localStorage auth token)
+                    for attempt in range(3):
+                        limiter.acquire()
                         try:
-                            data = json.loads(text)
-                            break
+                            text = page.evaluate(
+                                "(u) => fetch(u, {headers:{'Accept':'application/json','X-Requested-With':'XMLHttpRequest','Referer':'https://www.idx.co.id/'} , credentials: 'include'}).then(r=>r.text())",
+                                api_url,
+                            )
                         except Exception as e:
-                            print("  json parse error:", e)
-                            data = {}
-                            break
-                    else:
-                        excerpt = (
-                            (stripped[:400] + "...")
-                            if len(stripped) > 400
-                            else stripped
-                        )
-                        print(
-                            "  non-json response (likely HTML/Cloudflare). excerpt:",
-                            excerpt,
-                        )
-                        time.sleep(2)
-                        continue
-
-            replies = data.get("Replies") or []
-            for r in replies:
-                peng = r.get("pengumuman") or r.get("Pengumuman") or {}
-                kode = (peng.get("Kode_Emiten") or r.get("Kode_Emiten") or "").strip()
-                judul = (
-                    peng.get("JudulPengumuman") or peng.get("Judul_Pengumuman") or ""
-                ).strip()
-                tanggal = (
-                    peng.get("TglPengumuman") or peng.get("Tanggal") or ""
-                ).strip()
-                key = (kode, judul, tanggal)
-                if not kode and not judul:
-                    continue
-                if key in seen:
-                    continue
-                seen.add(key)
-                rows.append(
-                    {
-                        "Kode_Emiten": kode,
-                        "Judul_Pengumuman": judul,
-                        "Tanggal_Pengumuman": tanggal,
-                    }
+                            print("  fetch attempt", attempt + 1, "error:", e)
+                            text = None
+                        if not text:
+                            limiter.backoff(attempt)
+                            continue
+                        stripped = text.strip()
+                        if stripped.startswith("{") or stripped.startswith("["):
+                            try:
+                                data = jsonlib.loads(text)
+                                break
+                            except Exception as e:
+                                print("  json parse error:", e)
+                                data = {}
+                                break
+                        else:
+                            excerpt = (
+                                (stripped[:400] + "...")
+                                if len(stripped) > 400
+                                else stripped
+                            )
+                            print(
+                                "  non-json response (likely HTML/Cloudflare). excerpt:",
+                                excerpt,
+                            )
+                            # challenge page: back off harder than for a plain error
+                            limiter.backoff(attempt + 1)
+                            continue
+
+                if not data:
+                    _mark_failed(watermark)
+                elif cache is not None and cached is None and text:
+                    cache.put_url(api_url, text.encode("utf-8"))
+                collect_rows(
+                    data.get("Replies") or [], rows, watermark, tagger, store, index
                 )
 
         # Save storage state for reuse
         try:
             ss = context.storage_state()
-            DEFAULT_STORAGE_STATE.write_text(json.dumps(ss, indent=2), encoding="utf-8")
+            write_json(DEFAULT_STORAGE_STATE, ss)
             cookie_dump = {"cookies": ss.get("cookies", [])}
-            DEFAULT_COOKIE_EXPORT.write_text(
-                json.dumps(cookie_dump, indent=2), encoding="utf-8"
-            )
+            write_json(DEFAULT_COOKIE_EXPORT, cookie_dump)
             print(f"Saved Playwright storage state to {DEFAULT_STORAGE_STATE}")
         except Exception as e:
             print("Failed saving storage state:", e)
 
         browser.close()
 
-    # sort by date desc
-    rows.sort(key=lambda r: parse_date(r.get("Tanggal_Pengumuman") or ""), reverse=True)
+    return write_rows_csv(
+        rows,
+        output_path,
+        merge=watermark is not None or index is not None,
+        keywords_column=tag_keywords,
+        index=index,
+    )
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["Kode_Emiten", "Judul_Pengumuman", "Tanggal_Pengumuman"],
-            delimiter=";",
+
+def async_playwright_fetch_all(
+    keywords: List[str],
+    output_path: Path,
+    pages: int = DEFAULT_PAGES,
+    headless: bool = True,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    auth_token: Optional[str] = None,
+    proxy_url: Optional[str] = None,
+    cache: Optional[ResponseCache] = None,
+    watermark: Optional[Watermark] = None,
+    store: Optional[AnnouncementStore] = None,
+    index: Optional[SeenIndex] = None,
+    tag_keywords: bool = False,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+) -> int:
+    """Fetch all keywords through `pages` concurrent Playwright pages.
+
+    Uses `AsyncPageEngine`: one browser context loaded from
+    `DEFAULT_STORAGE_STATE` (with `auth_token` injected once) serving K pages.
+    Rows go through the same dedup and CSV writer as the other modes, and the
+    storage state is saved after the run.
+    """
+    from datetime import datetime, timedelta
+
+    if not date_to or not date_from:
+        today = datetime.now().date()
+        date_to = date_to or today.strftime("%Y%m%d")
+        date_from = date_from or (today - timedelta(days=7)).strftime("%Y%m%d")
+
+    storage_state_obj = None
+    try:
+        if DEFAULT_STORAGE_STATE.exists():
+            storage_state_obj = read_json(DEFAULT_STORAGE_STATE)
+    except Exception:
+        storage_state_obj = None
+
+    rows = export_rows(memory_budget)
+    tagger = KeywordMatcher(keywords) if tag_keywords else None
+    try:
+        engine = AsyncPageEngine(
+            pages=pages,
+            headless=headless,
+            storage_state=storage_state_obj,
+            auth_token=auth_token,
+            proxy=proxy_url,
+            cache=cache,
+        )
+    except ImportError as e:
+        raise RuntimeError(str(e))
+    with engine:
+        print(f"Async fetching {len(keywords)} keywords on {engine.pages} pages")
+        for replies in keyword_replies(
+            engine.fetch_json_many,
+            keywords,
+            date_from,
+            date_to,
+            watermark=watermark,
+            # a call gives every page of the engine a URL to work on
+            pages_per_call=max(KEYWORD_PAGES_PER_CALL, engine.pages),
+        ):
+            collect_rows(replies, rows, watermark, tagger, store, index)
+        print(
+            "Async engine stats: {fetched} fetched, {cached} from cache, "
+            "{failed} failed".format(**engine.stats)
         )
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+        try:
+            ss = engine.save_storage_state()
+            write_json(DEFAULT_STORAGE_STATE, ss)
+            cookie_dump = {"cookies": ss.get("cookies", [])}
+            write_json(DEFAULT_COOKIE_EXPORT, cookie_dump)
+            print(f"Saved Playwright storage state to {DEFAULT_STORAGE_STATE}")
+        except Exception as e:
+            print("Failed saving storage state:", e)
 
-    return len(rows)
+    return write_rows_csv(
+        rows,
+        output_path,
+        merge=watermark is not None or index is not None,
+        keywords_column=tag_keywords,
+        index=index,
+    )
 
 
 def requests_fetch_all(
@@ -840,9 +1179,31 @@ def requests_fetch_all(
     output_path: Path,
     session: Optional[requests.Session],
     max_pages: int,
+    client: Optional[IdxClient] = None,
+    concurrency: int = 1,
+    shard_threshold: Optional[int] = None,
+    shard_unit: str = "month",
+    sweep: bool = False,
+    cache: Optional[ResponseCache] = None,
+    watermark: Optional[Watermark] = None,
+    store: Optional[AnnouncementStore] = None,
+    index: Optional[SeenIndex] = None,
+    tag_keywords: bool = False,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
 ) -> int:
-    rows: List[Dict[str, str]] = []
-    seen: Set[Tuple[str, str, str]] = set()
+    """Fetch `keywords` with plain HTTP requests and write the CSV.
+
+    Default mode issues one server-side query per keyword. With `sweep=True`
+    the window is paged through once unfiltered (`keyword=""`) and every reply
+    is classified locally with a `KeywordMatcher` over all keywords, which is
+    far fewer requests for short windows.
+
+    With a `watermark` that has already recorded a run, only announcements
+    newer than it are fetched (one unfiltered pass that stops paging at the
+    first already-known reply) and merged into the existing output.
+    """
+    rows = export_rows(memory_budget)
+    tagger = KeywordMatcher(keywords) if tag_keywords else None
 
     from datetime import datetime, timedelta
 
@@ -867,56 +1228,181 @@ def requests_fetch_all(
     date_from = injected_from
     date_to = injected_to
 
-    for kw in keywords:
-        print("Requests fetching:", kw)
+    # one pooled client for every keyword: a single warm-up and keep-alive connections
+    if client is None:
+        client = IdxClient(
+            session=session,
+            pool_size=max(10, concurrency),
+            cache=cache,
+            # remembers across runs which transport gets past blocking
+            breaker=TransportBreaker.load(),
+        )
+
+    if watermark is not None and watermark.newest:
+        print(f"Requests incremental sync since {watermark.newest}")
+        params = {
+            "emitenType": "*",
+            "dateFrom": date_from,
+            "dateTo": date_to,
+            "lang": "id",
+            "keyword": "",
+        }
+        matcher = KeywordMatcher(keywords)
         try:
-            replies = fetch_replies_for_keyword(
-                kw,
+            for rep in iter_new_replies(params, watermark, client=client):
+                if matcher.match_reply(rep):
+                    collect_rows([rep], rows, watermark, tagger, store, index)
+                else:
+                    # still advance the watermark past non-matching replies
+                    watermark.observe(rep)
+        except Exception as e:
+            print("  incremental fetch error:", e)
+            _mark_failed(watermark)
+    elif sweep:
+        print(f"Requests sweeping {date_from}-{date_to} for {len(keywords)} keywords")
+        try:
+            matched = fetch_matching_announcements(
+                keywords,
                 date_from=date_from,
                 date_to=date_to,
-                page_size=10000,
-                session=session,
+                page_size=SWEEP_PAGE_SIZE,
+                client=client,
+                concurrency=concurrency,
+                shard_threshold=shard_threshold,
+                shard_unit=shard_unit,
             )
+            collect_rows(matched, rows, watermark, tagger, store, index)
         except Exception as e:
-            print("  fetch error:", e)
-            replies = []
-
-        for r in replies:
-            peng = r.get("Pengumuman") or r.get("pengumuman") or {}
-            kode = (peng.get("Kode_Emiten") or r.get("Kode_Emiten") or "").strip()
-            judul = (
-                peng.get("JudulPengumuman") or peng.get("Judul_Pengumuman") or ""
-            ).strip()
-            tanggal = (peng.get("TglPengumuman") or peng.get("Tanggal") or "").strip()
-            key = (kode, judul, tanggal)
-            if not kode and not judul:
-                continue
-            if key in seen:
-                continue
-            seen.add(key)
-            rows.append(
-                {
-                    "Kode_Emiten": kode,
-                    "Judul_Pengumuman": judul,
-                    "Tanggal_Pengumuman": tanggal,
-                }
-            )
+            print("  sweep error:", e)
+            _mark_failed(watermark)
+    else:
+        # keyword queries and their shards share one budget, so at most
+        # `concurrency` requests are in flight however the two levels nest
+        kw_concurrency, shard_concurrency = split_concurrency(
+            concurrency, len(keywords)
+        )
 
-    # sort by date desc
-    rows.sort(key=lambda r: parse_date(r.get("Tanggal_Pengumuman") or ""), reverse=True)
+        def _replies(kw: str) -> Iterator[Dict]:
+            print("Requests fetching:", kw)
+            try:
+                yield from iter_replies_for_keyword(
+                    kw,
+                    date_from=date_from,
+                    date_to=date_to,
+                    page_size=10000,
+                    client=client,
+                    shard_threshold=shard_threshold,
+                    shard_unit=shard_unit,
+                    concurrency=shard_concurrency,
+                )
+            except Exception as e:
+                print(f"  fetch error ({kw}):", e)
+                _mark_failed(watermark)
+
+        def _fetch(kw: str) -> Iterable[Dict]:
+            # serially, replies stream straight into collect_rows; parallel
+            # workers have to materialize them on their own thread
+            return _replies(kw) if kw_concurrency <= 1 else list(_replies(kw))
+
+        # keyword queries run concurrently; results come back in keyword order so
+        # the shared dedup below keeps the same "first keyword wins" rows as a serial run
+        for replies in ordered_map(_fetch, keywords, concurrency=kw_concurrency):
+            collect_rows(replies, rows, watermark, tagger, store, index)
+
+    print(
+        "Requests stats: {api_requests} API requests, {bytes_received} bytes "
+        "({wire_bytes} on the wire), {warmups} warm-up(s), "
+        "{requests_saved} request(s) saved".format(**client.stats)
+    )
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["Kode_Emiten", "Judul_Pengumuman", "Tanggal_Pengumuman"],
-            delimiter=";",
+    return write_rows_csv(
+        rows,
+        output_path,
+        merge=watermark is not None or index is not None,
+        keywords_column=tag_keywords,
+        index=index,
+    )
+
+
+def store_export(
+    store: AnnouncementStore,
+    keywords: List[str],
+    output_path: Path,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    tag_keywords: bool = False,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+) -> int:
+    """Write the CSV from announcements already in `store`, without fetching.
+
+    Keywords are matched against each row's stored `search_text`; the date
+    bounds (YYYYMMDD, inclusive) are optional and use the store's date index.
+    """
+    matcher = KeywordMatcher(keywords)
+    rows = export_rows(memory_budget)
+    collect_rows(
+        store.replies(date_from=date_from, date_to=date_to, matcher=matcher),
+        rows,
+        tagger=matcher if tag_keywords else None,
+    )
+    return write_rows_csv(rows, output_path, keywords_column=tag_keywords)
+
+
+def _close_store(
+    store: Optional[AnnouncementStore],
+    columnar: Optional[str] = None,
+    columnar_format: str = "parquet",
+) -> None:
+    """Flush and close `store`, first exporting it to `columnar` if given."""
+    if store is None:
+        return
+    store.flush()
+    print(
+        "Store: {upserted} announcement(s) upserted, {skipped} without Id2 "
+        "skipped".format(**store.stats)
+    )
+    if columnar:
+        stats = write_columnar_store(store, columnar, columnar_format)
+        print(
+            "Columnar export to {dir}: {partitions} partition(s), {rows} rows "
+            "written; {skipped} unchanged complete month(s) kept".format(dir=columnar, **stats)
         )
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+    store.close()
 
-    return len(rows)
+
+def _close_seen_index(index: Optional[SeenIndex]) -> None:
+    # only reached once the CSV is written, so a failed run commits nothing
+    if index is None:
+        return
+    index.commit()
+    index.close()
+    print(
+        "Seen index: {added} new or edited, {bloom_negative} Bloom-filter "
+        "miss(es), {db_lookups} index lookup(s)".format(**index.stats)
+    )
+
+
+def _save_watermark(watermark: Optional[Watermark]) -> None:
+    if watermark is None:
+        return
+    if watermark.failed:
+        print(
+            "Incremental: fetch errors this run; watermark left at "
+            f"{watermark.newest} so the next run fetches the window again"
+        )
+        return
+    n = watermark.commit()
+    watermark.save()
+    print(f"Incremental: {n} new announcement(s); watermark now {watermark.newest}")
+
+
+def _print_cache_stats(cache: Optional[ResponseCache]) -> None:
+    if cache is None:
+        return
+    print(
+        "Cache stats: {hits} hit(s), {misses} miss(es), {stores} stored, "
+        "{evictions} evicted".format(**cache.stats)
+    )
 
 
 def main() -> None:
@@ -934,6 +1420,17 @@ def main() -> None:
         action="store_true",
         help="Use Playwright to automatically fetch all keywords via the browser (no manual interaction)",
     )
+    p.add_argument(
+        "--async-playwright",
+        action="store_true",
+        help="Fetch all keywords through several concurrent Playwright pages sharing the saved storage state (see --pages)",
+    )
+    p.add_argument(
+        "--pages",
+        type=int,
+        default=DEFAULT_PAGES,
+        help="Concurrent browser pages for --async-playwright (default: %(default)s)",
+    )
     p.add_argument(
         "--headless",
         action="store_true",
@@ -958,6 +1455,111 @@ def main() -> None:
     p.add_argument(
         "--max-pages", type=int, default=3, help="Max pages (unused in browser mode)"
     )
+    p.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of keyword queries to run in parallel in requests mode (default: 1, serial)",
+    )
+    p.add_argument(
+        "--http2",
+        action="store_true",
+        help="Requests mode: multiplex API calls over one HTTP/2 connection (needs httpx[http2])",
+    )
+    p.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Requests mode: page through the window once unfiltered and match all keywords locally instead of one query per keyword",
+    )
+    p.add_argument(
+        "--shard-threshold",
+        type=int,
+        help="Requests mode: split the date range into shards of at most this many results per keyword (for long backfills)",
+    )
+    p.add_argument(
+        "--shard-unit",
+        choices=["month", "year"],
+        default="month",
+        help="Initial shard window size before adaptive splitting (default: month)",
+    )
+    p.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="Max API requests per second across all transports; 0 disables limiting (default: %(default)s)",
+    )
+    p.add_argument(
+        "--burst",
+        type=int,
+        default=DEFAULT_BURST,
+        help="Requests allowed in a burst above --rate (default: %(default)s)",
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Disable the on-disk API response cache ({DEFAULT_CACHE_PATH})",
+    )
+    p.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_TTL,
+        help="Seconds a cached response for a window that includes today stays valid; 0 never caches such windows, past windows never expire (default: %(default)s; always 0 with --incremental)",
+    )
+    p.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=256,
+        help="Maximum cache size in MB before least-recently-used entries are evicted (default: %(default)s)",
+    )
+    p.add_argument(
+        "--batch",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Playwright modes: fetch all keywords and pages in batched in-page calls with up to N concurrent fetches (default: one call per keyword)",
+    )
+    p.add_argument(
+        "--tag-keywords",
+        action="store_true",
+        help=f"Add a '{KEYWORDS_FIELD}' column listing every keyword each announcement matches ('{KEYWORDS_SEPARATOR}'-separated)",
+    )
+    p.add_argument(
+        "--no-store",
+        action="store_true",
+        help=f"Don't upsert fetched announcements into the local store ({DEFAULT_STORE_PATH})",
+    )
+    p.add_argument(
+        "--from-store",
+        action="store_true",
+        help="Write the CSV from the local store instead of fetching (all dates unless --date-from/--date-to are given)",
+    )
+    p.add_argument(
+        "--columnar",
+        metavar="DIR",
+        help="Also export the local store to DIR partitioned by year/month (needs pyarrow); closed months already there are only rewritten when the store has changed rows for them",
+    )
+    p.add_argument(
+        "--columnar-format",
+        choices=sorted(COLUMNAR_FORMATS),
+        default="parquet",
+        help="File format for --columnar (default: %(default)s)",
+    )
+    p.add_argument(
+        "--seen-index",
+        action="store_true",
+        help=f"Skip announcements already exported unchanged by an earlier run, using the persistent Id2 index ({DEFAULT_SEEN_INDEX_PATH}), and merge the rest into the existing output",
+    )
+    p.add_argument(
+        "--memory-budget-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET / 2**20,
+        help="Memory for sorting export rows; larger exports spill to sorted temporary files that are merged into the CSV (default: %(default)s)",
+    )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Only fetch announcements newer than the saved watermark ({DEFAULT_WATERMARK_PATH}) and merge them into the existing output",
+    )
     p.add_argument(
         "--date-from",
         help="Override start date (inclusive) in YYYYMMDD format. Default = today - 2 days.",
@@ -1018,6 +1620,7 @@ def main() -> None:
         except Exception:
             raise SystemExit(f"Invalid date format for {s}; expected YYYYMMDD")
 
+    memory_budget = int(args.memory_budget_mb * 2**20)
     user_date_from = _valid_date(args.date_from)
     user_date_to = _valid_date(args.date_to)
     session = None
@@ -1045,6 +1648,69 @@ def main() -> None:
         except Exception as e:
             print("Failed to configure proxy for requests:", e)
 
+    configure_rate_limiter(args.rate, args.burst)
+
+    watermark = None
+    if args.incremental:
+        watermark = Watermark.load()
+        # resume from the watermark day unless the caller pinned a start date
+        if not user_date_from and watermark.date_from():
+            user_date_from = watermark.date_from()
+            print(
+                f"Incremental: fetching from {user_date_from} "
+                f"(watermark {watermark.newest})"
+            )
+
+    if args.from_store:
+        store = AnnouncementStore()
+        n = store_export(
+            store,
+            DEFAULT_KEYWORDS,
+            out,
+            date_from=user_date_from,
+            date_to=user_date_to,
+            tag_keywords=args.tag_keywords,
+            memory_budget=memory_budget,
+        )
+        print(f"Wrote {n} rows to {out} from {store.path}")
+        _close_store(store, args.columnar, args.columnar_format)
+        return
+    if args.no_store and args.columnar:
+        raise SystemExit("--columnar exports the local store; drop --no-store")
+    store = None if args.no_store else AnnouncementStore()
+    index = SeenIndex() if args.seen_index else None
+
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(
+            # a poll must see the live first page, not one cached minutes ago
+            ttl=0 if args.incremental else args.cache_ttl,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+        )
+
+    if args.async_playwright:
+        n = async_playwright_fetch_all(
+            DEFAULT_KEYWORDS,
+            out,
+            pages=args.pages,
+            headless=bool(args.headless),
+            date_from=user_date_from,
+            date_to=user_date_to,
+            auth_token=args.auth_token or os.environ.get("IDX_AUTH_TOKEN"),
+            proxy_url=proxy_url,
+            cache=cache,
+            watermark=watermark,
+            store=store,
+            index=index,
+            tag_keywords=args.tag_keywords,
+            memory_budget=memory_budget,
+        )
+        _save_watermark(watermark)
+        _close_store(store, args.columnar, args.columnar_format)
+        _close_seen_index(index)
+        _print_cache_stats(cache)
+        print(f"Wrote {n} rows to {out}")
+        return
     if args.interactive:
         n = browser_fetch_all(
             DEFAULT_KEYWORDS,
@@ -1053,7 +1719,17 @@ def main() -> None:
             date_from=user_date_from,
             date_to=user_date_to,
             proxy_url=proxy_url,
+            cache=cache,
+            watermark=watermark,
+            store=store,
+            index=index,
+            tag_keywords=args.tag_keywords,
+            memory_budget=memory_budget,
+            batch_concurrency=args.batch,
         )
+        _save_watermark(watermark)
+        _close_store(store, args.columnar, args.columnar_format)
+        _close_seen_index(index)
         # if --export-cookies supplied, copy the default cookie export to that path
         if args.export_cookies:
             try:
@@ -1064,6 +1740,7 @@ def main() -> None:
                 print(f"Exported cookies to {dst}")
             except Exception as e:
                 print("Failed to export cookies to --export-cookies:", e)
+        _print_cache_stats(cache)
         print(f"Wrote {n} rows to {out}")
         return
     if args.automated_playwright:
@@ -1185,7 +1862,18 @@ def main() -> None:
             date_to=user_date_to,
             auth_token=auth_token,
             proxy_url=proxy_url,
+            cache=cache,
+            watermark=watermark,
+            store=store,
+            index=index,
+            tag_keywords=args.tag_keywords,
+            memory_budget=memory_budget,
+            batch_concurrency=args.batch,
         )
+        _save_watermark(watermark)
+        _close_store(store, args.columnar, args.columnar_format)
+        _close_seen_index(index)
+        _print_cache_stats(cache)
         print(f"Wrote {n} rows to {out}")
         return
 
@@ -1227,9 +1915,34 @@ def main() -> None:
     setattr(requests_fetch_all, "_injected_date_from", user_date_from)
     setattr(requests_fetch_all, "_injected_date_to", user_date_to)
 
+    if args.http2:
+        try:
+            session = Http2Session.from_requests(
+                session, max_connections=max(10, args.concurrency)
+            )
+            print("Using HTTP/2 transport")
+        except ImportError as e:
+            print("HTTP/2 unavailable, staying on HTTP/1.1:", e)
     n = requests_fetch_all(
-        DEFAULT_KEYWORDS, out, session=session, max_pages=args.max_pages
+        DEFAULT_KEYWORDS,
+        out,
+        session=session,
+        max_pages=args.max_pages,
+        concurrency=args.concurrency,
+        shard_threshold=args.shard_threshold,
+        shard_unit=args.shard_unit,
+        sweep=args.sweep,
+        cache=cache,
+        watermark=watermark,
+        store=store,
+        index=index,
+        tag_keywords=args.tag_keywords,
+        memory_budget=memory_budget,
     )
+    _save_watermark(watermark)
+    _close_store(store, args.columnar, args.columnar_format)
+    _close_seen_index(index)
+    _print_cache_stats(cache)
     print(f"Wrote {n} rows to {out}")
 
 
@@ -2,13 +2,59 @@
 
 import argparse
 from scraper.idx_api import (
+    IdxClient,
     fetch_matching_announcements,
     DEFAULT_KEYWORDS,
     session_from_playwright_interactive,
 )
+from scraper.breaker import TransportBreaker
+from scraper.cache import ResponseCache
+from scraper.http2 import Http2Session
+from scraper.jsonlib import read_json
+from scraper.matcher import KeywordMatcher, add_search_text, classify_replies
+from scraper.ratelimit import DEFAULT_RATE, configure_rate_limiter
+from scraper.store import AnnouncementStore
 from scraper.utils import save_json, save_csv, save_excel
 
 
+def fetch_results(args, keywords):
+    sess = None
+    if args.interactive:
+        sess = session_from_playwright_interactive()
+    configure_rate_limiter(args.rate)
+    if args.http2:
+        sess = Http2Session.from_requests(
+            sess, max_connections=max(10, args.concurrency)
+        )
+    cache = None if args.no_cache else ResponseCache()
+    client = IdxClient(
+        session=sess,
+        pool_size=max(10, args.concurrency),
+        cache=cache,
+        breaker=TransportBreaker.load(),
+    )
+
+    results = list(
+        fetch_matching_announcements(
+            keywords,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            page_size=args.page_size,
+            max_pages=args.max_pages,
+            client=client,
+            concurrency=args.concurrency,
+            shard_threshold=args.shard_threshold,
+            shard_unit=args.shard_unit,
+        )
+    )
+    print(
+        "Requests stats: {api_requests} API requests, {bytes_received} bytes "
+        "({wire_bytes} on the wire), {warmups} warm-up(s), "
+        "{requests_saved} request(s) saved".format(**client.stats)
+    )
+    return results
+
+
 def main():
     p = argparse.ArgumentParser(description="Search IDX announcements by keywords")
     p.add_argument("--output", required=True, help="Output path (.json/.csv/.xlsx)")
@@ -18,9 +64,61 @@ def main():
     p.add_argument("--date-from", default="19010101")
     p.add_argument("--date-to", default="20250920")
     p.add_argument("--page-size", type=int, default=100)
+    p.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Pages fetched in parallel once ResultCount is known (default: 1)",
+    )
+    p.add_argument(
+        "--shard-threshold",
+        type=int,
+        help="Split the date range into shards holding at most this many results "
+        "(recommended for long backfills); disabled by default",
+    )
+    p.add_argument(
+        "--shard-unit",
+        choices=["month", "year"],
+        default="year",
+        help="Initial shard window size before adaptive splitting (default: year, "
+        "unlike the exporter's month: --date-from defaults to 19010101 here, so "
+        "yearly windows keep the probes over empty history to one per year)",
+    )
     p.add_argument(
         "--keywords", nargs="*", help="Optional keywords to override built-in list"
     )
+    p.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="Max API requests per second; 0 disables limiting (default: %(default)s)",
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the on-disk API response cache",
+    )
+    p.add_argument(
+        "--tag-keywords",
+        action="store_true",
+        help="Add the list of every matching keyword to each result (JSON 'keywords', CSV/Excel 'Keywords' column)",
+    )
+    p.add_argument(
+        "--http2",
+        action="store_true",
+        help="Multiplex API calls over one HTTP/2 connection (needs httpx[http2])",
+    )
+    p.add_argument(
+        "--no-store",
+        action="store_true",
+        help="Don't upsert fetched results into the local announcement store",
+    )
+    p.add_argument(
+        "--from-json",
+        metavar="PATH",
+        help="Re-classify results saved by an earlier .json run instead of "
+        "fetching; uses their stored search_text, so no network is needed",
+    )
     p.add_argument(
         "--interactive",
         action="store_true",
@@ -31,23 +129,29 @@ def main():
 
     keywords = args.keywords if args.keywords else DEFAULT_KEYWORDS
 
-    sess = None
-    if args.interactive:
-        sess = session_from_playwright_interactive()
+    if args.from_json:
+        stored = read_json(args.from_json)
+        mask = classify_replies(stored, KeywordMatcher(keywords))
+        results = [r for r, hit in zip(stored, mask) if hit]
+        print(f"{len(results)} of {len(stored)} stored result(s) match")
+    else:
+        results = fetch_results(args, keywords)
+        if not args.no_store:
+            store = AnnouncementStore()
+            store.upsert(results)
+            store.close()
 
-    results = list(
-        fetch_matching_announcements(
-            keywords,
-            date_from=args.date_from,
-            date_to=args.date_to,
-            page_size=args.page_size,
-            max_pages=args.max_pages,
-            session=sess,
-        )
-    )
+    tags = None
+    if args.tag_keywords:
+        # one batch matching pass over all results
+        tags = classify_replies(results, KeywordMatcher(keywords), keywords=True)
+        for r, kws in zip(results, tags):
+            r["keywords"] = kws
 
     out = args.output
     if out.lower().endswith(".json"):
+        # persist the normalized haystack so --from-json can skip normalizing
+        add_search_text(results)
         save_json(results, out)
     elif out.lower().endswith(".csv"):
         # flatten minimal fields for CSV
@@ -61,10 +165,18 @@ def main():
                 "JudulPengumuman": peng.get("JudulPengumuman"),
                 "Kode_Emiten": (peng.get("Kode_Emiten") or "").strip(),
             }
+            if tags is not None:
+                row["Keywords"] = "|".join(r["keywords"])
             flat.append(row)
         save_csv(flat, out)
     elif out.lower().endswith((".xls", ".xlsx")):
-        save_excel([r.get("pengumuman") or {} for r in results], out)
+        sheet = []
+        for r in results:
+            row = dict(r.get("pengumuman") or {})
+            if tags is not None:
+                row["Keywords"] = "|".join(r["keywords"])
+            sheet.append(row)
+        save_excel(sheet, out)
     else:
         print("Unknown output format. Use .json, .csv, .xls or .xlsx")
 
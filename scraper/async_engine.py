@@ -0,0 +1,207 @@
+"""Asyncio Playwright engine that fetches through several pages at once.
+
+The sync browser paths drive a single page, so browser-mode throughput is
+bound to one request at a time. `AsyncPageEngine` opens one browser and one
+context on `playwright.async_api`. The context carries the saved storage state
+and a single auth-token init script. Inside it, K pages each stay on the IDX
+origin and pull URLs from a shared queue, so up to K fetches are in flight.
+
+The event loop runs on a private thread, so callers use a plain sync API
+(`fetch_json_many`), just as with the other transports.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from scraper import jsonlib
+from scraper.browser_pool import BATCH_FETCH_JS, IDX_HOME_URL
+from scraper.cache import ResponseCache
+from scraper.ratelimit import (
+    RETRY_STATUSES,
+    RateLimiter,
+    get_rate_limiter,
+    parse_retry_after,
+)
+
+DEFAULT_PAGES = 4
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/117.0 Safari/537.36"
+)
+
+
+class AsyncPageEngine:
+    """K concurrent Playwright pages in one browser context.
+
+    Use as a context manager. `storage_state` (dict or path) is loaded into
+    the shared context and `auth_token` is written to localStorage by one
+    init script that runs on every page. Responses are read from and stored
+    in `cache` when given, and every fetch draws from the shared rate limiter.
+    """
+
+    def __init__(
+        self,
+        pages: int = DEFAULT_PAGES,
+        headless: bool = True,
+        storage_state: Optional[Any] = None,
+        auth_token: Optional[str] = None,
+        proxy: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[RateLimiter] = None,
+        max_attempts: int = 3,
+    ) -> None:
+        try:
+            import playwright.async_api  # noqa: F401
+        except Exception as e:
+            raise ImportError("Playwright not available: %s" % e)
+        self.pages = max(1, pages)
+        self.headless = headless
+        self.storage_state = storage_state
+        self.auth_token = auth_token
+        self.proxy = proxy
+        self.cache = cache
+        self.limiter = limiter or get_rate_limiter()
+        self.max_attempts = max_attempts
+        self.stats = {"fetched": 0, "cached": 0, "failed": 0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._free: Optional["asyncio.Queue"] = None
+
+    # -- sync facade -------------------------------------------------------
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def start(self) -> "AsyncPageEngine":
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="idx-async-engine", daemon=True
+        )
+        self._thread.start()
+        try:
+            self._run(self._start())
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def fetch_json_many(self, urls: Sequence[str]) -> Dict[str, Dict]:
+        """Fetch and decode `urls` across all pages; `{url: data}` (`{}` on failure)."""
+        return self._run(self._fetch_many(list(dict.fromkeys(urls))))
+
+    def save_storage_state(self) -> Dict:
+        """Return the shared context's storage state (cookies + localStorage)."""
+        return self._run(self._context.storage_state())
+
+    def close(self) -> None:
+        if self._loop is None:
+            return
+        try:
+            self._run(self._stop())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(10)
+            self._loop.close()
+            self._loop = None
+
+    def __enter__(self) -> "AsyncPageEngine":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- event-loop side ---------------------------------------------------
+
+    async def _start(self) -> None:
+        from playwright.async_api import async_playwright
+
+        self._pw = await async_playwright().start()
+        launch_args: Dict[str, Any] = {}
+        if self.proxy:
+            server = self.proxy
+            if not server.startswith("http"):
+                server = "http://" + server
+            launch_args["proxy"] = {"server": server}
+        self._browser = await self._pw.chromium.launch(
+            headless=self.headless, **launch_args
+        )
+        context_args: Dict[str, Any] = {"locale": "id-ID", "user_agent": USER_AGENT}
+        if self.storage_state:
+            context_args["storage_state"] = self.storage_state
+        self._context = await self._browser.new_context(**context_args)
+        if self.auth_token:
+            # one injection shared by every page in the context
+            await self._context.add_init_script(
+                "localStorage.setItem('auth._token.local', %s);"
+                % json.dumps(self.auth_token)
+            )
+        pages = [await self._context.new_page() for _ in range(self.pages)]
+        # every page must sit on the IDX origin for same-origin fetch()
+        await asyncio.gather(*(self._warm(p) for p in pages))
+        self._free = asyncio.Queue()
+        for p in pages:
+            self._free.put_nowait(p)
+
+    async def _warm(self, page) -> None:
+        try:
+            await page.goto(IDX_HOME_URL, timeout=60000)
+            await page.wait_for_load_state("networkidle", timeout=60000)
+        except Exception:
+            # ignore warm-up errors
+            pass
+
+    async def _stop(self) -> None:
+        for closer in (self._context, self._browser):
+            if closer is not None:
+                try:
+                    await closer.close()
+                except Exception:
+                    pass
+        if self._pw is not None:
+            await self._pw.stop()
+
+    async def _fetch_many(self, urls: List[str]) -> Dict[str, Dict]:
+        results = await asyncio.gather(*(self._fetch_json(u) for u in urls))
+        return dict(zip(urls, results))
+
+    async def _fetch_json(self, url: str) -> Dict:
+        if self.cache is not None:
+            cached = self.cache.get_url(url)
+            if cached is not None:
+                self.stats["cached"] += 1
+                return jsonlib.loads(cached)
+        for attempt in range(self.max_attempts):
+            await asyncio.to_thread(self.limiter.acquire)
+            page = await self._free.get()
+            try:
+                batch = {"urls": [url], "concurrency": 1}
+                item = (await page.evaluate(BATCH_FETCH_JS, batch))[0]
+            except Exception as e:
+                print("  async fetch error:", e)
+                item = {"status": 0, "body": None}
+            finally:
+                self._free.put_nowait(page)
+            retry_after = None
+            if item.get("status") in RETRY_STATUSES:
+                retry_after = parse_retry_after(item.get("retryAfter"))
+            else:
+                text = (item.get("body") or "").strip()
+                if text.startswith("{") or text.startswith("["):
+                    try:
+                        data = jsonlib.loads(text)
+                    except ValueError as e:
+                        print("  json parse error:", e)
+                        break
+                    if self.cache is not None:
+                        self.cache.put_url(url, text.encode("utf-8"))
+                    self.stats["fetched"] += 1
+                    return data
+            if attempt + 1 < self.max_attempts:
+                await asyncio.sleep(self.limiter.backoff_delay(attempt, retry_after))
+        self.stats["failed"] += 1
+        return {}
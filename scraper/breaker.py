@@ -0,0 +1,115 @@
+"""Circuit breaker that remembers which transport gets past the site's blocking.
+
+Transports are tried cheapest first: plain requests, requests with an
+alternate User-Agent, then Playwright. When the cheaper transports have each
+been blocked `threshold` times in a row and a more expensive one succeeds,
+the run is pinned to that transport. The cheaper ones are skipped until
+`cooldown` seconds pass, then probed again. The pin is saved to disk so the
+next run starts on the transport that worked last time.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from scraper.config import config_path
+from scraper.jsonlib import read_json, write_json
+
+DEFAULT_BREAKER_PATH = config_path("transport_breaker.json")
+TRANSPORTS = ("requests", "requests_alt_ua", "playwright")
+
+
+class TransportBreaker:
+    """Per-transport failure tracking with a persisted pinned transport."""
+
+    def __init__(
+        self,
+        transports: Sequence[str] = TRANSPORTS,
+        threshold: int = 3,
+        cooldown: float = 30 * 60,
+        path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.transports = list(transports)
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.path = Path(path) if path else None
+        self.failures: Dict[str, int] = {t: 0 for t in self.transports}
+        self.pinned: Optional[str] = None
+        self.pinned_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path] = DEFAULT_BREAKER_PATH, **kwargs
+    ) -> "TransportBreaker":
+        """Create a breaker persisted at `path`, restoring any saved state."""
+        breaker = cls(path=path, **kwargs)
+        try:
+            data = read_json(path)
+        except Exception:
+            return breaker
+        if data.get("pinned") in breaker.transports:
+            breaker.pinned = data["pinned"]
+            breaker.pinned_at = float(data.get("pinned_at") or 0.0)
+        for t, n in (data.get("failures") or {}).items():
+            if t in breaker.failures:
+                breaker.failures[t] = int(n)
+        return breaker
+
+    def _save(self) -> None:
+        # caller holds the lock
+        if self.path is None:
+            return
+        data = {
+            "pinned": self.pinned,
+            "pinned_at": self.pinned_at,
+            "failures": self.failures,
+        }
+        try:
+            write_json(self.path, data)
+        except OSError:
+            pass
+
+    def order(self) -> List[str]:
+        """Transports to try for the next request, cheapest first.
+
+        While a pin is fresh the cheaper transports are skipped; once the
+        cooldown has elapsed every transport is eligible again (a probe).
+        """
+        with self._lock:
+            if self.pinned and time.time() - self.pinned_at < self.cooldown:
+                return self.transports[self.transports.index(self.pinned) :]
+            return list(self.transports)
+
+    def record_failure(self, transport: str) -> None:
+        """Count a blocked attempt (403 / challenge) on `transport`."""
+        with self._lock:
+            self.failures[transport] = self.failures.get(transport, 0) + 1
+            if self.failures[transport] == self.threshold:
+                self._save()
+
+    def record_success(self, transport: str) -> None:
+        """Reset `transport`; pin it if every cheaper transport is tripped."""
+        with self._lock:
+            self.failures[transport] = 0
+            cheaper = self.transports[: self.transports.index(transport)]
+            tripped = bool(cheaper) and all(
+                self.failures.get(t, 0) >= self.threshold for t in cheaper
+            )
+            now = time.time()
+            rank = self.transports.index(transport)
+            if tripped:
+                # (re)pin on a new transport or after a cooldown probe; plain
+                # successes on the pinned transport must not extend the pin
+                if self.pinned != transport or now - self.pinned_at >= self.cooldown:
+                    if self.pinned != transport:
+                        print(f"Transport breaker: pinning run to '{transport}'")
+                    self.pinned = transport
+                    self.pinned_at = now
+                    self._save()
+            elif self.pinned and rank < self.transports.index(self.pinned):
+                # a cheaper transport works again
+                self.pinned = None
+                self.pinned_at = 0.0
+                self._save()
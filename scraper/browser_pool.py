@@ -0,0 +1,367 @@
+"""Reusable Playwright browser pool for API fetches.
+
+Launching Chromium and waiting for the homepage to settle costs seconds, so
+the pool keeps warm, challenge-cleared pages alive and serves many fetches
+from them. Playwright's sync API objects may only be used from the thread
+that created them, so each pool slot is a worker thread that owns its own
+browser, context and page. Callers submit jobs from any thread and wait on a
+`concurrent.futures.Future`.
+
+A context is rebuilt (and re-warmed) after `max_context_age` seconds, after
+`max_context_uses` jobs, or after any job fails. The pool shuts down at
+interpreter exit.
+
+`fetch_json_batch(page, urls)` sends API URLs to the page a rate-limiter
+burst at a time, each chunk in one `evaluate` call. The fetches run
+concurrently under a cap and per-URL status and body come back together, so
+N URLs cost N / burst Python-to-browser round-trips instead of N.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from scraper import jsonlib
+from scraper.cache import ResponseCache
+from scraper.ratelimit import (
+    RETRY_STATUSES,
+    RateLimiter,
+    get_rate_limiter,
+    parse_retry_after,
+)
+
+IDX_HOME_URL = "https://www.idx.co.id/"
+
+FETCH_JS = (
+    "(url) => fetch(url, {headers: {'Accept': 'application/json', "
+    "'X-Requested-With': 'XMLHttpRequest', 'Referer': 'https://www.idx.co.id/'}})"
+    ".then(r => r.text())"
+)
+
+DEFAULT_BATCH_CONCURRENCY = 6
+
+# Fetch every URL with at most `concurrency` requests in flight; results keep
+# the input order. Failed fetches report status 0 and the error text.
+BATCH_FETCH_JS = """
+async ({urls, concurrency}) => {
+  const headers = {'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest',
+                   'Referer': 'https://www.idx.co.id/'};
+  const out = new Array(urls.length);
+  let next = 0;
+  const worker = async () => {
+    while (next < urls.length) {
+      const i = next++;
+      try {
+        const r = await fetch(urls[i], {headers, credentials: 'include'});
+        out[i] = {url: urls[i], status: r.status, body: await r.text(),
+                  retryAfter: r.headers.get('retry-after')};
+      } catch (e) {
+        out[i] = {url: urls[i], status: 0, body: null, error: String(e)};
+      }
+    }
+  };
+  await Promise.all(Array.from({length: Math.min(concurrency, urls.length)}, worker));
+  return out;
+}
+"""
+
+
+def evaluate_batch(
+    page, urls: Sequence[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+) -> List[Dict]:
+    """Fetch `urls` in page context with one `evaluate` call.
+
+    Returns one `{url, status, body, retryAfter}` dict per URL, in order.
+    """
+    if not urls:
+        return []
+    return page.evaluate(
+        BATCH_FETCH_JS, {"urls": list(urls), "concurrency": max(1, concurrency)}
+    )
+
+
+def fetch_json_batch(
+    page,
+    urls: Sequence[str],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    cache: Optional[ResponseCache] = None,
+    limiter: Optional[RateLimiter] = None,
+    max_attempts: int = 3,
+) -> Dict[str, Dict]:
+    """Fetch and decode many API URLs through `page`, batching round-trips.
+
+    Cached URLs are served from `cache`; the rest are fetched in chunks of
+    `limiter.burst` URLs, one `evaluate` each. A chunk draws one token per
+    URL just before it is sent, so the shared limiter paces the chunks
+    (an `evaluate` itself fetches at full speed). URLs that come back
+    throttled (429/503), empty or non-JSON are retried as a smaller batch
+    after one backoff, up to `max_attempts` rounds. Returns `{url: data}`;
+    URLs that never succeeded map to `{}`.
+    """
+    limiter = limiter or get_rate_limiter()
+    results: Dict[str, Dict] = {}
+    pending: List[str] = []
+    for url in dict.fromkeys(urls):
+        cached = cache.get_url(url) if cache is not None else None
+        if cached is not None:
+            results[url] = jsonlib.loads(cached)
+        else:
+            pending.append(url)
+
+    for attempt in range(max_attempts):
+        if not pending:
+            break
+        retry: List[str] = []
+        retry_after: Optional[float] = None
+        for i in range(0, len(pending), limiter.burst):
+            chunk = pending[i : i + limiter.burst]
+            for _ in chunk:
+                limiter.acquire()
+            try:
+                replies = evaluate_batch(page, chunk, concurrency)
+            except Exception as e:
+                print("  batch fetch error:", e)
+                retry.extend(chunk)
+                continue
+            retry_after = _collect_batch(replies, results, retry, retry_after, cache)
+        pending = retry
+        if pending and attempt + 1 < max_attempts:
+            print(f"  {len(pending)} batched fetch(es) failed; backing off")
+            limiter.backoff(attempt, retry_after)
+
+    for url in pending:
+        results.setdefault(url, {})
+    return results
+
+
+def _collect_batch(
+    replies: List[Dict],
+    results: Dict[str, Dict],
+    retry: List[str],
+    retry_after: Optional[float],
+    cache: Optional[ResponseCache],
+) -> Optional[float]:
+    """Decode one `evaluate_batch` result into `results`; URLs to retry go to
+    `retry`. Returns `retry_after` raised to any `Retry-After` seen."""
+    for item in replies:
+        url, status, text = item.get("url"), item.get("status"), item.get("body")
+        if status in RETRY_STATUSES:
+            retry.append(url)
+            ra = parse_retry_after(item.get("retryAfter"))
+            if ra is not None:
+                retry_after = max(retry_after or 0.0, ra)
+            continue
+        stripped = (text or "").strip()
+        if not stripped.startswith("{") and not stripped.startswith("["):
+            # empty body, network error or challenge page
+            retry.append(url)
+            continue
+        try:
+            results[url] = jsonlib.loads(stripped)
+        except ValueError as e:
+            print("  json parse error:", e)
+            results[url] = {}
+            continue
+        if cache is not None:
+            cache.put_url(url, stripped.encode("utf-8"))
+    return retry_after
+
+
+class _Worker(threading.Thread):
+    """Owns one browser/context/page; runs jobs from the shared queue."""
+
+    def __init__(self, pool: "BrowserPool", index: int) -> None:
+        super().__init__(name=f"idx-browser-{index}", daemon=True)
+        self.pool = pool
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.context_started = 0.0
+        self.context_uses = 0
+
+    def run(self) -> None:
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as pw:
+            while True:
+                job = self.pool._jobs.get()
+                if job is None:
+                    break
+                fn, fut = job
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                try:
+                    page = self._ensure_page(pw)
+                    self.context_uses += 1
+                    fut.set_result(fn(page))
+                except BaseException as e:
+                    # treat the context as stale; the next job gets a fresh one
+                    self._close_context()
+                    fut.set_exception(e)
+            self._close_context()
+            if self.browser is not None:
+                try:
+                    self.browser.close()
+                except Exception:
+                    pass
+
+    def _stale(self) -> bool:
+        pool = self.pool
+        return (
+            self.page is None
+            or time.monotonic() - self.context_started > pool.max_context_age
+            or self.context_uses >= pool.max_context_uses
+        )
+
+    def _ensure_page(self, pw):
+        if not self._stale():
+            return self.page
+        self._close_context()
+        pool = self.pool
+        if self.browser is None or not self.browser.is_connected():
+            launch_args: Dict[str, Any] = {}
+            if pool.proxy:
+                server = pool.proxy if pool.proxy.startswith("http") else "http://" + pool.proxy
+                launch_args["proxy"] = {"server": server}
+            self.browser = pw.chromium.launch(headless=pool.headless, **launch_args)
+        context_args: Dict[str, Any] = {"locale": "id-ID"}
+        if pool.storage_state:
+            context_args["storage_state"] = pool.storage_state
+        self.context = self.browser.new_context(**context_args)
+        self.page = self.context.new_page()
+        # First visit main site to allow any anti-bot JS to run
+        try:
+            self.page.goto(IDX_HOME_URL, timeout=30000)
+            self.page.wait_for_load_state("networkidle", timeout=30000)
+        except Exception:
+            # ignore warm-up errors
+            pass
+        self.context_started = time.monotonic()
+        self.context_uses = 0
+        with pool._lock:
+            pool.stats["contexts_started"] += 1
+        return self.page
+
+    def _close_context(self) -> None:
+        if self.context is not None:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+        self.context = None
+        self.page = None
+
+
+class BrowserPool:
+    """Thread-safe pool of `size` warm Playwright pages.
+
+    `submit(fn)` runs `fn(page)` on a free worker and returns a Future;
+    `fetch_text(url)` / `fetch_json(url)` run an in-page `fetch()` so requests
+    carry the browser's cookies and challenge clearance.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        headless: bool = True,
+        storage_state: Optional[Any] = None,
+        proxy: Optional[str] = None,
+        max_context_age: float = 10 * 60,
+        max_context_uses: int = 500,
+    ) -> None:
+        try:
+            import playwright.sync_api  # noqa: F401
+        except Exception as e:
+            raise ImportError("Playwright not available: %s" % e)
+        self.size = max(1, size)
+        self.headless = headless
+        self.storage_state = storage_state
+        self.proxy = proxy
+        self.max_context_age = max_context_age
+        self.max_context_uses = max_context_uses
+        self.stats = {"jobs": 0, "contexts_started": 0}
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _start(self) -> None:
+        # caller holds the lock
+        if not self._workers:
+            self._workers = [_Worker(self, i) for i in range(self.size)]
+            for w in self._workers:
+                w.start()
+
+    def submit(self, fn: Callable[[Any], Any]) -> Future:
+        """Run `fn(page)` on a pooled page; returns a Future with its result."""
+        fut: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool is closed")
+            self._start()
+            self.stats["jobs"] += 1
+        self._jobs.put((fn, fut))
+        return fut
+
+    def fetch_text(self, url: str, timeout: Optional[float] = 120) -> str:
+        return self.submit(lambda page: page.evaluate(FETCH_JS, url)).result(timeout)
+
+    def fetch_json(self, url: str, timeout: Optional[float] = 120) -> Dict:
+        """Fetch `url` in page context and decode it as JSON.
+
+        A non-JSON body (typically a challenge page) raises RuntimeError and
+        recycles the worker's context.
+        """
+
+        def _job(page):
+            text = page.evaluate(FETCH_JS, url)
+            try:
+                return jsonlib.loads(text)
+            except Exception as e:
+                excerpt = (text or "")[:500]
+                raise RuntimeError(
+                    f"Playwright fetched non-JSON response: {e}; excerpt: {excerpt}"
+                )
+
+        return self.submit(_job).result(timeout)
+
+    def fetch_json_batch(
+        self,
+        urls: Sequence[str],
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        cache: Optional[ResponseCache] = None,
+        timeout: Optional[float] = 600,
+    ) -> Dict[str, Dict]:
+        """Batched `fetch_json` on one pooled page; see `fetch_json_batch`."""
+        return self.submit(
+            lambda page: fetch_json_batch(page, urls, concurrency, cache)
+        ).result(timeout)
+
+    def close(self, timeout: float = 10) -> None:
+        """Stop all workers and close their browsers."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._jobs.put(None)
+        for w in workers:
+            w.join(timeout)
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide headless pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,177 @@
+"""Persistent on-disk cache for GetAnnouncement responses.
+
+Entries are raw JSON response bodies keyed by the normalized query params, so
+every transport (requests, Playwright `context.request`, `page.evaluate`) can
+share one cache. A window whose `dateTo` lies before today is closed and can
+no longer change, so its entries never expire; windows that include today get
+a TTL, and with a TTL of 0 they bypass the cache entirely (incremental polls
+must see the live first page). The total size is bounded with
+least-recently-used eviction.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from scraper.config import config_path
+
+DEFAULT_CACHE_PATH = config_path("response_cache.sqlite3")
+DEFAULT_TTL = 15 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# params that identify a response, with the API defaults used when omitted
+CACHE_PARAMS = {
+    "keyword": "",
+    "dateFrom": "",
+    "dateTo": "",
+    "indexFrom": "0",
+    "pageSize": "",
+    "lang": "id",
+    "emitenType": "*",
+}
+
+
+def cache_key(params: Mapping) -> str:
+    """Normalize query params into a stable cache key."""
+    norm = {}
+    for name, default in CACHE_PARAMS.items():
+        value = params.get(name)
+        norm[name] = default if value is None else str(value).strip()
+    return urlencode(sorted(norm.items()))
+
+
+def params_from_url(url: str) -> Dict[str, str]:
+    """Extract the query params from an API URL."""
+    return dict(parse_qsl(urlsplit(url).query, keep_blank_values=True))
+
+
+def is_closed_window(params: Mapping, today: Optional[str] = None) -> bool:
+    """True when the window's `dateTo` (YYYYMMDD) is strictly before today."""
+    date_to = str(params.get("dateTo") or "")
+    if len(date_to) != 8 or not date_to.isdigit():
+        return False
+    today = today or datetime.now().strftime("%Y%m%d")
+    return date_to < today
+
+
+class ResponseCache:
+    """SQLite-backed response cache with per-entry TTL and LRU size bound.
+
+    Thread-safe: one connection guarded by a lock. `stats` counts hits,
+    misses, stores, expired entries and evictions. With `ttl <= 0` only
+    closed windows are cached: open ones are neither served nor stored.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_CACHE_PATH,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " body BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires_at REAL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, params: Mapping) -> Optional[bytes]:
+        """Return the cached body for `params`, or None on miss/expiry."""
+        if self.ttl <= 0 and not is_closed_window(params):
+            # entries written by runs with a TTL may still be live; skip them
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        key = cache_key(params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            body, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.stats["hits"] += 1
+            return bytes(body)
+
+    def put(self, params: Mapping, body: bytes, ttl: Optional[float] = None) -> None:
+        """Store `body` for `params`.
+
+        Closed windows never expire; otherwise the entry lives `ttl` seconds
+        (default: the cache's TTL). Bodies larger than the whole cache are
+        not stored.
+        """
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        if is_closed_window(params):
+            expires_at = None
+        else:
+            ttl = self.ttl if ttl is None else ttl
+            if ttl <= 0:
+                return
+            expires_at = now + ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, size, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (cache_key(params), body, len(body), expires_at, now),
+            )
+            self.stats["stores"] += 1
+            self._evict()
+            self._conn.commit()
+
+    def get_url(self, url: str) -> Optional[bytes]:
+        return self.get(params_from_url(url))
+
+    def put_url(self, url: str, body: bytes, ttl: Optional[float] = None) -> None:
+        self.put(params_from_url(url), body, ttl=ttl)
+
+    def _evict(self) -> None:
+        # caller holds the lock
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.stats["evictions"] += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,306 @@
+"""Columnar export of announcements, partitioned by year and month.
+
+Replies are written as Parquet (or Arrow IPC) files under a hive-style
+layout, `root/year=2024/month=6/part-0.parquet`, with typed columns: the
+announcement time is a timestamp, emiten codes are dictionary-encoded and
+attachments are a list of filenames. Analytics jobs can read just the
+columns and months they need, e.g. `pyarrow.dataset.dataset(root,
+partitioning="hive")` or `pandas.read_parquet(root)`.
+
+Export appends. A partition written after its month ended gets a
+`_COMPLETE` marker file (ignored by dataset readers, like any `_`-prefixed
+file) and is skipped by later exports unless `replace=True`. One written
+while its month was still open has no marker, so it is rewritten on every
+export until a run after the month's end writes it a last time, complete.
+`write_store` exports an `AnnouncementStore` one month query at a time. Its
+markers hold the month's newest `updated_at` in the store, and a complete
+month is written again once the store has newer rows for it (a backfill or
+an edited announcement).
+Requires `pyarrow`.
+"""
+
+import calendar
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from scraper.dates import DateParser
+from scraper.store import AnnouncementStore
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+# rows converted to Arrow and written at a time
+BATCH_ROWS = 10000
+# written into a partition whose month had ended when it was written; holds
+# the month's newest store `updated_at` when written by `write_store`
+COMPLETE_MARKER = "_COMPLETE"
+# shared so grouping and table building reuse each other's parsed dates
+_DATES = DateParser()
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Columnar export needs pyarrow: pip install pyarrow (%s)" % e
+        )
+    return pyarrow
+
+
+def schema():
+    """Arrow schema of one partition file (year/month live in the path)."""
+    pa = _pyarrow()
+    return pa.schema(
+        [
+            ("id2", pa.string()),
+            ("no_pengumuman", pa.string()),
+            ("kode_emiten", pa.dictionary(pa.int32(), pa.string())),
+            # parquet has no second resolution; ms round-trips in both formats
+            ("tgl", pa.timestamp("ms")),
+            ("judul", pa.string()),
+            ("perihal", pa.string()),
+            ("attachments", pa.list_(pa.string())),
+        ]
+    )
+
+
+def group_by_month(
+    replies: Iterable[Dict],
+) -> Tuple[Dict[Tuple[int, int], List[Dict]], int]:
+    """Group replies by the (year, month) of `TglPengumuman`.
+
+    Returns the groups and the number of replies without a usable date.
+    """
+    groups: Dict[Tuple[int, int], List[Dict]] = {}
+    undated = 0
+    for reply in replies:
+        epoch = _DATES.parse(_tgl(reply))
+        if epoch is None:
+            undated += 1
+            continue
+        tm = time.gmtime(epoch)
+        groups.setdefault((tm.tm_year, tm.tm_mon), []).append(reply)
+    return groups, undated
+
+
+def _tgl(reply: Optional[Dict]) -> Optional[str]:
+    return ((reply or {}).get("pengumuman") or {}).get("TglPengumuman")
+
+
+def _epochs(replies: List[Dict]) -> List[Optional[int]]:
+    return _DATES.parse_many(_tgl(r) for r in replies)
+
+
+def partition_dir(root: Union[str, Path], year: int, month: int) -> Path:
+    return Path(root) / f"year={year}" / f"month={month}"
+
+
+def existing_partitions(root: Union[str, Path]) -> Set[Tuple[int, int]]:
+    """(year, month) of every partition already under `root`."""
+    found = set()
+    for d in Path(root).glob("year=*/month=*"):
+        if d.is_dir() and d.name[6:].isdigit() and any(d.iterdir()):
+            found.add((int(d.parent.name[5:]), int(d.name[6:])))
+    return found
+
+
+def complete_partitions(root: Union[str, Path]) -> Set[Tuple[int, int]]:
+    """(year, month) of the partitions written after their month ended."""
+    return {
+        (y, m)
+        for y, m in existing_partitions(root)
+        if (partition_dir(root, y, m) / COMPLETE_MARKER).exists()
+    }
+
+
+def marker_updated_at(root: Union[str, Path], year: int, month: int) -> Optional[float]:
+    """`updated_at` recorded in a partition's marker; None if it has none."""
+    try:
+        text = (partition_dir(root, year, month) / COMPLETE_MARKER).read_text()
+        return float(text)
+    except (OSError, ValueError):
+        return None
+
+
+def is_closed_month(year: int, month: int, today: Optional[datetime] = None) -> bool:
+    """True once the month has ended, so its announcements can't change."""
+    today = today or datetime.now()
+    return (year, month) < (today.year, today.month)
+
+
+def _table(replies: List[Dict]):
+    pa = _pyarrow()
+    cols: Dict[str, list] = {name: [] for name in schema().names}
+    for reply in replies:
+        peng = reply.get("pengumuman") or {}
+        cols["id2"].append(str(peng.get("Id2") or "") or None)
+        cols["no_pengumuman"].append(peng.get("NoPengumuman"))
+        cols["kode_emiten"].append((peng.get("Kode_Emiten") or "").strip())
+        cols["judul"].append(peng.get("JudulPengumuman"))
+        cols["perihal"].append(peng.get("PerihalPengumuman"))
+        cols["attachments"].append(
+            [
+                str(a.get("OriginalFilename") or a.get("PDFFilename"))
+                for a in reply.get("attachments") or []
+                if a.get("OriginalFilename") or a.get("PDFFilename")
+            ]
+        )
+    cols["tgl"] = [epoch * 1000 for epoch in _epochs(replies)]
+    return pa.table(cols, schema=schema())
+
+
+def _batches(replies: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    batch: List[Dict] = []
+    for reply in replies:
+        batch.append(reply)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_partition(
+    replies: Iterable[Dict],
+    root: Union[str, Path],
+    year: int,
+    month: int,
+    fmt: str = "parquet",
+    complete: bool = False,
+    updated_at: Optional[float] = None,
+) -> int:
+    """Replace one partition with `replies`, streamed in row batches.
+
+    Rows keep the order of `replies` (pass them newest first to match the
+    CSV export). `complete` writes the `_COMPLETE` marker, holding
+    `updated_at` if given. Nothing is written, and any old partition is
+    kept, when `replies` is empty. Returns the rows written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError("unknown columnar format %r" % fmt)
+    pa = _pyarrow()
+    d = partition_dir(root, year, month)
+    tmp = d.with_name(d.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    path = tmp / ("part-0" + FORMATS[fmt])
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(str(path), schema(), compression="zstd")
+    else:
+        writer = pa.ipc.new_file(str(path), schema())
+    rows = 0
+    try:
+        with writer:
+            for batch in _batches(replies, BATCH_ROWS):
+                writer.write_table(_table(batch))
+                rows += len(batch)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    if not rows:
+        shutil.rmtree(tmp, ignore_errors=True)
+        return 0
+    if complete:
+        marker = tmp / COMPLETE_MARKER
+        marker.write_text("" if updated_at is None else repr(updated_at))
+    # swap in the finished partition so readers never see a partial one
+    shutil.rmtree(d, ignore_errors=True)
+    tmp.rename(d)
+    return rows
+
+
+def write_partitioned(
+    replies: Iterable[Dict],
+    root: Union[str, Path],
+    fmt: str = "parquet",
+    replace: bool = False,
+    today: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """Write `replies` under `root`, one file per (year, month) partition.
+
+    The replies are grouped in memory; use `write_store` for a whole store.
+    Complete partitions are skipped unless `replace`; everything else is
+    (re)written whole, and marked complete when its month has ended by
+    `today` (default: now). Returns counts of partitions written and
+    skipped, rows written and undated replies.
+    """
+    if fmt not in FORMATS:
+        raise ValueError("unknown columnar format %r" % fmt)
+    groups, undated = group_by_month(replies)
+    complete = set() if replace else complete_partitions(root)
+    stats = {"partitions": 0, "skipped": 0, "rows": 0, "undated": undated}
+    for (year, month), group in sorted(groups.items()):
+        if (year, month) in complete:
+            stats["skipped"] += 1
+            continue
+        # newest first within a partition, matching the CSV export
+        group.sort(key=lambda r: _DATES.parse(_tgl(r)), reverse=True)
+        stats["rows"] += write_partition(
+            group, root, year, month, fmt, is_closed_month(year, month, today)
+        )
+        stats["partitions"] += 1
+    return stats
+
+
+def _months(first: int, last: int) -> Iterator[Tuple[int, int]]:
+    start, end = time.gmtime(first), time.gmtime(last)
+    year, month = start.tm_year, start.tm_mon
+    while (year, month) <= (end.tm_year, end.tm_mon):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def write_store(
+    store: AnnouncementStore,
+    root: Union[str, Path],
+    fmt: str = "parquet",
+    replace: bool = False,
+    today: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """Export an `AnnouncementStore` under `root`, month by month.
+
+    Each month's newest `updated_at` comes from one indexed query. A
+    complete partition whose marker already records it is skipped; every
+    other month with rows is read with a date-range query whose rows stream
+    straight into the partition file, so neither the store's history nor a
+    whole month is held in memory. Same stats as `write_partitioned`.
+    """
+    if fmt not in FORMATS:
+        raise ValueError("unknown columnar format %r" % fmt)
+    stats = {
+        "partitions": 0,
+        "skipped": 0,
+        "rows": 0,
+        "undated": store.count_undated(),
+    }
+    span = store.tgl_range()
+    if span is None:
+        return stats
+    for year, month in _months(*span):
+        date_from = "%04d%02d01" % (year, month)
+        date_to = "%04d%02d%02d" % (year, month, calendar.monthrange(year, month)[1])
+        updated_at = store.max_updated_at(date_from, date_to)
+        if updated_at is None:
+            continue
+        written = None if replace else marker_updated_at(root, year, month)
+        if written is not None and updated_at <= written:
+            stats["skipped"] += 1
+            continue
+        replies = store.replies(date_from=date_from, date_to=date_to)
+        rows = write_partition(
+            replies,
+            root,
+            year,
+            month,
+            fmt,
+            is_closed_month(year, month, today),
+            updated_at,
+        )
+        if rows:
+            stats["partitions"] += 1
+            stats["rows"] += rows
+    return stats
@@ -0,0 +1,19 @@
+"""Shared on-disk locations for idx-scraper state.
+
+Everything persistent (Playwright storage state, cookies, caches) lives under
+`$XDG_CONFIG_HOME/idx-scraper` or `~/.config/idx-scraper`, which keeps cron and
+CI runs pointing at the same place.
+"""
+
+import os
+from pathlib import Path
+
+CONFIG_DIR = (
+    Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config") / "idx-scraper"
+)
+
+
+def config_path(name: str) -> Path:
+    """Return `CONFIG_DIR / name`, creating the config directory if needed."""
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    return CONFIG_DIR / name
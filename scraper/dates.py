@@ -0,0 +1,169 @@
+"""Announcement date parsing to epoch seconds.
+
+IDX timestamps come in a handful of layouts (ISO from the API, the
+`dd/mm/YYYY hh:mm:ss AM` form from older exports). A `DateParser` sniffs the
+layout from the first value it sees and keeps using it, so a source with one
+layout pays for one format check per value instead of a try/except cascade.
+A value in another layout triggers a re-sniff. Results are memoized, since
+many announcements share a timestamp.
+
+Naive timestamps are read as UTC wall-clock time, which keeps epochs
+independent of the machine's timezone. Aware ones use their offset.
+`parse_many` parses a batch, deduplicating first and handing large batches
+to pandas in one vectorized call.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+# sort key for records without a usable date: older than any real one
+MISSING_EPOCH = -(2**62)
+DEFAULT_MEMO_SIZE = 1 << 16
+# batches with at least this many distinct unparsed values go through pandas
+VECTOR_MIN = 512
+
+# (name, strptime format or None for ISO), in sniffing order
+FORMATS: Tuple[Tuple[str, Optional[str]], ...] = (
+    ("iso", None),
+    ("dmy_time", "%d/%m/%Y %I:%M:%S %p"),
+    ("dmy", "%d/%m/%Y"),
+)
+
+
+def _epoch(dt: datetime) -> int:
+    if dt.tzinfo is not None:
+        return int(dt.timestamp())
+    return (dt - _EPOCH) // _SECOND
+
+
+def _parser(fmt: Optional[str]) -> Callable[[str], datetime]:
+    if fmt is None:
+        return datetime.fromisoformat
+    return lambda s: datetime.strptime(s, fmt)
+
+
+_PARSERS = {name: _parser(fmt) for name, fmt in FORMATS}
+
+
+def sniff_format(value: str) -> Optional[str]:
+    """Name of the first format in `FORMATS` that parses `value`."""
+    value = value.strip()
+    for name, _ in FORMATS:
+        try:
+            _PARSERS[name](value)
+        except ValueError:
+            continue
+        return name
+    return None
+
+
+class DateParser:
+    """Parses one source's timestamps to epoch seconds (or None).
+
+    The format is sniffed from the first parseable value; `format` shows
+    which one is in use. Safe to share between threads: the memo is a plain
+    dict (cleared when full) and a format switch is one attribute store.
+    """
+
+    def __init__(
+        self, format: Optional[str] = None, memo_size: int = DEFAULT_MEMO_SIZE
+    ) -> None:
+        self.format = format
+        self.memo_size = memo_size
+        self._memo: Dict[str, Optional[int]] = {}
+
+    def _parse(self, value: str) -> Optional[int]:
+        s = value.strip()
+        if not s:
+            return None
+        if self.format is not None:
+            try:
+                return _epoch(_PARSERS[self.format](s))
+            except ValueError:
+                pass
+        name = sniff_format(s)
+        if name is None:
+            return None
+        self.format = name
+        return _epoch(_PARSERS[name](s))
+
+    def _remember(self, value: str, epoch: Optional[int]) -> None:
+        if len(self._memo) >= self.memo_size:
+            self._memo.clear()
+        self._memo[value] = epoch
+
+    def parse(self, value: Optional[str]) -> Optional[int]:
+        if not value:
+            return None
+        try:
+            return self._memo[value]
+        except KeyError:
+            pass
+        epoch = self._parse(value)
+        self._remember(value, epoch)
+        return epoch
+
+    def parse_many(self, values: Iterable[Optional[str]]) -> List[Optional[int]]:
+        """Parse a batch; equal to `[parse(v) for v in values]`."""
+        values = list(values)
+        memo = self._memo
+        todo = [v for v in dict.fromkeys(values) if v and v not in memo]
+        if len(todo) >= VECTOR_MIN:
+            for value, epoch in zip(todo, self._vectorized(todo)):
+                self._remember(value, epoch)
+        else:
+            for value in todo:
+                self.parse(value)
+        return [self.parse(v) for v in values]
+
+    def _vectorized(self, values: List[str]) -> List[Optional[int]]:
+        import pandas as pd
+
+        if self.format is None:
+            self.format = next(
+                (n for n in map(sniff_format, values[:16]) if n is not None), None
+            )
+        if self.format is None:
+            return [self._parse(v) for v in values]
+        fmt = dict(FORMATS)[self.format]
+        stripped = pd.Series(values, dtype="object").str.strip()
+        try:
+            parsed = pd.to_datetime(stripped, format=fmt or "ISO8601", errors="coerce")
+            if parsed.dt.tz is not None:
+                parsed = parsed.dt.tz_convert(timezone.utc).dt.tz_localize(None)
+        except (ValueError, TypeError):
+            # e.g. mixed UTC offsets, which pandas won't put in one column
+            return [self._parse(v) for v in values]
+        out: List[Optional[int]] = []
+        for value, ts in zip(values, parsed):
+            # anything pandas couldn't read goes through the scalar path
+            if pd.isna(ts):
+                out.append(self._parse(value))
+            else:
+                out.append(_epoch(ts.to_pydatetime()))
+        return out
+
+
+_DEFAULT = DateParser()
+
+
+def to_epoch(value: Optional[str]) -> Optional[int]:
+    """Epoch seconds of a timestamp string, memoized; None if unparseable."""
+    return _DEFAULT.parse(value)
+
+
+def sort_key(epoch: Optional[int]) -> int:
+    """Sort key that puts records without a date last when sorting newest first."""
+    return MISSING_EPOCH if epoch is None else epoch
+
+
+def day_to_epoch(yyyymmdd: str) -> int:
+    """Epoch of midnight (UTC wall clock) starting a `YYYYMMDD` day."""
+    return _epoch(datetime.strptime(yyyymmdd, "%Y%m%d"))
+
+
+def from_epoch(epoch: int) -> datetime:
+    """Naive datetime for an epoch produced by this module."""
+    return _EPOCH + timedelta(seconds=epoch)
@@ -0,0 +1,130 @@
+"""External merge sort with a memory budget.
+
+`ExternalSorter` accepts items one at a time. While the estimated size of
+its buffer stays under `memory_budget` nothing touches the disk. Once the
+buffer outgrows the budget it is sorted and spilled to a temporary CSV run
+file. Iterating the sorter performs a k-way `heapq.merge` of all runs plus
+the in-memory tail, so the sorted stream is produced with one buffer plus
+one row per run in memory. With more runs than `max_fan_in` they are first
+merged into larger runs.
+
+Sorting is stable: items with equal keys come out in the order they were
+added, across runs as well as within one.
+"""
+
+import csv
+import heapq
+import os
+import tempfile
+from typing import Callable, Generic, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+DEFAULT_MAX_FAN_IN = 64
+
+
+class ExternalSorter(Generic[T]):
+    """Sort a stream of items larger than memory.
+
+    `encode`/`decode` turn an item into a list of strings (one CSV row) and
+    back; `size` estimates an item's in-memory size in bytes. Iterate once
+    to get the items sorted by `key`; `close()` removes the run files.
+    `stats` counts items added and runs spilled.
+    """
+
+    def __init__(
+        self,
+        key: Callable[[T], object],
+        encode: Callable[[T], Sequence[str]],
+        decode: Callable[[List[str]], T],
+        size: Callable[[T], int],
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        reverse: bool = False,
+        tmp_dir: Optional[str] = None,
+        max_fan_in: int = DEFAULT_MAX_FAN_IN,
+    ) -> None:
+        self.key = key
+        self.encode = encode
+        self.decode = decode
+        self.size = size
+        self.memory_budget = memory_budget
+        self.reverse = reverse
+        self.tmp_dir = tmp_dir
+        self.max_fan_in = max(2, max_fan_in)
+        self.stats = {"items": 0, "runs": 0}
+        self._buffer: List[T] = []
+        self._buffered_bytes = 0
+        self._runs: List[str] = []
+
+    def append(self, item: T) -> None:
+        self._buffer.append(item)
+        self._buffered_bytes += self.size(item)
+        self.stats["items"] += 1
+        if self._buffered_bytes > self.memory_budget:
+            self._spill()
+
+    def extend(self, items: Iterable[T]) -> None:
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return self.stats["items"]
+
+    def _write_run(self, items: Iterable[T]) -> str:
+        fd, path = tempfile.mkstemp(
+            prefix="extsort-", suffix=".csv", dir=self.tmp_dir
+        )
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            for item in items:
+                writer.writerow(self.encode(item))
+        self._runs.append(path)
+        self.stats["runs"] += 1
+        return path
+
+    def _spill(self) -> None:
+        self._buffer.sort(key=self.key, reverse=self.reverse)
+        self._write_run(self._buffer)
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def _read_run(self, path: str) -> Iterator[T]:
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                yield self.decode(row)
+
+    def _merge(self, streams: List[Iterator[T]]) -> Iterator[T]:
+        return heapq.merge(*streams, key=self.key, reverse=self.reverse)
+
+    def __iter__(self) -> Iterator[T]:
+        # collapse runs until one merge pass fits in max_fan_in open files
+        while len(self._runs) >= self.max_fan_in:
+            batch = self._runs[: self.max_fan_in]
+            self._runs = self._runs[self.max_fan_in :]
+            merged = self._merge([self._read_run(p) for p in batch])
+            path = self._write_run(merged)
+            # the merged run holds the oldest items; keep it first for stability
+            self._runs.remove(path)
+            self._runs.insert(0, path)
+            for p in batch:
+                os.remove(p)
+        self._buffer.sort(key=self.key, reverse=self.reverse)
+        streams = [self._read_run(p) for p in self._runs]
+        streams.append(iter(self._buffer))
+        return self._merge(streams)
+
+    def close(self) -> None:
+        for path in self._runs:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._runs = []
+        self._buffer = []
+
+    def __enter__(self) -> "ExternalSorter[T]":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
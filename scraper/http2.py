@@ -0,0 +1,143 @@
+"""Optional HTTP/2 transport for the IDX API.
+
+`Http2Session` is a small `requests.Session` look-alike backed by one
+`httpx.Client(http2=True)`. It can be passed to `IdxClient(session=...)`.
+Concurrent page and keyword requests from `ordered_map` workers are then
+multiplexed as streams over a single TLS connection, instead of each taking
+its own HTTP/1.1 connection from the pool. Requires `httpx[http2]`; brotli
+is negotiated when the `brotli` package is installed.
+
+Responses expose `wire_bytes`, the compressed size actually downloaded, so
+`IdxClient` can report compressed against decompressed bytes.
+"""
+
+from typing import Dict, Iterator, Optional
+
+import requests
+
+
+def accept_encoding() -> str:
+    """`Accept-Encoding` value for the codecs this process can decode."""
+    codecs = ["gzip", "deflate"]
+    try:
+        import brotli  # noqa: F401
+
+        codecs.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+
+            codecs.append("br")
+        except ImportError:
+            pass
+    return ", ".join(codecs)
+
+
+class Http2Response:
+    """The parts of `requests.Response` that `IdxClient` uses."""
+
+    def __init__(self, resp) -> None:
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.headers = resp.headers
+        self.url = str(resp.url)
+        self.http_version = resp.http_version
+
+    @property
+    def content(self) -> bytes:
+        return self._resp.read()
+
+    @property
+    def wire_bytes(self) -> int:
+        """Bytes downloaded so far, before decompression."""
+        return self._resp.num_bytes_downloaded
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        return self._resp.iter_bytes(chunk_size)
+
+    def json(self):
+        return self._resp.json()
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                "%s Error for url: %s" % (self.status_code, self.url), response=self
+            )
+
+    def close(self) -> None:
+        self._resp.close()
+
+
+class Http2Session:
+    """HTTP/2 client with the `get`/`mount`/`close` surface of a requests.Session.
+
+    httpx transport errors are re-raised as the matching `requests`
+    exceptions, so `IdxClient`'s retry logic applies unchanged.
+    """
+
+    def __init__(
+        self,
+        cookies=None,
+        proxy: Optional[str] = None,
+        max_connections: int = 10,
+    ) -> None:
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "HTTP/2 transport needs httpx: pip install 'httpx[http2]' (%s)" % e
+            )
+        self._httpx = httpx
+        kwargs: Dict = {
+            "http2": True,
+            "follow_redirects": True,
+            "limits": httpx.Limits(max_connections=max_connections),
+            "headers": {"Accept-Encoding": accept_encoding()},
+        }
+        if cookies is not None:
+            kwargs["cookies"] = cookies
+        if proxy:
+            kwargs["proxy"] = proxy
+        try:
+            self._client = httpx.Client(**kwargs)
+        except TypeError:
+            # httpx < 0.26 spells it `proxies`
+            kwargs["proxies"] = kwargs.pop("proxy")
+            self._client = httpx.Client(**kwargs)
+
+    @classmethod
+    def from_requests(
+        cls, session: Optional[requests.Session], **kwargs
+    ) -> "Http2Session":
+        """Carry cookies and the HTTPS proxy over from a requests.Session."""
+        if session is None:
+            return cls(**kwargs)
+        proxy = session.proxies.get("https") or session.proxies.get("http")
+        return cls(cookies=session.cookies, proxy=proxy, **kwargs)
+
+    def mount(self, prefix: str, adapter) -> None:
+        # connection pooling is httpx's job; kept for IdxClient compatibility
+        pass
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Http2Response:
+        httpx = self._httpx
+        request = self._client.build_request(
+            "GET", url, params=params, headers=headers, timeout=timeout
+        )
+        try:
+            resp = self._client.send(request, stream=stream)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+        return Http2Response(resp)
+
+    def close(self) -> None:
+        self._client.close()
@@ -6,55 +6,51 @@ This module provides:
   relevant fields).
 - `fetch_matching_announcements(...)` to paginate the IDX API and yield matching
   replies. (Uses requests; does not require Playwright.)
+- `IdxClient`, a pooled keep-alive client shared by all fetch helpers so the
+  homepage warm-up happens once per run instead of once per request.
 
 """
 
-from typing import Dict, Iterable, Optional, List
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+
+from scraper.breaker import TransportBreaker
+from scraper.browser_pool import get_browser_pool
+from scraper.cache import ResponseCache
+from scraper import jsonlib
+from scraper.http2 import accept_encoding
+from scraper.jsonstream import iter_array_items
+from scraper.matcher import KeywordMatcher, classify_replies
+from scraper.parallel import ordered_map
+from scraper.ratelimit import (
+    RETRY_STATUSES,
+    RateLimiter,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from scraper.sharding import DEFAULT_SHARD_THRESHOLD, plan_shards
+from scraper.watermark import NEW, OLDER, Watermark
 
 
 def _fetch_page_with_playwright(params: Dict) -> Dict:
     """Fetch the API endpoint using Playwright to avoid server-side blocking.
 
-    Returns the parsed JSON dict. Raises ImportError if Playwright not installed
-    or other exceptions from Playwright if fetching fails.
+    Runs on the process-wide warm `BrowserPool`, so only the first call pays
+    for launching Chromium and clearing the homepage challenge. Returns the
+    parsed JSON dict. Raises ImportError if Playwright not installed or other
+    exceptions from Playwright if fetching fails.
     """
-    try:
-        from playwright.sync_api import sync_playwright
-    except Exception as e:
-        raise ImportError("Playwright not available: %s" % e)
-    with sync_playwright() as pw:
-        browser = pw.chromium.launch(headless=True)
-        page = browser.new_page()
-
-        # First visit main site to allow any anti-bot JS to run
-        try:
-            page.goto("https://www.idx.co.id/", timeout=30000)
-            page.wait_for_load_state("networkidle", timeout=30000)
-        except Exception:
-            # ignore warm-up errors
-            pass
-
-        from urllib.parse import urlencode
-
-        url = IDX_API_URL + "?" + urlencode(params)
-        # fetch text from API endpoint in page context
-        text = page.evaluate(
-            "(url) => fetch(url, {headers: {'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest','Referer':'https://www.idx.co.id/'} }).then(r=>r.text())",
-            url,
-        )
-        browser.close()
-
-        import json
+    from urllib.parse import urlencode
 
-        try:
-            return json.loads(text)
-        except Exception as e:
-            excerpt = (text or "")[:500]
-            raise RuntimeError(
-                f"Playwright fetched non-JSON response: {e}; excerpt: {excerpt}"
-            )
+    pool = get_browser_pool()
+    url = IDX_API_URL + "?" + urlencode(params)
+    get_rate_limiter().acquire()
+    return pool.fetch_json(url)
 
 
 def session_from_playwright_interactive() -> "requests.Session":
@@ -115,10 +111,9 @@ DEFAULT_KEYWORDS = [
 ]
 
 
-def _normalize_keyword(k: str) -> str:
-    # normalize smart quotes and surrounding whitespace
-    k = k.replace("“", '"').replace("”", '"')
-    return k.strip().lower()
+@lru_cache(maxsize=32)
+def _matcher_for(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
 
 
 def filter_reply(reply: Dict, keywords: Iterable[str]) -> bool:
@@ -126,43 +121,400 @@ def filter_reply(reply: Dict, keywords: Iterable[str]) -> bool:
 
     We search common text fields: JudulPengumuman, PerihalPengumuman,
     NoPengumuman, Kode_Emiten and attachment OriginalFilename(s).
-    Matching is case-insensitive substring match.
+    Matching is case-insensitive substring match. Thin wrapper over a cached
+    `KeywordMatcher`; loops over many replies should build one directly.
     """
     if not reply:
         return False
+    if isinstance(keywords, KeywordMatcher):
+        return keywords.match_reply(reply)
+    return _matcher_for(tuple(keywords)).match_reply(reply)
+
+
+_BASE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Referer": "https://www.idx.co.id/",
+    "Origin": "https://www.idx.co.id",
+    "X-Requested-With": "XMLHttpRequest",
+    "Accept-Encoding": accept_encoding(),
+}
+
+_ALT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+    " AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+# streamed bodies up to this size are also written to the response cache
+STREAM_TEE_LIMIT = 8 * 1024 * 1024
+
+
+def _wire_bytes(r, decoded: int) -> int:
+    """Compressed bytes downloaded for a fully read response."""
+    wire = getattr(r, "wire_bytes", None)
+    if wire is not None:
+        return wire
+    try:
+        # urllib3 counts bytes pulled off the socket, before decoding
+        return int(r.raw.tell())
+    except Exception:
+        return decoded
 
-    import re
 
-    # normalize keywords to lowercase and replace non-alphanum with spaces so
-    # that filenames like 'dokumen_Penawaran_Tender.pdf' match 'Penawaran Tender'
-    normalized_keywords = [
-        re.sub(r"[^0-9a-z]+", " ", _normalize_keyword(k)) for k in keywords if k
-    ]
-    if not normalized_keywords:
-        return False
+class IdxClient:
+    """Long-lived client for the IDX API.
+
+    Owns one keep-alive `requests.Session` (with a pooled adapter so concurrent
+    callers share connections) and warms it up against the homepage only once.
+    Every fetch helper in this module accepts a `client`, so a single instance
+    can serve a whole run.
+
+    `stats` counts API requests, response bytes received (decompressed) and
+    `wire_bytes` (as downloaded, compressed), warm-ups actually performed and
+    `requests_saved`: the homepage warm-ups the old per-call code would have
+    issued but this client skipped. `session` may also be a
+    `scraper.http2.Http2Session` to multiplex requests over HTTP/2.
+
+    With a `cache` (`scraper.cache.ResponseCache`), responses are served from
+    disk when possible and every fetched body is stored, whichever transport
+    produced it.
+
+    Every request draws from `rate_limiter` (the process-wide one by default).
+    429/503 responses and connection errors are retried up to `max_retries`
+    times with exponential backoff, honouring `Retry-After`.
+
+    `breaker` (`scraper.breaker.TransportBreaker`) decides which transports to
+    try; pass `TransportBreaker.load()` to keep its pinned transport across runs.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        pool_size: int = 10,
+        timeout: int = 30,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 3,
+        breaker: Optional[TransportBreaker] = None,
+    ) -> None:
+        self.session = session if session is not None else requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        self.max_retries = max_retries
+        self.breaker = breaker if breaker is not None else TransportBreaker()
+        self.headers = dict(_BASE_HEADERS)
+        self.stats = {
+            "api_requests": 0,
+            "bytes_received": 0,
+            "wire_bytes": 0,
+            "warmups": 0,
+            "requests_saved": 0,
+        }
+        self._warmed = False
+        self._lock = threading.Lock()
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + n
+
+    def warm_up(self) -> None:
+        """GET the homepage once to obtain cookies / anti-bot tokens."""
+        with self._lock:
+            if self._warmed:
+                self.stats["requests_saved"] += 1
+                return
+            self._warmed = True
+            self.stats["warmups"] += 1
+        self.rate_limiter.acquire()
+        try:
+            self.session.get("https://www.idx.co.id/", headers=self.headers, timeout=10)
+        except Exception:
+            # ignore warm-up errors; we'll still try the API call
+            pass
+
+    def _send(
+        self, params: Dict, headers: Dict, stream: bool = False
+    ) -> requests.Response:
+        """One rate-limited API GET, retried on 429/503 and connection errors."""
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            self._count("api_requests")
+            try:
+                r = self.session.get(
+                    IDX_API_URL,
+                    params=params,
+                    headers=headers,
+                    timeout=self.timeout,
+                    stream=stream,
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                self.rate_limiter.backoff(attempt)
+            else:
+                if r.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return r
+                retry_after = parse_retry_after(r.headers.get("Retry-After"))
+                self.rate_limiter.backoff(attempt, retry_after)
+            attempt += 1
+
+    def _get_json_playwright(self, params: Dict) -> Dict:
+        try:
+            data = _fetch_page_with_playwright(params)
+        except Exception:
+            self.breaker.record_failure("playwright")
+            raise
+        self.breaker.record_success("playwright")
+        if self.cache is not None:
+            self.cache.put(params, jsonlib.dumps(data))
+        return data
+
+    def _open(self, params: Dict, stream: bool = False) -> Optional[requests.Response]:
+        """Send `params` over the requests transports in `breaker` order.
+
+        Returns the successful response, or None when the breaker has moved
+        on to Playwright (pinned, or every requests transport got a 403).
+        """
+        r = None
+        for transport in self.breaker.order():
+            if transport == "playwright":
+                return None
+            self.warm_up()
+            headers = self.headers
+            if transport == "requests_alt_ua":
+                headers = dict(self.headers)
+                headers["User-Agent"] = _ALT_USER_AGENT
+            r = self._send(params, headers, stream=stream)
+            if r.status_code == 403:
+                self.breaker.record_failure(transport)
+                if stream:
+                    # release the unread connection back to the pool
+                    r.close()
+                continue
+            r.raise_for_status()
+            self.breaker.record_success(transport)
+            return r
+        raise requests.exceptions.HTTPError(
+            "403 Forbidden from every transport in %s" % self.breaker.order(),
+            response=r,
+        )
+
+    def get_json(self, params: Dict) -> Dict:
+        """GET `IDX_API_URL` with `params` and return the decoded JSON.
+
+        Transports are tried in `breaker` order: requests, requests with an
+        alternate User-Agent on 403, then Playwright. Once the breaker has
+        pinned a working transport the cheaper ones are skipped until its
+        cooldown expires.
+        """
+        if self.cache is not None:
+            body = self.cache.get(params)
+            if body is not None:
+                return jsonlib.loads(body)
+        r = self._open(params)
+        if r is None:
+            return self._get_json_playwright(params)
+        self._count("bytes_received", len(r.content))
+        self._count("wire_bytes", _wire_bytes(r, len(r.content)))
+        data = jsonlib.loads(r.content)
+        if self.cache is not None:
+            self.cache.put(params, r.content)
+        return data
+
+    def iter_items(
+        self, params: Dict, key: str = "Replies", meta: Optional[Dict] = None
+    ) -> Iterator[Dict]:
+        """Like `get_json(params)[key]`, but decoded incrementally.
+
+        The body is streamed in `STREAM_CHUNK_SIZE` chunks and array items
+        are yielded as soon as they are complete, so peak memory does not
+        grow with `pageSize`. Other top-level members go into `meta`. Bodies
+        up to `STREAM_TEE_LIMIT` bytes are also written to the cache once
+        fully read. The Playwright transport is not streamed.
+        """
+        if self.cache is not None:
+            body = self.cache.get(params)
+            if body is not None:
+                yield from iter_array_items([body], key, meta)
+                return
+        r = self._open(params, stream=True)
+        if r is None:
+            data = self._get_json_playwright(params)
+            if meta is not None:
+                meta.update((k, v) for k, v in data.items() if k != key)
+            yield from data.get(key) or []
+            return
+        chunks = self._stream_body(r, params)
+        yield from iter_array_items(chunks, key, meta)
+        # drain the tail after the array so the body is complete for the cache
+        for _ in chunks:
+            pass
+
+    def _stream_body(self, r: requests.Response, params: Dict) -> Iterator[bytes]:
+        tee: Optional[List[bytes]] = [] if self.cache is not None else None
+        size = 0
+        try:
+            for chunk in r.iter_content(STREAM_CHUNK_SIZE):
+                size += len(chunk)
+                if tee is not None and size <= STREAM_TEE_LIMIT:
+                    tee.append(chunk)
+                else:
+                    # too large to keep in memory for the cache
+                    tee = None
+                yield chunk
+        finally:
+            self._count("bytes_received", size)
+            self._count("wire_bytes", _wire_bytes(r, size))
+            r.close()
+        if tee is not None:
+            self.cache.put(params, b"".join(tee))
+
+
+_default_client: Optional[IdxClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> IdxClient:
+    """Return the process-wide `IdxClient`, creating it on first use."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = IdxClient()
+        return _default_client
+
+
+def _resolve_client(
+    client: Optional[IdxClient], session: Optional[requests.Session]
+) -> IdxClient:
+    if client is not None:
+        return client
+    if session is not None:
+        return IdxClient(session=session)
+    return get_default_client()
+
+
+def _default_dates(
+    date_from: Optional[str], date_to: Optional[str]
+) -> Tuple[str, str]:
+    # compute sensible defaults if not provided: date_to = today, date_from = 2 days ago
+    # (YYYYMMDD format as requested)
+    if date_to is None:
+        date_to = datetime.now().date().strftime("%Y%m%d")
+    if date_from is None:
+        date_from = (datetime.now().date() - timedelta(days=2)).strftime("%Y%m%d")
+    return date_from, date_to
 
-    # collect candidate text fields
-    peng = reply.get("pengumuman") or {}
-    candidates = []
-    for key in ("JudulPengumuman", "PerihalPengumuman", "NoPengumuman", "Kode_Emiten"):
-        v = peng.get(key)
-        if v:
-            candidates.append(str(v))
 
-    # attachments' original filenames
-    for att in reply.get("attachments") or []:
-        orig = att.get("OriginalFilename") or att.get("PDFFilename")
-        if orig:
-            candidates.append(str(orig))
+def iter_pages(
+    params: Dict,
+    page_size: int = 100,
+    max_pages: Optional[int] = None,
+    concurrency: int = 1,
+    client: Optional[IdxClient] = None,
+) -> Iterator[Dict]:
+    """Yield decoded API pages for `params`, starting at `indexFrom=0`.
+
+    Page 0 is fetched first to learn `ResultCount`; every remaining offset is
+    then known up front, so those pages are fetched with up to `concurrency`
+    requests in flight. Pages are always yielded in offset order.
+    """
+    client = client if client is not None else get_default_client()
+
+    def _page(index_from: int) -> Dict:
+        # requests params should be strings
+        page_params = dict(params)
+        page_params.update({"indexFrom": str(index_from), "pageSize": str(page_size)})
+        return client.get_json(page_params)
+
+    first = _page(0)
+    yield first
+
+    total = first.get("ResultCount")
+    if total is None:
+        return
+    offsets = range(page_size, int(total), page_size)
+    if max_pages is not None:
+        offsets = offsets[: max(0, max_pages - 1)]
+    yield from ordered_map(_page, offsets, concurrency=concurrency)
+
+
+def iter_sharded_pages(
+    params: Dict,
+    date_from: str,
+    date_to: str,
+    page_size: int = 100,
+    threshold: int = DEFAULT_SHARD_THRESHOLD,
+    unit: str = "month",
+    concurrency: int = 1,
+    client: Optional[IdxClient] = None,
+) -> Iterator[Dict]:
+    """Yield API pages for `params` over date shards of `[date_from, date_to]`.
+
+    The range is planned with `scraper.sharding.plan_shards` (a `pageSize=1`
+    probe per window reads its `ResultCount`; windows above `threshold` are
+    bisected), then shards are fetched in parallel, newest shard first. This
+    keeps each query below the server's result cap on long backfills.
+    """
+    client = client if client is not None else get_default_client()
+
+    def _count(window: Tuple[str, str]) -> Optional[int]:
+        probe = dict(params)
+        probe.update(
+            {"dateFrom": window[0], "dateTo": window[1], "indexFrom": "0", "pageSize": "1"}
+        )
+        total = client.get_json(probe).get("ResultCount")
+        return int(total) if total is not None else None
+
+    shards = plan_shards(
+        date_from, date_to, _count, threshold=threshold, unit=unit, concurrency=concurrency
+    )
 
-    hay = "\n".join(candidates).lower()
-    # normalize hay similarly (replace punctuation/underscores with spaces)
-    hay_norm = re.sub(r"[^0-9a-z]+", " ", hay)
+    def _fetch_shard(shard: Tuple[str, str, Optional[int]]) -> List[Dict]:
+        shard_params = dict(params)
+        shard_params.update({"dateFrom": shard[0], "dateTo": shard[1]})
+        return list(iter_pages(shard_params, page_size=page_size, client=client))
 
-    for k in normalized_keywords:
-        if k and k in hay_norm:
-            return True
-    return False
+    for pages in ordered_map(_fetch_shard, shards, concurrency=concurrency):
+        yield from pages
+
+
+def iter_new_replies(
+    params: Dict,
+    watermark: Watermark,
+    page_size: int = 100,
+    client: Optional[IdxClient] = None,
+) -> Iterator[Dict]:
+    """Yield replies newer than `watermark`, paging newest first.
+
+    Pages are fetched serially and paging stops at the first page that
+    reaches a reply older than the watermark, so a poll over an unchanged
+    window costs a single small request. Replies whose `Id2` the watermark
+    already knows are skipped.
+    """
+    client = client if client is not None else get_default_client()
+    index_from = 0
+    while True:
+        page_params = dict(params)
+        page_params.update({"indexFrom": str(index_from), "pageSize": str(page_size)})
+        data = client.get_json(page_params)
+        reached_older = False
+        for rep in data.get("Replies") or []:
+            state = watermark.classify(rep)
+            if state == OLDER:
+                reached_older = True
+            elif state == NEW:
+                yield rep
+        total = data.get("ResultCount")
+        index_from += page_size
+        if reached_older or total is None or index_from >= int(total):
+            break
 
 
 def fetch_matching_announcements(
@@ -173,22 +525,24 @@ def fetch_matching_announcements(
     lang: str = "id",
     page_size: int = 100,
     max_pages: Optional[int] = None,
+    session: Optional[requests.Session] = None,
+    client: Optional[IdxClient] = None,
+    concurrency: int = 1,
+    shard_threshold: Optional[int] = None,
+    shard_unit: str = "month",
 ) -> Iterable[Dict]:
     """Paginate the IDX API and yield replies that match keywords.
 
     Note: This function performs live HTTP requests. Use responsibly and obey
     the target site's terms of use. `max_pages` can be set to limit how many
-    pages are fetched (useful for testing).
+    pages are fetched (useful for testing). All pages go through one
+    `IdxClient` (`client`, else one wrapping `session`, else the shared default);
+    with `concurrency > 1` pages after the first are fetched in parallel.
+    Setting `shard_threshold` splits the date range into shards first (see
+    `iter_sharded_pages`); `max_pages` then caps the total across shards.
     """
-    # compute sensible defaults if not provided: date_to = today, date_from = 2 days ago
-    if date_to is None:
-        today = datetime.now().date()
-        # use YYYYMMDD format as requested
-        date_to = today.strftime("%Y%m%d")
-    if date_from is None:
-        two_days = datetime.now().date() - timedelta(days=2)
-        # use YYYYMMDD format as requested
-        date_from = two_days.strftime("%Y%m%d")
+    date_from, date_to = _default_dates(date_from, date_to)
+    client = _resolve_client(client, session)
 
     params = {
         "emitenType": emiten_type,
@@ -199,78 +553,38 @@ def fetch_matching_announcements(
         # indexFrom and pageSize set per request
     }
 
-    index_from = 0
-    pages_fetched = 0
-    while True:
-        # requests params should be strings
-        params.update({"indexFrom": str(index_from), "pageSize": str(page_size)})
-        # Use a session and perform an initial GET to the main site to obtain cookies
-        # and any anti-bot tokens. Add common AJAX headers as well.
-        session = requests.Session()
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Referer": "https://www.idx.co.id/",
-            "Origin": "https://www.idx.co.id",
-            "X-Requested-With": "XMLHttpRequest",
-        }
-
-        # Warm up session (get cookies)
-        try:
-            session.get("https://www.idx.co.id/", headers=headers, timeout=10)
-        except Exception:
-            # ignore warm-up errors; we'll still try the API call
-            pass
-
-        r = session.get(IDX_API_URL, params=params, headers=headers, timeout=30)
-        data = None
-        try:
-            r.raise_for_status()
-        except requests.exceptions.HTTPError:
-            # If server returns 403, try a second time with a slightly different UA
-            if r.status_code == 403:
-                alt_headers = headers.copy()
-                alt_headers["User-Agent"] = (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                )
-                try:
-                    r2 = session.get(
-                        IDX_API_URL, params=params, headers=alt_headers, timeout=30
-                    )
-                    r2.raise_for_status()
-                    r = r2
-                except requests.exceptions.HTTPError:
-                    # Both requests attempts got 403 — try Playwright fallback
-                    try:
-                        data = _fetch_page_with_playwright(params)
-                    except Exception:
-                        # re-raise original 403 if Playwright also fails
-                        raise
-            else:
-                raise
-        if data is None:
-            data = r.json()
-
+    if shard_threshold:
+        pages = islice(
+            iter_sharded_pages(
+                params,
+                date_from,
+                date_to,
+                page_size=page_size,
+                threshold=shard_threshold,
+                unit=shard_unit,
+                concurrency=concurrency,
+                client=client,
+            ),
+            max_pages,
+        )
+    else:
+        pages = iter_pages(
+            params,
+            page_size=page_size,
+            max_pages=max_pages,
+            concurrency=concurrency,
+            client=client,
+        )
+    matcher = KeywordMatcher(keywords)
+    for data in pages:
         replies = data.get("Replies") or []
-        for rep in replies:
-            if filter_reply(rep, keywords):
+        # classify the whole page in one pass rather than reply by reply
+        for rep, hit in zip(replies, classify_replies(replies, matcher)):
+            if hit:
                 yield rep
 
-        # paging logic
-        total = data.get("ResultCount")
-        index_from += page_size
-        pages_fetched += 1
-        if max_pages is not None and pages_fetched >= max_pages:
-            break
-        # stop when we've fetched all
-        if total is None:
-            break
-        if index_from >= int(total):
-            break
-
 
-def fetch_replies_for_keyword(
+def iter_replies_for_keyword(
     keyword: str,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
@@ -278,21 +592,28 @@ def fetch_replies_for_keyword(
     lang: str = "id",
     page_size: int = 10000,
     session: Optional[requests.Session] = None,
-) -> List[Dict]:
-    """Fetch raw Replies list from IDX API for a single keyword.
-
-    Tries requests then Playwright fallback on 403. Returns list of reply dicts
-    (may be empty).
+    client: Optional[IdxClient] = None,
+    shard_threshold: Optional[int] = None,
+    shard_unit: str = "month",
+    concurrency: int = 1,
+) -> Iterator[Dict]:
+    """Yield raw Replies for a single keyword as they are decoded.
+
+    Tries requests then Playwright fallback on 403. Pass the same `client`
+    across keywords so the homepage warm-up happens once per run rather than
+    once per keyword. The single-request path streams the response body
+    (`IdxClient.iter_items`), so memory stays flat however large
+    `page_size` is.
+
+    By default the whole range is one `page_size` request, which the server
+    silently truncates on long ranges. Set `shard_threshold` to plan date
+    shards instead and fetch them (fully paginated) `concurrency` at a time.
     """
-    # compute sensible defaults if not provided: date_to = today, date_from = 2 days ago
-    if date_to is None:
-        today = datetime.now().date()
-        # use YYYYMMDD format as requested
-        date_to = today.strftime("%Y%m%d")
-    if date_from is None:
-        two_days = datetime.now().date() - timedelta(days=2)
-        # use YYYYMMDD format as requested
-        date_from = two_days.strftime("%Y%m%d")
+    date_from, date_to = _default_dates(date_from, date_to)
+    # allow passing an already-warmed requests.Session (e.g. from
+    # session_from_playwright_interactive) so the caller can reuse cookies
+    # obtained interactively.
+    client = _resolve_client(client, session)
 
     params = {
         "emitenType": emiten_type,
@@ -303,46 +624,52 @@ def fetch_replies_for_keyword(
         "indexFrom": "0",
         "pageSize": str(page_size),
     }
+    if shard_threshold:
+        pages = iter_sharded_pages(
+            params,
+            date_from,
+            date_to,
+            page_size=page_size,
+            threshold=shard_threshold,
+            unit=shard_unit,
+            concurrency=concurrency,
+            client=client,
+        )
+        for data in pages:
+            yield from data.get("Replies") or []
+        return
+    yield from client.iter_items(params, "Replies")
 
-    # allow passing an already-warmed requests.Session (e.g. from
-    # session_from_playwright_interactive) so the caller can reuse cookies
-    # obtained interactively. If none provided, create a new session.
-    if session is None:
-        session = requests.Session()
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "application/json, text/javascript, */*; q=0.01",
-        "Referer": "https://www.idx.co.id/",
-        "Origin": "https://www.idx.co.id",
-        "X-Requested-With": "XMLHttpRequest",
-    }
-
-    try:
-        session.get("https://www.idx.co.id/", headers=headers, timeout=10)
-    except Exception:
-        pass
 
-    r = session.get(IDX_API_URL, params=params, headers=headers, timeout=30)
-    try:
-        r.raise_for_status()
-        data = r.json()
-    except requests.exceptions.HTTPError:
-        # try alt UA
-        if r.status_code == 403:
-            alt = headers.copy()
-            alt["User-Agent"] = (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-                " AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            try:
-                r2 = session.get(IDX_API_URL, params=params, headers=alt, timeout=30)
-                print(f"Fetching URL: {r2.url}")
-                r2.raise_for_status()
-                data = r2.json()
-            except requests.exceptions.HTTPError:
-                # Playwright fallback
-                data = _fetch_page_with_playwright(params)
-        else:
-            raise
+def fetch_replies_for_keyword(
+    keyword: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    emiten_type: str = "*",
+    lang: str = "id",
+    page_size: int = 10000,
+    session: Optional[requests.Session] = None,
+    client: Optional[IdxClient] = None,
+    shard_threshold: Optional[int] = None,
+    shard_unit: str = "month",
+    concurrency: int = 1,
+) -> List[Dict]:
+    """Fetch raw Replies list from IDX API for a single keyword.
 
-    return data.get("Replies") or []
+    List form of `iter_replies_for_keyword` (may be empty).
+    """
+    return list(
+        iter_replies_for_keyword(
+            keyword,
+            date_from,
+            date_to,
+            emiten_type=emiten_type,
+            lang=lang,
+            page_size=page_size,
+            session=session,
+            client=client,
+            shard_threshold=shard_threshold,
+            shard_unit=shard_unit,
+            concurrency=concurrency,
+        )
+    )
@@ -0,0 +1,95 @@
+"""Pluggable JSON backend.
+
+Uses orjson when installed, then msgspec, then the stdlib `json` module.
+Everything decodes straight from bytes, so response bodies and state files
+never take a detour through `str`. Set `IDX_JSON_BACKEND=json` (or `orjson` /
+`msgspec`) to force a backend.
+
+Output is UTF-8 in every backend (non-ASCII is not `\\u`-escaped) and
+`indent=True` means two-space indentation, which is the only indent orjson
+supports.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Union
+
+_BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _stdlib() -> Dict[str, Callable]:
+    def loads(data):
+        return json.loads(data)
+
+    def dumps(obj, indent=False):
+        text = json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+        return text.encode("utf-8")
+
+    return {"loads": loads, "dumps": dumps}
+
+
+def _orjson() -> Dict[str, Callable]:
+    import orjson
+
+    def dumps(obj, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+    return {"loads": orjson.loads, "dumps": dumps}
+
+
+def _msgspec() -> Dict[str, Callable]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def loads(data):
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            # callers catch ValueError, as raised by the other backends
+            raise ValueError(str(e)) from e
+
+    def dumps(obj, indent=False):
+        out = encoder.encode(obj)
+        return msgspec.json.format(out, indent=2) if indent else out
+
+    return {"loads": loads, "dumps": dumps}
+
+
+def _select(preferred: str = ""):
+    order = [preferred] if preferred in _BACKENDS else list(_BACKENDS)
+    for name in order:
+        try:
+            impl = {"orjson": _orjson, "msgspec": _msgspec, "json": _stdlib}[name]()
+        except ImportError:
+            continue
+        return name, impl
+    return "json", _stdlib()
+
+
+BACKEND, _impl = _select(os.environ.get("IDX_JSON_BACKEND", "").strip().lower())
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Decode JSON from bytes (preferred) or str; ValueError if malformed."""
+    return _impl["loads"](data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode `obj` as UTF-8 JSON bytes; `indent` gives two-space indentation."""
+    return _impl["dumps"](obj, indent)
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Decode the JSON file at `path`."""
+    return loads(Path(path).read_bytes())
+
+
+def write_json(path: Union[str, Path], obj: Any, indent: bool = True) -> None:
+    """Write `obj` to `path` as (by default indented) UTF-8 JSON."""
+    Path(path).write_bytes(dumps(obj, indent))
@@ -0,0 +1,112 @@
+"""Incremental decoding of one array inside a streamed JSON object.
+
+`GetAnnouncement` bodies are one object whose `Replies` array holds almost
+all of the bytes. `iter_array_items(chunks)` walks the top-level object as
+chunks arrive. It hands each array element to the C decoder
+(`JSONDecoder.raw_decode`) and yields it straight away, so only the
+undecoded tail of the stream and one element are held at a time. The
+other top-level members (`ResultCount`, ...) are decoded normally and can
+be collected through `meta`.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_WS = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _Stream:
+    """Text buffer over an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self) -> bool:
+        """Append the next chunk; False once the stream is exhausted."""
+        if self.eof:
+            return False
+        if self.pos > 65536:
+            # drop consumed text so the buffer stays around one chunk in size
+            self.buf = self.buf[self.pos :]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self.buf += text
+                return True
+        self.buf += self._utf8.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character (not consumed); "" at end of stream."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(
+                "expected one of %r at offset %d, got %r" % (chars, self.pos, c)
+            )
+        self.pos += 1
+        return c
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more chunks as needed."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.more():
+                    continue
+                raise
+            # a number at the very end of the buffer may still be growing
+            if end == len(self.buf) and not self.eof and self.more():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_array_items(
+    chunks: Iterable[bytes], key: str = "Replies", meta: Optional[Dict] = None
+) -> Iterator[Any]:
+    """Yield the elements of the top-level `key` array from streamed JSON bytes.
+
+    Other top-level members are decoded and stored in `meta` when given. A
+    missing or `null` array yields nothing. Malformed input raises ValueError.
+    """
+    s = _Stream(chunks)
+    s.expect("{")
+    if s.peek() == "}":
+        return
+    while True:
+        name = s.value()
+        s.expect(":")
+        if name == key and s.peek() == "[":
+            s.expect("[")
+            if s.peek() == "]":
+                s.pos += 1
+            else:
+                while True:
+                    yield s.value()
+                    if s.expect(",]") == "]":
+                        break
+        else:
+            value = s.value()
+            if meta is not None:
+                meta[name] = value
+        if s.expect(",}") == "}":
+            return
@@ -0,0 +1,207 @@
+"""Keyword matching against announcement replies.
+
+A `KeywordMatcher` is compiled once from a keyword list. Keywords and reply
+text are normalized the same way: lowercased, with every run of
+non-alphanumerics collapsed to one space. That way a filename like
+`dokumen_Penawaran_Tender.pdf` matches `Penawaran Tender`. All keywords are
+folded into one alternation pattern, so a reply's text is scanned once by
+the regex engine instead of once per keyword.
+
+`classify_replies` does the same for a whole page: all records are joined
+into one string, normalized in one call and scanned once, and matches are
+mapped back to records. Per-reply Python overhead is then only the field
+extraction.
+
+Normalization also folds diacritics and smart quotes (`Pengumúman` ->
+`pengumuman`). Its result for a reply, `search_text(reply)`, can be stored
+on the reply under `SEARCH_FIELD`; the matcher and `classify_replies` then
+scan the stored text directly, so re-classifying saved announcements with a
+new keyword list neither re-fetches nor re-normalizes them.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+# record separator for batch classification; excluded from the runs that
+# normalization collapses, so it survives and matches never cross records
+_SEP = "\x1e"
+_NON_ALNUM_KEEP_SEP = re.compile(r"[^0-9a-z\x1e]+")
+
+# reply fields searched for keywords, in haystack order
+REPLY_FIELDS = ("JudulPengumuman", "PerihalPengumuman", "NoPengumuman", "Kode_Emiten")
+# key under which a reply's precomputed normalized haystack is stored
+SEARCH_FIELD = "search_text"
+
+# smart single and double quotes -> ASCII
+_QUOTES = str.maketrans(
+    {
+        **dict.fromkeys("\u2018\u2019\u201a\u201b", "'"),
+        **dict.fromkeys("\u201c\u201d\u201e\u201f", '"'),
+    }
+)
+
+
+def fold_text(text: str) -> str:
+    """Replace smart quotes with ASCII ones and strip diacritics."""
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFKD", text.translate(_QUOTES))
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def normalize_keyword(k: str) -> str:
+    # normalize smart quotes, accents and surrounding whitespace
+    return fold_text(k).strip().lower()
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and fold `text`, collapsing non-alphanumeric runs to spaces."""
+    return _NON_ALNUM.sub(" ", fold_text(text.lower()))
+
+
+def reply_haystack(reply: Dict) -> str:
+    """Raw searchable text of a reply: its text fields and attachment names."""
+    peng = reply.get("pengumuman") or {}
+    candidates = []
+    for key in REPLY_FIELDS:
+        v = peng.get(key)
+        if v:
+            candidates.append(str(v))
+    # attachments' original filenames
+    for att in reply.get("attachments") or []:
+        orig = att.get("OriginalFilename") or att.get("PDFFilename")
+        if orig:
+            candidates.append(str(orig))
+    return "\n".join(candidates)
+
+
+def search_text(reply: Dict) -> str:
+    """Normalized haystack of a reply, the stored form of `SEARCH_FIELD`.
+
+    A value already stored on the reply is returned as is.
+    """
+    if not reply:
+        return ""
+    stored = reply.get(SEARCH_FIELD)
+    if stored is not None:
+        return stored
+    return normalize_text(reply_haystack(reply))
+
+
+def add_search_text(replies: Iterable[Dict]) -> None:
+    """Store `search_text` on each reply that doesn't have it yet."""
+    for reply in replies:
+        if reply and SEARCH_FIELD not in reply:
+            reply[SEARCH_FIELD] = normalize_text(reply_haystack(reply))
+
+
+class KeywordMatcher:
+    """Case-insensitive substring matcher for a fixed keyword list.
+
+    `match_text` / `match_reply` answer "does any keyword occur?" with one
+    regex scan. `keywords_in_text` / `keywords_in_reply` list which keywords
+    occur, in keyword-list order. The `*_normalized` variants take text that
+    is already normalized, such as a stored `search_text`.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: List[str] = []
+        self._normalized: List[str] = []
+        seen: Set[str] = set()
+        for k in keywords:
+            if not k:
+                continue
+            norm = normalize_text(normalize_keyword(k)).strip()
+            if norm and norm not in seen:
+                seen.add(norm)
+                self.keywords.append(k)
+                self._normalized.append(norm)
+        self._pattern: Optional["re.Pattern"] = None
+        if self._normalized:
+            # longest first so a shared prefix doesn't shadow the longer keyword
+            alternatives = sorted(self._normalized, key=len, reverse=True)
+            self._pattern = re.compile("|".join(map(re.escape, alternatives)))
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+
+    def match_normalized(self, norm: str) -> bool:
+        if self._pattern is None or not norm:
+            return False
+        return self._pattern.search(norm) is not None
+
+    def match_text(self, text: str) -> bool:
+        """True if any keyword occurs in raw `text`."""
+        if self._pattern is None or not text:
+            return False
+        return self.match_normalized(normalize_text(text))
+
+    def match_reply(self, reply: Dict) -> bool:
+        if not reply or self._pattern is None:
+            return False
+        return self.match_normalized(search_text(reply))
+
+    def keywords_in_normalized(self, norm: str) -> List[str]:
+        if self._pattern is None or not norm or self._pattern.search(norm) is None:
+            return []
+        # only texts that matched at all pay for the per-keyword check
+        return [k for k, n in zip(self.keywords, self._normalized) if n in norm]
+
+    def keywords_in_text(self, text: str) -> List[str]:
+        """Keywords occurring in raw `text` (overlapping ones included)."""
+        if self._pattern is None or not text:
+            return []
+        return self.keywords_in_normalized(normalize_text(text))
+
+    def keywords_in_reply(self, reply: Dict) -> List[str]:
+        if not reply or self._pattern is None:
+            return []
+        return self.keywords_in_normalized(search_text(reply))
+
+
+def classify_replies(
+    replies: Sequence[Dict], matcher: KeywordMatcher, keywords: bool = False
+) -> Union[List[bool], List[List[str]]]:
+    """Classify a whole batch of replies at once.
+
+    Returns a boolean mask aligned with `replies`, or with `keywords=True`
+    the list of matched keywords per reply (empty when none matched).
+    Results equal calling `matcher.match_reply` / `keywords_in_reply` per
+    reply. When every reply carries a stored `SEARCH_FIELD` the batch is
+    scanned without normalizing anything.
+    """
+    n = len(replies)
+    if not n or not matcher:
+        return [[] for _ in range(n)] if keywords else [False] * n
+    stored = [r.get(SEARCH_FIELD) if r else "" for r in replies]
+    if None not in stored:
+        norm = _SEP.join(stored)
+    else:
+        texts = [
+            s if s is not None else reply_haystack(r).replace(_SEP, " ")
+            for r, s in zip(replies, stored)
+        ]
+        # stored texts are already normalized, and normalizing is idempotent
+        norm = _NON_ALNUM_KEEP_SEP.sub(" ", fold_text(_SEP.join(texts).lower()))
+
+    # start offset of every record in the normalized batch
+    starts = [0]
+    pos = norm.find(_SEP)
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = norm.find(_SEP, pos + 1)
+
+    mask = [False] * n
+    for m in matcher._pattern.finditer(norm):
+        mask[bisect_right(starts, m.start()) - 1] = True
+    if not keywords:
+        return mask
+    records = norm.split(_SEP)
+    pairs = list(zip(matcher.keywords, matcher._normalized))
+    return [
+        [k for k, kn in pairs if kn in records[i]] if hit else []
+        for i, hit in enumerate(mask)
+    ]
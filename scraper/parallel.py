@@ -0,0 +1,55 @@
+"""Bounded, order-preserving concurrency helpers.
+
+The IDX API is I/O bound, so a small thread pool is enough to overlap
+round-trips. `ordered_map` keeps results in input order so callers that
+dedup "first seen wins" behave exactly as in a serial loop.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_map(
+    fn: Callable[[T], R], items: Iterable[T], concurrency: int = 4
+) -> Iterator[R]:
+    """Yield `fn(item)` for every item, in input order.
+
+    At most `concurrency` calls run at once and at most `2 * concurrency`
+    results are buffered ahead of the consumer. With `concurrency <= 1` this
+    is a plain serial loop (no threads). Exceptions raised by `fn` propagate
+    when their result is reached.
+    """
+    if concurrency <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    pending: Deque = deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        try:
+            for item in items:
+                pending.append(executor.submit(fn, item))
+                if len(pending) >= concurrency * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # consumer stopped early (or fn raised): don't start queued work
+            for fut in pending:
+                fut.cancel()
+
+
+def split_concurrency(concurrency: int, outer_items: int) -> Tuple[int, int]:
+    """Divide a `concurrency` budget between two nested `ordered_map` levels.
+
+    Returns `(outer, inner)` with `outer * inner <= concurrency`: the outer
+    level gets one worker per item up to the budget and each of its calls
+    gets an equal share of the rest, so nesting never multiplies the number
+    of calls in flight.
+    """
+    outer = max(1, min(concurrency, outer_items))
+    return outer, max(1, concurrency // outer)
@@ -0,0 +1,129 @@
+"""Process-wide rate limiting and retry backoff for every IDX transport.
+
+All transports (requests, Playwright `context.request`, `page.evaluate`)
+draw from one token bucket, so concurrent fetching can't out-pace what the
+site tolerates. When the server pushes back (429/503 or a challenge page) the
+caller backs off exponentially with jitter. A `Retry-After` header takes
+precedence and pauses the whole bucket, not just the calling thread.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+DEFAULT_RATE = 4.0  # requests per second
+DEFAULT_BURST = 8
+RETRY_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Thread-safe token bucket with exponential backoff and jitter.
+
+    `rate` tokens are added per second up to `burst`; `acquire()` blocks until
+    a token is available. A `rate` of 0 disables limiting (backoff still
+    works). `backoff(attempt, retry_after)` sleeps `base_delay * 2**attempt`
+    (capped at `max_delay`, plus up to `jitter` of random extra), or exactly
+    `retry_after` when the server sent one.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        jitter: float = 0.5,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.stats = {"acquired": 0, "waited_s": 0.0, "backoffs": 0}
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the bucket (and any server-requested pause) allows a request."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._paused_until - now
+                if delay <= 0:
+                    if self.rate <= 0:
+                        break
+                    self._tokens = min(
+                        self.burst, self._tokens + (now - self._updated) * self.rate
+                    )
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+        with self._lock:
+            self.stats["acquired"] += 1
+            self.stats["waited_s"] += waited
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        delay = min(self.base_delay * (2**attempt), self.max_delay)
+        return delay + random.uniform(0, self.jitter * delay)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Sleep before retry number `attempt` (0-based); returns the delay.
+
+        A server-provided `retry_after` also pauses every other caller.
+        """
+        delay = self.backoff_delay(attempt, retry_after)
+        with self._lock:
+            self.stats["backoffs"] += 1
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        time.sleep(delay)
+        return delay
+
+
+_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter shared by all transports."""
+    return _limiter
+
+
+def configure_rate_limiter(
+    rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST
+) -> RateLimiter:
+    """Replace the process-wide limiter's rate and burst settings."""
+    with _limiter._lock:
+        _limiter.rate = rate
+        _limiter.burst = max(1, burst)
+        _limiter._tokens = min(_limiter._tokens, float(_limiter.burst))
+    return _limiter
@@ -0,0 +1,135 @@
+"""Compact announcement records for exports.
+
+An API reply is a nested dict (`{"pengumuman": {...}, "attachments": [...]}`)
+carrying a dozen fields the exporter never reads. `Announcement` keeps only
+the exported ones in a `__slots__` object, which has no per-instance dict.
+Emiten codes are interned, so the few hundred distinct codes are shared
+across hundreds of thousands of records. The dedup key is a property over
+the same strings, and records hash and compare by it, so a dedup set can
+hold the records themselves instead of a separate tuple per row. Each record
+also carries its date as epoch seconds (`ts`), parsed once on creation, so
+sorting never re-parses date strings.
+"""
+
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from scraper.dates import to_epoch
+
+# CSV column names, in output order
+KODE_FIELD = "Kode_Emiten"
+JUDUL_FIELD = "Judul_Pengumuman"
+TANGGAL_FIELD = "Tanggal_Pengumuman"
+KEYWORDS_FIELD = "Keywords"
+ID2_FIELD = "Id2"
+
+# rough per-record memory besides the text itself (object, str headers, int)
+_RECORD_OVERHEAD = 256
+
+
+class Announcement:
+    """One exported announcement: `Id2`, emiten code, title, date, keywords.
+
+    `ts` is the date as epoch seconds, or None when it doesn't parse.
+    """
+
+    __slots__ = ("id2", "kode", "judul", "tanggal", "ts", "keywords")
+
+    def __init__(
+        self,
+        kode: str,
+        judul: str,
+        tanggal: str,
+        id2: Optional[str] = None,
+        keywords: Optional[str] = None,
+    ) -> None:
+        self.id2 = id2
+        self.kode = sys.intern(kode)
+        self.judul = judul
+        self.tanggal = tanggal
+        self.ts = to_epoch(tanggal)
+        self.keywords = keywords
+
+    @classmethod
+    def from_reply(cls, reply: Dict) -> "Announcement":
+        """Decode the exported fields of an API reply."""
+        peng = reply.get("pengumuman") or reply.get("Pengumuman") or {}
+        id2 = peng.get("Id2")
+        return cls(
+            (peng.get("Kode_Emiten") or reply.get("Kode_Emiten") or "").strip(),
+            (
+                peng.get("JudulPengumuman") or peng.get("Judul_Pengumuman") or ""
+            ).strip(),
+            (peng.get("TglPengumuman") or peng.get("Tanggal") or "").strip(),
+            id2=None if id2 is None else str(id2),
+        )
+
+    @classmethod
+    def from_row(cls, row: Dict[str, str]) -> "Announcement":
+        """Rebuild a record from a CSV row written by the exporter."""
+        return cls(
+            row.get(KODE_FIELD) or "",
+            row.get(JUDUL_FIELD) or "",
+            row.get(TANGGAL_FIELD) or "",
+            id2=row.get(ID2_FIELD) or None,
+            keywords=row.get(KEYWORDS_FIELD) or None,
+        )
+
+    @classmethod
+    def from_fields(cls, fields: List[str]) -> "Announcement":
+        """Inverse of `to_fields()`; the stored `ts` is reused, not re-parsed."""
+        id2, kode, judul, tanggal, ts, keywords = fields
+        a = cls.__new__(cls)
+        a.id2 = id2 or None
+        a.kode = sys.intern(kode)
+        a.judul = judul
+        a.tanggal = tanggal
+        a.ts = int(ts) if ts else None
+        a.keywords = keywords or None
+        return a
+
+    def to_fields(self) -> List[str]:
+        """Flat string form for temporary files (empty string for None)."""
+        return [
+            self.id2 or "",
+            self.kode,
+            self.judul,
+            self.tanggal,
+            "" if self.ts is None else str(self.ts),
+            self.keywords or "",
+        ]
+
+    def approx_size(self) -> int:
+        """Estimated bytes held by this record, for memory budgets."""
+        return _RECORD_OVERHEAD + len(self.judul) + len(self.tanggal) + len(
+            self.keywords or ""
+        )
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        """Dedup key: (kode, judul, tanggal)."""
+        return (self.kode, self.judul, self.tanggal)
+
+    def row(self) -> Dict[str, str]:
+        """CSV row, with the Keywords and Id2 columns when they are known."""
+        row = {
+            KODE_FIELD: self.kode,
+            JUDUL_FIELD: self.judul,
+            TANGGAL_FIELD: self.tanggal,
+        }
+        if self.keywords is not None:
+            row[KEYWORDS_FIELD] = self.keywords
+        if self.id2 is not None:
+            row[ID2_FIELD] = self.id2
+        return row
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Announcement):
+            return NotImplemented
+        return self.key == other.key
+
+    def __repr__(self) -> str:
+        return "Announcement(%r, %r, %r)" % self.key
@@ -0,0 +1,217 @@
+"""Persistent cross-run dedup index keyed by `Id2`.
+
+The index maps every announcement `Id2` it has been shown to a content hash
+of the fields the exports use. A later sighting of the same `Id2` is SEEN
+when the hash matches and CHANGED when the announcement was edited (e.g.
+re-titled), so edits are exported again, replacing their earlier row in
+the merged CSV, while plain repeats are skipped, across runs and across
+keywords within a run.
+
+The set lives in SQLite, so memory doesn't grow with history. A fixed-size
+Bloom filter in front answers most lookups for new ids without touching the
+database; it is saved next to the index and rebuilt from the table when it
+is missing or out of date.
+
+Like `Watermark.observe()`/`commit()`, additions made during a run are only
+staged: they dedup the rest of the run, but reach the database on
+`commit()`, which the exporter calls once the output has been written. A
+run that crashes or fails to write its output leaves the index as it was,
+so the same announcements are exported again next time.
+"""
+
+import hashlib
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set, Union
+
+from scraper.config import config_path
+
+DEFAULT_SEEN_INDEX_PATH = config_path("seen_index.sqlite3")
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_ERROR_RATE = 0.01
+
+NEW, SEEN, CHANGED = "new", "seen", "changed"
+
+
+def content_hash(reply: Dict) -> bytes:
+    """16-byte hash of the announcement fields that matter for exports."""
+    peng = reply.get("pengumuman") or reply.get("Pengumuman") or {}
+    parts = [
+        str(peng.get(k) or "").strip()
+        for k in (
+            "Kode_Emiten",
+            "NoPengumuman",
+            "TglPengumuman",
+            "JudulPengumuman",
+            "PerihalPengumuman",
+        )
+    ]
+    for att in reply.get("attachments") or []:
+        parts.append(str(att.get("OriginalFilename") or att.get("PDFFilename") or ""))
+    data = "\x1f".join(parts).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def reply_key(reply: Dict, digest: Optional[bytes] = None) -> str:
+    """`Id2` of a reply, or its content hash when the API gave no id."""
+    peng = reply.get("pengumuman") or reply.get("Pengumuman") or {}
+    id2 = peng.get("Id2")
+    if id2 is not None and id2 != "":
+        return str(id2)
+    return "#" + (digest or content_hash(reply)).hex()
+
+
+class BloomFilter:
+    """Bit-array Bloom filter sized for `capacity` keys at `error_rate`."""
+
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE
+    ) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        h = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(h[:8], "little")
+        h2 = int.from_bytes(h[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenIndex:
+    """On-disk `Id2` -> content hash set with an optional Bloom filter front.
+
+    `classify()` returns NEW, SEEN or CHANGED; `add()` stages a reply
+    (visible to `classify()` immediately). `commit()` writes the staged
+    keys in one transaction; `close()` saves the Bloom filter and drops
+    anything not committed. `changed` holds the keys `check_and_add()`
+    found CHANGED, whose earlier exported rows are out of date. `stats`
+    counts committed keys and lookups answered by the filter alone and by
+    the database.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_SEEN_INDEX_PATH,
+        bloom: bool = True,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> None:
+        self.path = Path(path)
+        self.bloom_path = self.path.with_name(self.path.name + ".bloom")
+        self.stats = {"bloom_negative": 0, "db_lookups": 0, "added": 0}
+        self.changed: Set[str] = set()
+        self._staged: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " key TEXT PRIMARY KEY, digest BLOB NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.commit()
+        self._bloom: Optional[BloomFilter] = None
+        if bloom:
+            self._bloom = self._load_bloom(capacity, error_rate)
+
+    def _load_bloom(self, capacity: int, error_rate: float) -> BloomFilter:
+        bf = BloomFilter(capacity, error_rate)
+        try:
+            data = self.bloom_path.read_bytes()
+            count = int.from_bytes(data[:8], "little")
+            # the saved filter is only trusted if it covers every stored key
+            if count == self._table_count() and len(data) - 8 == len(bf.bits):
+                bf.bits[:] = data[8:]
+                return bf
+        except OSError:
+            pass
+        # missing, resized or behind the table (e.g. a run that crashed)
+        for (key,) in self._conn.execute("SELECT key FROM seen"):
+            bf.add(key)
+        return bf
+
+    def _stored_digest(self, key: str) -> Optional[bytes]:
+        # caller holds the lock
+        if key in self._staged:
+            return self._staged[key]
+        if self._bloom is not None and key not in self._bloom:
+            self.stats["bloom_negative"] += 1
+            return None
+        self.stats["db_lookups"] += 1
+        row = self._conn.execute(
+            "SELECT digest FROM seen WHERE key = ?", (key,)
+        ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def classify(self, reply: Dict) -> str:
+        digest = content_hash(reply)
+        with self._lock:
+            stored = self._stored_digest(reply_key(reply, digest))
+        if stored is None:
+            return NEW
+        return SEEN if stored == digest else CHANGED
+
+    def add(self, reply: Dict) -> None:
+        """Stage `reply` for the next `commit()`."""
+        digest = content_hash(reply)
+        key = reply_key(reply, digest)
+        with self._lock:
+            self._staged[key] = digest
+
+    def check_and_add(self, reply: Dict) -> str:
+        """`classify()` then `add()` unless SEEN; returns the status."""
+        status = self.classify(reply)
+        if status != SEEN:
+            self.add(reply)
+        if status == CHANGED:
+            with self._lock:
+                self.changed.add(reply_key(reply))
+        return status
+
+    def commit(self) -> int:
+        """Write staged replies to the index; returns how many were written."""
+        with self._lock:
+            staged, self._staged = self._staged, {}
+            if not staged:
+                return 0
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen (key, digest) VALUES (?, ?)",
+                staged.items(),
+            )
+            self._conn.commit()
+            if self._bloom is not None:
+                for key in staged:
+                    self._bloom.add(key)
+            self.stats["added"] += len(staged)
+        return len(staged)
+
+    def _table_count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def __len__(self) -> int:
+        """Committed keys."""
+        with self._lock:
+            return self._table_count()
+
+    def close(self) -> None:
+        with self._lock:
+            self._staged.clear()
+            if self._bloom is not None:
+                count = self._table_count()
+                tmp = self.bloom_path.with_name(self.bloom_path.name + ".tmp")
+                tmp.write_bytes(count.to_bytes(8, "little") + self._bloom.bits)
+                tmp.replace(self.bloom_path)
+            self._conn.close()
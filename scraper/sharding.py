@@ -0,0 +1,91 @@
+"""Date-window sharding planner for long backfills.
+
+A `[dateFrom, dateTo]` range is cut into calendar windows (monthly or yearly).
+Each window is probed for its `ResultCount`; windows above a threshold are
+bisected recursively until every shard is small enough to fetch in full.
+Windows are `(date_from, date_to)` tuples of inclusive `YYYYMMDD` strings.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+from scraper.parallel import ordered_map
+
+Window = Tuple[str, str]
+
+DEFAULT_SHARD_THRESHOLD = 1000
+
+_FMT = "%Y%m%d"
+
+
+def _parse(s: str) -> date:
+    return datetime.strptime(s, _FMT).date()
+
+
+def _fmt(d: date) -> str:
+    return d.strftime(_FMT)
+
+
+def calendar_windows(date_from: str, date_to: str, unit: str = "month") -> List[Window]:
+    """Split `[date_from, date_to]` into month or year windows (oldest first).
+
+    The first and last windows are clipped to the requested range.
+    """
+    if unit not in ("month", "year"):
+        raise ValueError("unit must be 'month' or 'year', got %r" % unit)
+    start, end = _parse(date_from), _parse(date_to)
+    windows: List[Window] = []
+    cur = start
+    while cur <= end:
+        if unit == "year":
+            nxt = date(cur.year + 1, 1, 1)
+        elif cur.month == 12:
+            nxt = date(cur.year + 1, 1, 1)
+        else:
+            nxt = date(cur.year, cur.month + 1, 1)
+        last = min(nxt - timedelta(days=1), end)
+        windows.append((_fmt(cur), _fmt(last)))
+        cur = nxt
+    return windows
+
+
+def split_window(window: Window) -> Optional[Tuple[Window, Window]]:
+    """Bisect a window by days; returns None for a single-day window."""
+    start, end = _parse(window[0]), _parse(window[1])
+    if start >= end:
+        return None
+    mid = start + (end - start) // 2
+    return (_fmt(start), _fmt(mid)), (_fmt(mid + timedelta(days=1)), _fmt(end))
+
+
+def plan_shards(
+    date_from: str,
+    date_to: str,
+    count_fn: Callable[[Window], Optional[int]],
+    threshold: int = DEFAULT_SHARD_THRESHOLD,
+    unit: str = "month",
+    concurrency: int = 1,
+) -> List[Tuple[str, str, Optional[int]]]:
+    """Return `(date_from, date_to, result_count)` leaf shards, newest first.
+
+    `count_fn(window)` returns the window's `ResultCount` (or None when the
+    server did not report one). Each level of windows is probed with up to
+    `concurrency` calls in flight; windows whose count exceeds `threshold`
+    are bisected and probed again. Single-day windows are never split, so a
+    day above the threshold is returned as-is. Empty windows are dropped.
+    """
+    windows = calendar_windows(date_from, date_to, unit)
+    leaves: List[Tuple[str, str, Optional[int]]] = []
+    while windows:
+        counts = list(ordered_map(count_fn, windows, concurrency=concurrency))
+        pending: List[Window] = []
+        for window, count in zip(windows, counts):
+            halves = split_window(window) if count and count > threshold else None
+            if halves:
+                pending.extend(halves)
+            elif count != 0:
+                leaves.append((window[0], window[1], count))
+        windows = pending
+    # the API returns newest first; keep shards in the same order
+    leaves.sort(key=lambda leaf: leaf[0], reverse=True)
+    return leaves
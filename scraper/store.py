@@ -0,0 +1,250 @@
+"""Local SQLite store of fetched announcements.
+
+Every reply a fetch path collects is upserted by `Id2`, so re-fetching the
+same window is idempotent and an edited announcement simply replaces its old
+row. `TglPengumuman` is kept both as the API's string and as an integer
+epoch (the wall-clock time read as UTC), which the date index and range
+queries use. Attachments are stored as JSON, and each row keeps the reply's
+normalized `search_text`, so keyword queries run without re-normalizing.
+
+`replies()` yields rows back in the API's reply shape, so exports and
+reports can be served from the store with the same code that handles live
+responses.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from scraper import jsonlib
+from scraper.config import config_path
+from scraper.dates import day_to_epoch, to_epoch
+from scraper.matcher import SEARCH_FIELD, KeywordMatcher, search_text
+
+DEFAULT_STORE_PATH = config_path("announcements.sqlite3")
+# replies buffered by `add()` before they are written in one transaction
+DEFAULT_BATCH_SIZE = 500
+_FETCH_CHUNK = 1000
+
+_COLUMNS = (
+    "id2",
+    "no_pengumuman",
+    "kode_emiten",
+    "tgl",
+    "tgl_raw",
+    "judul",
+    "perihal",
+    "attachments",
+    "search_text",
+    "updated_at",
+)
+# a re-fetched row only counts as updated (and gets a new updated_at) when
+# its content changed, so `max_updated_at` tells which months have new data
+_UPSERT = (
+    "INSERT INTO announcements (%s) VALUES (%s) ON CONFLICT(id2) DO UPDATE SET %s"
+    " WHERE %s"
+    % (
+        ", ".join(_COLUMNS),
+        ", ".join("?" * len(_COLUMNS)),
+        ", ".join("%s = excluded.%s" % (c, c) for c in _COLUMNS[1:]),
+        " OR ".join("%s IS NOT excluded.%s" % (c, c) for c in _COLUMNS[1:-1]),
+    )
+)
+
+
+def _record(reply: Dict, now: float) -> Optional[tuple]:
+    peng = reply.get("pengumuman") or reply.get("Pengumuman") or {}
+    id2 = peng.get("Id2")
+    if id2 is None or id2 == "":
+        return None
+    tgl_raw = (peng.get("TglPengumuman") or "").strip()
+    return (
+        str(id2),
+        peng.get("NoPengumuman"),
+        (peng.get("Kode_Emiten") or "").strip(),
+        to_epoch(tgl_raw),
+        tgl_raw,
+        peng.get("JudulPengumuman"),
+        peng.get("PerihalPengumuman"),
+        jsonlib.dumps(reply.get("attachments") or []).decode("utf-8"),
+        search_text(reply),
+        now,
+    )
+
+
+class AnnouncementStore:
+    """SQLite table of announcements keyed by `Id2`.
+
+    Thread-safe: one connection guarded by a lock. `upsert()` writes a batch
+    at once; `add()` buffers single replies and writes every `batch_size`
+    of them, with `flush()`/`close()` writing the rest. `stats` counts
+    upserted rows and replies skipped for lacking an `Id2`.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_STORE_PATH,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.stats = {"upserted": 0, "skipped": 0}
+        self._pending: List[Dict] = []
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS announcements ("
+            " id2 TEXT PRIMARY KEY,"
+            " no_pengumuman TEXT,"
+            " kode_emiten TEXT NOT NULL,"
+            " tgl INTEGER,"
+            " tgl_raw TEXT NOT NULL,"
+            " judul TEXT,"
+            " perihal TEXT,"
+            " attachments TEXT NOT NULL,"
+            " search_text TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS announcements_emiten"
+            " ON announcements (kode_emiten, tgl)"
+        )
+        # covers both date-range scans and `max_updated_at`
+        self._conn.execute("DROP INDEX IF EXISTS announcements_tgl")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS announcements_tgl_updated"
+            " ON announcements (tgl, updated_at)"
+        )
+        self._conn.commit()
+
+    def upsert(self, replies: Iterable[Dict]) -> int:
+        """Insert or update `replies` by `Id2`; returns the rows written."""
+        now = time.time()
+        records = []
+        skipped = 0
+        for reply in replies:
+            rec = _record(reply, now) if reply else None
+            if rec is None:
+                skipped += 1
+            else:
+                records.append(rec)
+        with self._lock:
+            self.stats["skipped"] += skipped
+            if records:
+                self._conn.executemany(_UPSERT, records)
+                self._conn.commit()
+                self.stats["upserted"] += len(records)
+        return len(records)
+
+    def add(self, reply: Dict) -> None:
+        """Buffer one reply for the next batched upsert."""
+        with self._lock:
+            self._pending.append(reply)
+            if len(self._pending) < self.batch_size:
+                return
+            pending, self._pending = self._pending, []
+        self.upsert(pending)
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            self.upsert(pending)
+
+    def count(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM announcements").fetchone()
+        return row[0]
+
+    def count_undated(self) -> int:
+        """Stored announcements whose `TglPengumuman` didn't parse."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM announcements WHERE tgl IS NULL"
+            ).fetchone()
+        return row[0]
+
+    def tgl_range(self) -> Optional[Tuple[int, int]]:
+        """Epochs of the oldest and newest dated announcements, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(tgl), MAX(tgl) FROM announcements"
+            ).fetchone()
+        return None if row[0] is None else (row[0], row[1])
+
+    def max_updated_at(self, date_from: str, date_to: str) -> Optional[float]:
+        """Latest `updated_at` among announcements dated `date_from` to
+        `date_to` (YYYYMMDD, inclusive), or None when there are none."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(updated_at) FROM announcements"
+                " WHERE tgl >= ? AND tgl < ?",
+                (day_to_epoch(date_from), day_to_epoch(date_to) + 86400),
+            ).fetchone()
+        return row[0]
+
+    def replies(
+        self,
+        kode: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        matcher: Optional[KeywordMatcher] = None,
+    ) -> Iterator[Dict]:
+        """Stored announcements in API reply shape, newest first.
+
+        `kode` filters by emiten code, `date_from`/`date_to` (YYYYMMDD,
+        inclusive) by announcement day using the index. A `matcher` keeps
+        only replies whose stored `search_text` matches it.
+        """
+        where, args = [], []
+        if kode:
+            where.append("kode_emiten = ?")
+            args.append(kode.strip().upper())
+        if date_from:
+            where.append("tgl >= ?")
+            args.append(day_to_epoch(date_from))
+        if date_to:
+            where.append("tgl < ?")
+            args.append(day_to_epoch(date_to) + 86400)
+        sql = "SELECT %s FROM announcements" % ", ".join(_COLUMNS)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY tgl DESC, id2"
+        with self._lock:
+            cursor = self._conn.execute(sql, args)
+        for row in self._rows(cursor):
+            rec = dict(zip(_COLUMNS, row))
+            if matcher is not None and not matcher.match_normalized(
+                rec["search_text"]
+            ):
+                continue
+            yield {
+                "pengumuman": {
+                    "Id2": rec["id2"],
+                    "NoPengumuman": rec["no_pengumuman"],
+                    "Kode_Emiten": rec["kode_emiten"],
+                    "TglPengumuman": rec["tgl_raw"],
+                    "JudulPengumuman": rec["judul"],
+                    "PerihalPengumuman": rec["perihal"],
+                },
+                "attachments": jsonlib.loads(rec["attachments"]),
+                SEARCH_FIELD: rec["search_text"],
+            }
+
+    def _rows(self, cursor) -> Iterator[tuple]:
+        # fetched in chunks so large queries stream instead of loading at once
+        while True:
+            with self._lock:
+                chunk = cursor.fetchmany(_FETCH_CHUNK)
+            if not chunk:
+                return
+            yield from chunk
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -3,9 +3,18 @@ from typing import List, Dict
 import json
 import pandas as pd
 
+from scraper import jsonlib
+
 
 def save_json(rows: List[Dict], path: str, indent: int = 2) -> None:
-    """Save list of dicts to a JSON file."""
+    """Save list of dicts to a JSON file.
+
+    Uses the fast `jsonlib` backend for the compact and two-space layouts;
+    other indents go through the stdlib.
+    """
+    if indent in (None, 2):
+        jsonlib.write_json(path, rows, indent=bool(indent))
+        return
     with open(path, "w", encoding="utf-8") as f:
         json.dump(rows, f, ensure_ascii=False, indent=indent)
 
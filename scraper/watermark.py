@@ -0,0 +1,136 @@
+"""Persisted watermark for incremental syncs.
+
+The watermark records the newest `TglPengumuman` seen so far plus the `Id2`s
+of the most recent announcements. The API returns replies newest first, so an
+incremental run only has to fetch from the watermark's day onwards. It can stop
+paging as soon as it reaches a reply older than the watermark. Recent `Id2`s
+cover announcements sharing the watermark's timestamp.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from scraper.config import config_path
+from scraper.jsonlib import read_json, write_json
+
+DEFAULT_WATERMARK_PATH = config_path("watermark.json")
+MAX_RECENT_IDS = 2000
+
+NEW, SEEN, OLDER = "new", "seen", "older"
+
+
+def _parse_ts(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _raw_fields(reply: Dict) -> Tuple[Optional[str], str]:
+    peng = reply.get("pengumuman") or reply.get("Pengumuman") or {}
+    return peng.get("Id2"), (peng.get("TglPengumuman") or "").strip()
+
+
+def _fields(reply: Dict):
+    id2, tgl = _raw_fields(reply)
+    return id2, _parse_ts(tgl)
+
+
+class Watermark:
+    """Newest announcement timestamp plus recently seen `Id2`s.
+
+    During a run, new replies are recorded with `observe()` and only applied
+    by `commit()`, so classification stays stable while fetching (a reply
+    fetched late for one keyword must not look "older" than one fetched
+    early for another). Only each reply's `(Id2, TglPengumuman)` is kept
+    until then, one entry per `Id2`.
+    """
+
+    def __init__(
+        self, newest: Optional[str] = None, recent_ids: Optional[List[str]] = None
+    ) -> None:
+        self.newest = newest
+        self.recent_ids: List[str] = list(recent_ids or [])
+        self._recent = set(self.recent_ids)
+        # Id2 -> TglPengumuman; replies without an Id2 share the None entry,
+        # which keeps only the newest timestamp among them
+        self._pending: Dict[Optional[str], str] = {}
+        # set by `mark_failed()` when a fetch of this run was lost
+        self.failed = False
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = DEFAULT_WATERMARK_PATH) -> "Watermark":
+        """Load a watermark; a missing or unreadable file yields an empty one."""
+        try:
+            data = read_json(path)
+        except Exception:
+            return cls()
+        return cls(data.get("newest"), data.get("recent_ids"))
+
+    def save(self, path: Union[str, Path] = DEFAULT_WATERMARK_PATH) -> None:
+        data = {"newest": self.newest, "recent_ids": self.recent_ids}
+        write_json(path, data)
+
+    def date_from(self) -> Optional[str]:
+        """`YYYYMMDD` of the watermark day, for use as the next `dateFrom`."""
+        ts = _parse_ts(self.newest or "")
+        return ts.strftime("%Y%m%d") if ts else None
+
+    def classify(self, reply: Dict) -> str:
+        """Return NEW, SEEN (known Id2) or OLDER (before the watermark)."""
+        id2, ts = _fields(reply)
+        if id2 and id2 in self._recent:
+            return SEEN
+        newest = _parse_ts(self.newest or "")
+        if newest is not None and ts is not None and ts < newest:
+            return OLDER
+        return NEW
+
+    def observe(self, reply: Dict) -> None:
+        """Record a new reply to be applied on `commit()`."""
+        id2, tgl = _raw_fields(reply)
+        if not id2:
+            ts = _parse_ts(tgl)
+            kept = _parse_ts(self._pending.get(None) or "")
+            if ts is not None and (kept is None or ts > kept):
+                self._pending[None] = tgl
+            return
+        self._pending.setdefault(id2, tgl)
+
+    def mark_failed(self) -> None:
+        """Record that some replies of this run could not be fetched.
+
+        Committing such a run would move the watermark past the replies that
+        were never seen, so callers skip `commit()` and `save()` and the next
+        run fetches the same window again.
+        """
+        self.failed = True
+
+    def commit(self) -> int:
+        """Apply observed replies; returns how many distinct `Id2`s were new."""
+        pending, self._pending = self._pending, {}
+        new = sum(1 for id2 in pending if id2 is not None and id2 not in self._recent)
+        self._advance(pending.items())
+        return new
+
+    def update(self, replies: Iterable[Dict]) -> None:
+        """Advance the watermark past `replies` and remember their Id2s."""
+        self._advance(_raw_fields(reply) for reply in replies)
+
+    def _advance(self, fields: Iterable[Tuple[Optional[str], str]]) -> None:
+        newest = _parse_ts(self.newest or "")
+        for id2, tgl in fields:
+            ts = _parse_ts(tgl)
+            if ts is not None and (newest is None or ts > newest):
+                newest = ts
+                self.newest = tgl
+            if id2 and id2 not in self._recent:
+                self._recent.add(id2)
+                self.recent_ids.append(id2)
+        if len(self.recent_ids) > MAX_RECENT_IDS:
+            drop = self.recent_ids[: len(self.recent_ids) - MAX_RECENT_IDS]
+            self.recent_ids = self.recent_ids[len(drop) :]
+            self._recent.difference_update(drop)
@@ -0,0 +1,103 @@
+"""Shared test fixtures: a synthetic reply corpus and legacy reference oracles.
+
+The oracles are the pre-optimization implementations, kept here so tests can
+check the fast paths against them without importing the benchmarks.
+"""
+
+import random
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+import pytest
+
+from scraper.idx_api import DEFAULT_KEYWORDS
+from scraper.matcher import normalize_keyword
+
+
+def _synthetic_corpus(n: int, seed: int = 7) -> List[Dict]:
+    rnd = random.Random(seed)
+    filler = ["Laporan Keuangan", "Penyampaian Bukti Iklan", "Public Expose", "RUPS"]
+    replies = []
+    for i in range(n):
+        words = [rnd.choice(filler)]
+        if rnd.random() < 0.3:
+            words.append(rnd.choice(DEFAULT_KEYWORDS))
+        replies.append(
+            {
+                "pengumuman": {
+                    "Id2": str(i),
+                    "NoPengumuman": f"{i:05d}/BEI/2025",
+                    "Kode_Emiten": rnd.choice(["BBRI", "TLKM", "ASII", "GOTO"]),
+                    "JudulPengumuman": " ".join(words),
+                    "PerihalPengumuman": " ".join(words),
+                    "TglPengumuman": "2025-10-%02dT08:00:00" % (10 + i % 4),
+                },
+                "attachments": [{"OriginalFilename": f"dokumen_{i}.pdf"}],
+            }
+        )
+    return replies
+
+
+def _legacy_filter_reply(reply: Dict, keywords: Iterable[str]) -> bool:
+    # the old filter_reply: re-normalizes every keyword for each reply
+    if not reply:
+        return False
+    normalized_keywords = [
+        re.sub(r"[^0-9a-z]+", " ", normalize_keyword(k)) for k in keywords if k
+    ]
+    if not normalized_keywords:
+        return False
+    peng = reply.get("pengumuman") or {}
+    candidates = []
+    for key in ("JudulPengumuman", "PerihalPengumuman", "NoPengumuman", "Kode_Emiten"):
+        v = peng.get(key)
+        if v:
+            candidates.append(str(v))
+    for att in reply.get("attachments") or []:
+        orig = att.get("OriginalFilename") or att.get("PDFFilename")
+        if orig:
+            candidates.append(str(orig))
+    hay_norm = re.sub(r"[^0-9a-z]+", " ", "\n".join(candidates).lower())
+    for k in normalized_keywords:
+        if k and k in hay_norm:
+            return True
+    return False
+
+
+def _legacy_parse_date(s: str) -> datetime:
+    # the old exporter's try/except cascade
+    if not s:
+        return datetime.min
+    try:
+        return datetime.fromisoformat(s)
+    except Exception:
+        pass
+    fmts = [
+        "%Y-%m-%dT%H:%M:%S",
+        "%Y-%m-%d %H:%M:%S",
+        "%d/%m/%Y %I:%M:%S %p",
+        "%d/%m/%Y",
+    ]
+    for f in fmts:
+        try:
+            return datetime.strptime(s, f)
+        except Exception:
+            continue
+    return datetime.min
+
+
+@pytest.fixture
+def synthetic_corpus():
+    """`synthetic_corpus(n)`: n reply dicts, ~30% mentioning a default keyword."""
+    return _synthetic_corpus
+
+
+@pytest.fixture
+def legacy_filter_reply():
+    return _legacy_filter_reply
+
+
+@pytest.fixture
+def legacy_parse_date():
+    return _legacy_parse_date
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import sys
+import types
+
+import pytest
+
+from scraper.async_engine import AsyncPageEngine
+from scraper.browser_pool import BATCH_FETCH_JS
+from scraper.ratelimit import RateLimiter
+
+
+class FakeAsyncPage:
+    def __init__(self, server):
+        self.server = server
+
+    async def goto(self, url, timeout=None):
+        pass
+
+    async def wait_for_load_state(self, state, timeout=None):
+        pass
+
+    async def evaluate(self, js, arg):
+        assert js == BATCH_FETCH_JS
+        return [await self.server.respond(url) for url in arg["urls"]]
+
+
+class FakeServer:
+    """Shared by every page; answers URLs from a url -> [(status, body)] script."""
+
+    def __init__(self, script=None, delay=0.0):
+        self.script = script or {}
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.closed = []
+        self.init_scripts = []
+        self.fail_launch = False
+
+    async def respond(self, url):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            answers = self.script.get(url)
+            if answers is None:
+                return {"url": url, "status": 200, "body": json.dumps({"url": url})}
+            status, body = answers.pop(0)
+            if isinstance(body, Exception):
+                raise body
+            return {"url": url, "status": status, "body": body, "retryAfter": None}
+        finally:
+            self.in_flight -= 1
+
+
+class FakeAsyncContext:
+    def __init__(self, server):
+        self.server = server
+
+    async def add_init_script(self, script):
+        self.server.init_scripts.append(script)
+
+    async def new_page(self):
+        return FakeAsyncPage(self.server)
+
+    async def close(self):
+        self.server.closed.append("context")
+
+
+class FakeAsyncBrowser:
+    def __init__(self, server):
+        self.server = server
+
+    async def new_context(self, **kwargs):
+        return FakeAsyncContext(self.server)
+
+    async def close(self):
+        self.server.closed.append("browser")
+
+
+@pytest.fixture
+def fake_async_playwright(monkeypatch):
+    """Installs a `playwright.async_api` backed by one `FakeServer`."""
+    server = FakeServer()
+
+    class Chromium:
+        async def launch(self, headless=True, **kwargs):
+            if server.fail_launch:
+                raise RuntimeError("launch failed")
+            return FakeAsyncBrowser(server)
+
+    class Playwright:
+        chromium = Chromium()
+
+        async def stop(self):
+            server.closed.append("playwright")
+
+    class Starter:
+        async def start(self):
+            return Playwright()
+
+    async_api = types.ModuleType("playwright.async_api")
+    async_api.async_playwright = Starter
+    package = types.ModuleType("playwright")
+    package.async_api = async_api
+    monkeypatch.setitem(sys.modules, "playwright", package)
+    monkeypatch.setitem(sys.modules, "playwright.async_api", async_api)
+    return server
+
+
+def _engine(**kwargs):
+    return AsyncPageEngine(limiter=RateLimiter(rate=0, base_delay=0, jitter=0), **kwargs)
+
+
+def test_engine_runs_and_stops_its_loop_thread(fake_async_playwright):
+    engine = _engine(pages=2, auth_token="tok")
+    with engine:
+        thread = engine._thread
+        assert thread.is_alive()
+        assert engine.fetch_json_many(["u1", "u1"]) == {"u1": {"url": "u1"}}
+    assert not thread.is_alive()
+    assert engine._loop is None
+    assert fake_async_playwright.closed == ["context", "browser", "playwright"]
+    assert fake_async_playwright.init_scripts == [
+        "localStorage.setItem('auth._token.local', \"tok\");"
+    ]
+    engine.close()  # already closed: no-op
+
+
+def test_failed_start_stops_the_loop_thread(fake_async_playwright):
+    fake_async_playwright.fail_launch = True
+    engine = _engine()
+    with pytest.raises(RuntimeError, match="launch failed"):
+        engine.start()
+    assert engine._loop is None
+    assert fake_async_playwright.closed == ["playwright"]
+
+
+def test_fetches_are_bounded_by_page_count(fake_async_playwright):
+    fake_async_playwright.delay = 0.01
+    urls = ["u%d" % i for i in range(12)]
+    with _engine(pages=3) as engine:
+        results = engine.fetch_json_many(urls)
+    assert list(results) == urls
+    assert all(results[u] == {"url": u} for u in urls)
+    assert fake_async_playwright.peak == 3
+    assert engine.stats["fetched"] == 12
+
+
+def test_errors_are_retried_then_reported_as_empty(fake_async_playwright):
+    fake_async_playwright.script.update(
+        {
+            "throttled": [(429, ""), (200, '{"ok": 1}')],
+            "broken": [(0, RuntimeError("page crashed"))] * 3,
+            "challenge": [(200, "<html>challenge</html>")] * 3,
+        }
+    )
+    with _engine(pages=2) as engine:
+        results = engine.fetch_json_many(["throttled", "broken", "challenge", "u"])
+        # a page whose evaluate raised goes back to the pool
+        assert engine.fetch_json_many(["v"]) == {"v": {"url": "v"}}
+    assert results == {
+        "throttled": {"ok": 1},
+        "broken": {},
+        "challenge": {},
+        "u": {"url": "u"},
+    }
+    assert engine.stats == {"fetched": 3, "cached": 0, "failed": 2}
@@ -0,0 +1,81 @@
+import requests
+
+from scraper import idx_api
+from scraper.breaker import TransportBreaker
+from scraper.idx_api import IdxClient
+from scraper.ratelimit import RateLimiter
+
+
+def test_pins_after_threshold_and_probes_after_cooldown(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("scraper.breaker.time.time", lambda: now[0])
+    b = TransportBreaker(threshold=2, cooldown=60)
+    for _ in range(2):
+        assert b.order() == ["requests", "requests_alt_ua", "playwright"]
+        b.record_failure("requests")
+        b.record_failure("requests_alt_ua")
+        b.record_success("playwright")
+    assert b.pinned == "playwright"
+    assert b.order() == ["playwright"]
+    # successes on the pinned transport don't extend the pin
+    now[0] += 30
+    b.record_success("playwright")
+    now[0] += 31
+    assert b.order() == ["requests", "requests_alt_ua", "playwright"]
+    # the cheap transport works again -> unpinned
+    b.record_success("requests")
+    assert b.pinned is None
+
+
+def test_pin_persists_between_runs(tmp_path):
+    path = tmp_path / "breaker.json"
+    b = TransportBreaker.load(path, threshold=1)
+    b.record_failure("requests")
+    b.record_success("requests_alt_ua")
+    assert TransportBreaker.load(path, threshold=1).order() == [
+        "requests_alt_ua",
+        "playwright",
+    ]
+
+
+class Resp:
+    def __init__(self, status):
+        self.status_code = status
+        self.headers = {}
+        self.content = b'{"Replies": []}'
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=self)
+
+    def json(self):
+        return {"Replies": []}
+
+
+def test_client_skips_blocked_transports_once_pinned(monkeypatch):
+    session = requests.Session()
+    api_calls = []
+
+    def fake_get(url, **kwargs):
+        if "GetAnnouncement" in url:
+            api_calls.append(url)
+            return Resp(403)
+        return Resp(200)
+
+    session.get = fake_get
+    browser_calls = []
+    monkeypatch.setattr(
+        idx_api,
+        "_fetch_page_with_playwright",
+        lambda params: browser_calls.append(params) or {"Replies": []},
+    )
+    client = IdxClient(
+        session=session,
+        rate_limiter=RateLimiter(rate=0),
+        breaker=TransportBreaker(threshold=2),
+    )
+    for i in range(5):
+        client.get_json({"indexFrom": str(i)})
+    # two pages pay requests + alt UA, after that only the browser is used
+    assert len(api_calls) == 4
+    assert len(browser_calls) == 5
@@ -0,0 +1,208 @@
+import json
+import sys
+import time
+import types
+from contextlib import contextmanager
+
+import pytest
+
+from scraper.browser_pool import BATCH_FETCH_JS, BrowserPool, fetch_json_batch
+from scraper.cache import ResponseCache
+from scraper.ratelimit import RateLimiter
+
+
+class FakePage:
+    """Answers batched evaluate calls from a url -> [(status, body), ...] script."""
+
+    def __init__(self, script):
+        self.script = script
+        self.calls = []
+
+    def evaluate(self, js, arg):
+        assert js == BATCH_FETCH_JS
+        self.calls.append(list(arg["urls"]))
+        out = []
+        for url in arg["urls"]:
+            status, body = self.script[url].pop(0)
+            out.append({"url": url, "status": status, "body": body, "retryAfter": "0"})
+        return out
+
+
+def test_batch_is_one_round_trip_and_retries_failures():
+    ok = json.dumps({"Replies": [{"n": 1}]})
+    page = FakePage(
+        {
+            "u1": [(200, ok)],
+            "u2": [(429, ""), (200, ok)],
+            "u3": [(200, "<html>challenge</html>"), (200, ok)],
+        }
+    )
+    limiter = RateLimiter(rate=0, base_delay=0, jitter=0)
+    results = fetch_json_batch(page, ["u1", "u2", "u3"], limiter=limiter)
+    assert page.calls == [["u1", "u2", "u3"], ["u2", "u3"]]
+    assert all(results[u] == {"Replies": [{"n": 1}]} for u in ("u1", "u2", "u3"))
+    assert limiter.stats["acquired"] == 5
+
+
+def test_batch_is_paced_by_the_limiter_burst():
+    events = []
+
+    class Limiter(RateLimiter):
+        def acquire(self):
+            events.append("token")
+            super().acquire()
+
+    class Page(FakePage):
+        def evaluate(self, js, arg):
+            events.append(len(arg["urls"]))
+            return super().evaluate(js, arg)
+
+    urls = ["u%d" % i for i in range(5)]
+    page = Page({u: [(200, "{}")] for u in urls})
+    limiter = Limiter(rate=0, burst=2, base_delay=0, jitter=0)
+    fetch_json_batch(page, urls, limiter=limiter)
+    # each chunk of `burst` URLs waits for its tokens right before it is sent
+    assert page.calls == [["u0", "u1"], ["u2", "u3"], ["u4"]]
+    assert events == ["token", "token", 2, "token", "token", 2, "token", 1]
+
+
+def test_batch_gives_up_and_serves_cache(tmp_path):
+    url = "https://x/GetAnnouncement?keyword=a&dateTo=20200101"
+    cache = ResponseCache(tmp_path / "c.sqlite3")
+    cache.put_url(url, b'{"Replies": []}')
+    page = FakePage({"bad": [(503, "")] * 2})
+    limiter = RateLimiter(rate=0, base_delay=0, jitter=0)
+    results = fetch_json_batch(
+        page, [url, "bad"], cache=cache, limiter=limiter, max_attempts=2
+    )
+    assert results == {url: {"Replies": []}, "bad": {}}
+    assert page.calls == [["bad"], ["bad"]]
+
+
+class FakeSyncPage:
+    def __init__(self, context):
+        self.context = context
+
+    def goto(self, url, timeout=None):
+        pass
+
+    def wait_for_load_state(self, state, timeout=None):
+        pass
+
+
+class FakeSyncContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    def new_page(self):
+        return FakeSyncPage(self)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSyncBrowser:
+    def __init__(self, registry):
+        self.registry = registry
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    def new_context(self, **kwargs):
+        ctx = FakeSyncContext(self)
+        self.registry["contexts"].append(ctx)
+        return ctx
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_sync_playwright(monkeypatch):
+    """Installs a `playwright.sync_api` whose browsers record their contexts."""
+    registry = {"browsers": [], "contexts": []}
+
+    class Chromium:
+        def launch(self, headless=True, **kwargs):
+            browser = FakeSyncBrowser(registry)
+            registry["browsers"].append(browser)
+            return browser
+
+    @contextmanager
+    def sync_playwright():
+        yield types.SimpleNamespace(chromium=Chromium())
+
+    sync_api = types.ModuleType("playwright.sync_api")
+    sync_api.sync_playwright = sync_playwright
+    package = types.ModuleType("playwright")
+    package.sync_api = sync_api
+    monkeypatch.setitem(sys.modules, "playwright", package)
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", sync_api)
+    return registry
+
+
+def test_pool_recycles_context_after_max_uses(fake_sync_playwright):
+    pool = BrowserPool(max_context_uses=2)
+    try:
+        contexts = [pool.submit(lambda page: page.context).result(5) for _ in range(5)]
+    finally:
+        pool.close()
+    assert contexts[0] is contexts[1]
+    assert contexts[2] is contexts[3]
+    assert len({id(c) for c in contexts}) == 3
+    assert pool.stats == {"jobs": 5, "contexts_started": 3}
+    # one browser serves every context; recycled contexts are closed
+    assert len(fake_sync_playwright["browsers"]) == 1
+    assert all(c.closed for c in fake_sync_playwright["contexts"])
+
+
+def test_pool_recycles_context_after_failure(fake_sync_playwright):
+    def fail(page):
+        raise RuntimeError("challenge page")
+
+    pool = BrowserPool()
+    try:
+        first = pool.submit(lambda page: page.context).result(5)
+        failed = pool.submit(fail)
+        with pytest.raises(RuntimeError, match="challenge page"):
+            failed.result(5)
+        assert first.closed
+        after = pool.submit(lambda page: page.context).result(5)
+    finally:
+        pool.close()
+    assert after is not first
+    assert pool.stats["contexts_started"] == 2
+
+
+def test_submit_results_match_their_jobs(fake_sync_playwright):
+    def job(i):
+        def run(page):
+            # later jobs finish first
+            time.sleep(0.002 * (10 - i))
+            return i, page
+
+        return run
+
+    pool = BrowserPool(size=3)
+    try:
+        futures = [pool.submit(job(i)) for i in range(10)]
+        results = [f.result(5) for f in futures]
+    finally:
+        pool.close()
+    assert [i for i, _ in results] == list(range(10))
+    # the work was spread over the three workers' pages
+    assert len({id(page) for _, page in results}) > 1
+
+
+def test_close_joins_workers_and_closes_browsers(fake_sync_playwright):
+    pool = BrowserPool(size=2)
+    assert pool.submit(lambda page: 1).result(5) == 1
+    workers = list(pool._workers)
+    pool.close()
+    assert not any(w.is_alive() for w in workers)
+    assert all(b.closed for b in fake_sync_playwright["browsers"])
+    with pytest.raises(RuntimeError):
+        pool.submit(lambda page: 1)
+    pool.close()  # idempotent
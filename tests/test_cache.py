@@ -0,0 +1,69 @@
+import time
+
+from scraper.cache import ResponseCache, cache_key, is_closed_window
+
+
+def test_cache_key_normalizes_params():
+    a = {"keyword": " HMETD ", "dateFrom": "20240101", "dateTo": "20240131",
+         "indexFrom": 0, "pageSize": 100}
+    b = {"pageSize": "100", "dateTo": "20240131", "dateFrom": "20240101",
+         "keyword": "HMETD", "lang": "id", "emitenType": "*", "indexFrom": "0"}
+    assert cache_key(a) == cache_key(b)
+
+
+def test_is_closed_window():
+    assert is_closed_window({"dateTo": "20240131"}, today="20240201")
+    assert not is_closed_window({"dateTo": "20240201"}, today="20240201")
+    assert not is_closed_window({}, today="20240201")
+
+
+def test_open_window_expires_closed_window_does_not(tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite3", ttl=0.01)
+    open_params = {"dateFrom": "20240101", "dateTo": "99991231"}
+    closed_params = {"dateFrom": "20240101", "dateTo": "20240131"}
+    cache.put(open_params, b"{}")
+    cache.put(closed_params, b'{"ResultCount": 0}')
+    time.sleep(0.02)
+    assert cache.get(open_params) is None
+    assert cache.get(closed_params) == b'{"ResultCount": 0}'
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+    assert cache.stats["expired"] == 1
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite3", max_bytes=25)
+    p = [{"dateTo": "20240101", "indexFrom": str(i)} for i in range(3)]
+    cache.put(p[0], b"x" * 10)
+    time.sleep(0.001)
+    cache.put(p[1], b"x" * 10)
+    time.sleep(0.001)
+    assert cache.get(p[0]) is not None  # p[1] is now least recently used
+    time.sleep(0.001)
+    cache.put(p[2], b"x" * 10)
+    assert cache.get(p[1]) is None
+    assert cache.get(p[0]) is not None
+    assert cache.stats["evictions"] == 1
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "c.sqlite3"
+    params = {"dateTo": "20240101"}
+    first = ResponseCache(path)
+    first.put(params, b"body")
+    first.close()
+    assert ResponseCache(path).get(params) == b"body"
+
+
+def test_zero_ttl_bypasses_open_windows(tmp_path):
+    path = tmp_path / "c.sqlite3"
+    open_params = {"dateFrom": "20240101", "dateTo": "99991231"}
+    closed_params = {"dateFrom": "20240101", "dateTo": "20240131"}
+    ResponseCache(path).put(open_params, b'{"ResultCount": 1}')
+    poll = ResponseCache(path, ttl=0)
+    # a still-live entry from a cached run is not served to an incremental poll
+    assert poll.get(open_params) is None
+    poll.put(open_params, b"{}")
+    poll.put(closed_params, b"{}")
+    assert poll.get(closed_params) == b"{}"
+    assert poll.stats["stores"] == 1
@@ -0,0 +1,157 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from scraper.columnar import (
+    complete_partitions,
+    existing_partitions,
+    group_by_month,
+    is_closed_month,
+)
+
+
+def _reply(id2, kode, tgl, files=()):
+    return {
+        "pengumuman": {
+            "Id2": id2,
+            "Kode_Emiten": kode,
+            "JudulPengumuman": "HMETD " + id2,
+            "TglPengumuman": tgl,
+        },
+        "attachments": [{"OriginalFilename": f} for f in files],
+    }
+
+
+REPLIES = [
+    _reply("1", "BBRI", "2024-01-05T08:00:00", ["a.pdf"]),
+    _reply("2", "TLKM", "2024-01-20T08:00:00"),
+    _reply("3", "BBRI", "2024-02-01T08:00:00", ["b.pdf", "c.pdf"]),
+    _reply("4", "BBRI", ""),
+]
+
+
+def test_group_by_month_and_closed_months():
+    groups, undated = group_by_month(REPLIES)
+    assert {k: len(v) for k, v in groups.items()} == {(2024, 1): 2, (2024, 2): 1}
+    assert undated == 1
+    now = datetime(2024, 2, 10)
+    assert is_closed_month(2024, 1, now)
+    assert not is_closed_month(2024, 2, now)
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_partitioned_export_appends_without_rewriting(tmp_path, fmt):
+    ds = pytest.importorskip("pyarrow.dataset")
+    from scraper.columnar import write_partitioned
+
+    stats = write_partitioned(REPLIES, tmp_path, fmt)
+    assert stats == {"partitions": 2, "skipped": 0, "rows": 3, "undated": 1}
+    assert existing_partitions(tmp_path) == {(2024, 1), (2024, 2)}
+    assert complete_partitions(tmp_path) == {(2024, 1), (2024, 2)}
+    jan = tmp_path / "year=2024" / "month=1" / ("part-0." + fmt)
+    mtime = jan.stat().st_mtime_ns
+
+    # a complete month is kept as is; a new month is added next to it
+    stats = write_partitioned(
+        REPLIES + [_reply("5", "ASII", "2024-03-01T08:00:00")], tmp_path, fmt
+    )
+    assert stats["partitions"] == 1 and stats["skipped"] == 2
+    assert jan.stat().st_mtime_ns == mtime
+
+    fmt_name = "ipc" if fmt == "arrow" else fmt
+    table = ds.dataset(tmp_path, format=fmt_name, partitioning="hive").to_table()
+    assert table.num_rows == 4
+    rows = {r["id2"]: r for r in table.to_pylist()}
+    assert rows["3"]["attachments"] == ["b.pdf", "c.pdf"]
+    assert rows["3"]["month"] == 2
+    assert str(table.schema.field("tgl").type) == "timestamp[ms]"
+
+
+def test_open_month_is_rewritten_once_after_it_closes(tmp_path):
+    ds = pytest.importorskip("pyarrow.dataset")
+    from scraper.columnar import write_partitioned
+
+    feb = datetime(2024, 2, 10)
+    write_partitioned(REPLIES, tmp_path, today=feb)
+    assert complete_partitions(tmp_path) == {(2024, 1)}
+
+    # an announcement that arrived after the open month was first written
+    late = REPLIES + [_reply("6", "TLKM", "2024-02-28T08:00:00")]
+    stats = write_partitioned(late, tmp_path, today=datetime(2024, 3, 1))
+    assert stats["partitions"] == 1 and stats["skipped"] == 1
+    assert complete_partitions(tmp_path) == {(2024, 1), (2024, 2)}
+    table = ds.dataset(tmp_path, format="parquet", partitioning="hive").to_table()
+    assert sorted(table.column("id2").to_pylist()) == ["1", "2", "3", "6"]
+
+    stats = write_partitioned(late, tmp_path, today=datetime(2024, 3, 2))
+    assert stats["partitions"] == 0 and stats["skipped"] == 2
+
+
+def test_store_export_queries_only_changed_months(tmp_path, monkeypatch):
+    ds = pytest.importorskip("pyarrow.dataset")
+    from scraper import columnar
+    from scraper.columnar import write_store
+    from scraper.store import AnnouncementStore
+
+    store = AnnouncementStore(tmp_path / "a.sqlite3")
+    store.upsert(REPLIES + [_reply("5", "ASII", "2024-04-02T08:00:00")])
+    root = tmp_path / "out"
+    queries = []
+    replies = store.replies
+
+    def spy(**kwargs):
+        queries.append((kwargs["date_from"], kwargs["date_to"]))
+        return replies(**kwargs)
+
+    monkeypatch.setattr(store, "replies", spy)
+    monkeypatch.setattr(columnar, "BATCH_ROWS", 1)
+    stats = write_store(store, root, today=datetime(2024, 2, 10))
+    assert stats == {"partitions": 3, "skipped": 0, "rows": 4, "undated": 1}
+    # March has no rows, so it is neither read nor written
+    assert ("20240301", "20240331") not in queries
+    assert existing_partitions(root) == {(2024, 1), (2024, 2), (2024, 4)}
+    assert complete_partitions(root) == {(2024, 1)}
+
+    queries.clear()
+    stats = write_store(store, root, today=datetime(2024, 5, 1))
+    assert queries == [("20240201", "20240229"), ("20240401", "20240430")]
+    assert stats == {"partitions": 2, "skipped": 1, "rows": 2, "undated": 1}
+    table = ds.dataset(root, format="parquet", partitioning="hive").to_table()
+    jan = table.filter(ds.field("month") == 1).column("id2").to_pylist()
+    assert jan == ["2", "1"]  # newest first across row batches
+    store.close()
+
+
+def test_store_backfill_rewrites_a_closed_month(tmp_path, monkeypatch):
+    ds = pytest.importorskip("pyarrow.dataset")
+    from scraper import store as store_module
+    from scraper.columnar import marker_updated_at, write_store
+    from scraper.store import AnnouncementStore
+
+    # every upsert gets a later updated_at, however coarse the real clock
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(store_module, "time", SimpleNamespace(time=lambda: next(clock)))
+    store = AnnouncementStore(tmp_path / "a.sqlite3")
+    # a short run on July 1 only saw the last days of June
+    store.upsert([_reply("1", "BBRI", "2024-06-29T08:00:00")])
+    root = tmp_path / "out"
+    july = datetime(2024, 7, 1)
+    write_store(store, root, today=july)
+    assert complete_partitions(root) == {(2024, 6)}
+    stamp = marker_updated_at(root, 2024, 6)
+    assert stamp == store.max_updated_at("20240601", "20240630")
+
+    # re-fetching an unchanged announcement leaves the month alone
+    store.upsert([_reply("1", "BBRI", "2024-06-29T08:00:00")])
+    stats = write_store(store, root, today=july)
+    assert stats["partitions"] == 0 and stats["skipped"] == 1
+
+    # a later backfill of early June lands in the closed month
+    store.upsert([_reply("2", "TLKM", "2024-06-03T08:00:00")])
+    stats = write_store(store, root, today=datetime(2024, 7, 5))
+    assert stats["partitions"] == 1 and stats["rows"] == 2
+    assert marker_updated_at(root, 2024, 6) > stamp
+    table = ds.dataset(root, format="parquet", partitioning="hive").to_table()
+    assert table.column("id2").to_pylist() == ["1", "2"]
+    store.close()
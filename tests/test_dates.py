@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from export_idx_keywords_csv import collect_rows, parse_date, write_rows_csv
+from scraper import dates
+from scraper.dates import DateParser, day_to_epoch, sniff_format, to_epoch
+
+
+def test_parser_sniffs_once_and_resniffs_on_change():
+    p = DateParser()
+    assert p.parse("05/01/2024 08:00:00 PM") == to_epoch("2024-01-05T20:00:00")
+    assert p.format == "dmy_time"
+    assert p.parse("2024-01-05 20:00:00") == 1704484800
+    assert p.format == "iso"
+    assert p.parse("bogus") is None and p.parse("") is None
+    assert sniff_format("05/01/2024") == "dmy"
+    assert to_epoch("2024-01-05T20:00:00+07:00") == 1704484800 - 7 * 3600
+    assert day_to_epoch("20240105") == 1704412800
+
+
+def test_parse_many_matches_scalar_parsing(monkeypatch):
+    monkeypatch.setattr(dates, "VECTOR_MIN", 4)
+    values = ["2024-01-%02dT08:00:00" % d for d in range(1, 29)]
+    values += ["05/01/2024 08:00:00 PM", None, "", "bogus", values[0]]
+    assert DateParser().parse_many(values) == [DateParser().parse(v) for v in values]
+
+
+def test_parse_date_agrees_with_legacy_cascade(legacy_parse_date):
+    for s in ["2024-01-05T08:00:00", "2024-01-05 08:00:00",
+              "05/01/2024 08:00:00 PM", "05/01/2024", "", "bogus"]:
+        assert parse_date(s) == legacy_parse_date(s)
+    assert parse_date("") == datetime.min
+
+
+def test_export_sorts_on_stored_epoch(tmp_path):
+    rows = []
+    collect_rows(
+        [
+            {"pengumuman": {"Kode_Emiten": "A", "JudulPengumuman": "x",
+                            "TglPengumuman": "05/01/2024 08:00:00 PM"}},
+            {"pengumuman": {"Kode_Emiten": "B", "JudulPengumuman": "y",
+                            "TglPengumuman": "2024-01-06T01:00:00"}},
+            {"pengumuman": {"Kode_Emiten": "C", "JudulPengumuman": "z"}},
+        ],
+        rows,
+    )
+    assert [a.ts is None for a in rows] == [False, False, True]
+    write_rows_csv(rows, tmp_path / "out.csv")
+    assert [a.kode for a in rows] == ["B", "A", "C"]
@@ -0,0 +1,130 @@
+import csv
+from urllib.parse import parse_qs, urlparse
+
+from export_idx_keywords_csv import (
+    _save_watermark,
+    collect_rows,
+    keyword_replies,
+    requests_fetch_all,
+    write_rows_csv,
+)
+from scraper.matcher import KeywordMatcher
+from scraper.watermark import Watermark
+
+
+def reply(kode, judul, tgl, filename=""):
+    return {
+        "pengumuman": {"Kode_Emiten": kode, "JudulPengumuman": judul, "TglPengumuman": tgl},
+        "attachments": [{"OriginalFilename": filename}] if filename else [],
+    }
+
+
+def test_keywords_column_lists_every_matching_keyword(tmp_path):
+    tagger = KeywordMatcher(["Penawaran Tender", "Penawaran Tender Wajib", "HMETD"])
+    rows = []
+    replies = [
+        reply("ABC", "Penawaran Tender Wajib", "2025-10-10T08:00:00", "hmetd.pdf"),
+        reply("XYZ", "Laporan", "2025-10-11T08:00:00"),
+    ]
+    collect_rows(replies, rows, tagger=tagger)
+    out = tmp_path / "out.csv"
+    assert write_rows_csv(rows, out, keywords_column=True) == 2
+    with out.open(encoding="utf-8") as f:
+        got = list(csv.DictReader(f, delimiter=";"))
+    assert [r["Keywords"] for r in got] == [
+        "",
+        "Penawaran Tender|Penawaran Tender Wajib|HMETD",
+    ]
+
+
+def test_default_output_keeps_three_columns(tmp_path):
+    rows = []
+    collect_rows([reply("ABC", "HMETD", "2025-10-10T08:00:00")], rows)
+    out = tmp_path / "out.csv"
+    write_rows_csv(rows, out)
+    header = out.read_text(encoding="utf-8").splitlines()[0]
+    assert header == "Kode_Emiten;Judul_Pengumuman;Tanggal_Pengumuman"
+
+
+class PagedClient:
+    """Serves `replies` newest first; fails past the first page if `flaky`."""
+
+    def __init__(self, replies, flaky=False):
+        self.replies = replies
+        self.flaky = flaky
+        self.stats = dict.fromkeys(
+            ["api_requests", "bytes_received", "wire_bytes", "warmups"], 0
+        )
+        self.stats["requests_saved"] = 0
+
+    def get_json(self, params):
+        start = int(params["indexFrom"])
+        if self.flaky and start > 0:
+            raise ConnectionError("connection reset")
+        size = int(params["pageSize"])
+        return {
+            "ResultCount": len(self.replies),
+            "Replies": self.replies[start : start + size],
+        }
+
+
+def test_failed_page_does_not_advance_the_watermark(tmp_path):
+    replies = []
+    for i in range(150):
+        tgl = "2025-10-20T%02d:%02d:00" % (23 - i // 60, 59 - i % 60)
+        rep = reply("ABC", "HMETD %d" % i, tgl)
+        rep["pengumuman"]["Id2"] = str(i)
+        replies.append(rep)
+    known = "2025-10-01T08:00:00"
+    out = tmp_path / "out.csv"
+
+    wm = Watermark(newest=known)
+    client = PagedClient(replies, flaky=True)
+    requests_fetch_all(["HMETD"], out, None, 3, client=client, watermark=wm)
+    assert wm.failed
+    _save_watermark(wm)
+    # the second page was lost, so the run is not committed
+    assert wm.newest == known and wm.recent_ids == []
+
+    # the next run starts from the same watermark and picks up every reply
+    wm = Watermark(newest=known)
+    client = PagedClient(replies)
+    n = requests_fetch_all(["HMETD"], out, None, 3, client=client, watermark=wm)
+    assert not wm.failed
+    assert n == 150
+
+
+def test_keyword_replies_fetch_bounded_chunks_lazily():
+    calls = []
+
+    def fetch_many(urls):
+        calls.append(len(urls))
+        out = {}
+        for url in urls:
+            query = parse_qs(urlparse(url).query)
+            kw, start = query["keyword"][0], int(query["indexFrom"][0])
+            if (kw, start) == ("b", 200):
+                out[url] = {}  # given up on
+            else:
+                replies = [f"{kw}{start + i}" for i in range(2)]
+                out[url] = {"ResultCount": 250, "Replies": replies}
+        return out
+
+    wm = Watermark()
+    pages = keyword_replies(
+        fetch_many,
+        ["a", "b", "c"],
+        "20251001",
+        "20251031",
+        watermark=wm,
+        pages_per_call=2,
+    )
+    assert next(pages) == ["a0", "a1"]
+    assert calls == [2]
+    rest = list(pages)
+    # first pages of a and b, their 4 further pages, then c's 3 pages
+    assert calls == [2, 2, 2, 1, 2]
+    assert rest[0] == ["b0", "b1"] and rest[1] == ["a100", "a101"]
+    assert rest[4] == [] and rest[-1] == ["c200", "c201"]
+    assert len(rest) == 8
+    assert wm.failed
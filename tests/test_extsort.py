@@ -0,0 +1,62 @@
+import random
+
+from export_idx_keywords_csv import (
+    collect_rows,
+    export_rows,
+    read_rows_csv,
+    write_rows_csv,
+)
+from scraper.extsort import ExternalSorter
+
+
+def _sorter(budget, fan_in=64, tmp_dir=None):
+    return ExternalSorter(
+        key=lambda item: int(item[0]),
+        encode=lambda item: item,
+        decode=lambda row: row,
+        size=lambda item: 1,
+        memory_budget=budget,
+        reverse=True,
+        tmp_dir=tmp_dir,
+        max_fan_in=fan_in,
+    )
+
+
+def test_spilled_runs_merge_stably(tmp_path):
+    rnd = random.Random(3)
+    items = [[str(rnd.randrange(50)), str(i)] for i in range(1000)]
+    with _sorter(budget=9, fan_in=4, tmp_dir=str(tmp_path)) as sorter:
+        sorter.extend(items)
+        assert sorter.stats["runs"] == 100
+        out = list(sorter)
+    assert out == sorted(items, key=lambda item: int(item[0]), reverse=True)
+    assert list(tmp_path.iterdir()) == []
+
+
+def reply(kode, judul, tgl):
+    peng = {"Kode_Emiten": kode, "JudulPengumuman": judul, "TglPengumuman": tgl}
+    return {"pengumuman": peng}
+
+
+def test_streamed_export_matches_in_memory_export(tmp_path):
+    rnd = random.Random(5)
+    replies = [
+        reply(rnd.choice("ABC"), "t%d" % rnd.randrange(40),
+              "2024-01-%02dT08:00:00" % rnd.randrange(1, 10))
+        for _ in range(500)
+    ]
+    in_memory = []
+    collect_rows(replies, in_memory)
+    n = write_rows_csv(in_memory, tmp_path / "a.csv")
+
+    spool = export_rows(memory_budget=4096)
+    collect_rows(replies, spool)
+    assert spool.stats["runs"] > 1
+    assert write_rows_csv(spool, tmp_path / "b.csv") == n
+    assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+    # merging into the existing file keeps old rows and drops repeats
+    spool = export_rows(memory_budget=4096)
+    collect_rows([reply("Z", "new", "2024-02-01T08:00:00")] + replies, spool)
+    assert write_rows_csv(spool, tmp_path / "b.csv", merge=True) == n + 1
+    assert read_rows_csv(tmp_path / "b.csv")[0]["Kode_Emiten"] == "Z"
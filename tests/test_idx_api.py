@@ -1,4 +1,13 @@
-from scraper.idx_api import filter_reply
+import json
+
+import requests
+
+from scraper.idx_api import (
+    IdxClient,
+    fetch_replies_for_keyword,
+    filter_reply,
+    iter_pages,
+)
 
 
 KEYWORDS = [
@@ -47,3 +56,108 @@ def test_filter_matches_attachment():
 def test_filter_negative():
     r = make_reply(judul="Laporan keuangan tahunan")
     assert not filter_reply(r, KEYWORDS)
+
+
+class FakeResponse:
+    def __init__(self, payload=None, status_code=200):
+        self.payload = payload or {}
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=self)
+
+    @property
+    def content(self):
+        return json.dumps(self.payload).encode("utf-8")
+
+    def iter_content(self, chunk_size=1):
+        body = self.content
+        for i in range(0, len(body), chunk_size):
+            yield body[i : i + chunk_size]
+
+    def close(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def make_client(payload):
+    session = requests.Session()
+    calls = []
+
+    def fake_get(url, params=None, headers=None, timeout=None, stream=False):
+        calls.append(url)
+        return FakeResponse(payload)
+
+    session.get = fake_get
+    return IdxClient(session=session), calls
+
+
+def test_client_warms_up_once_across_keywords():
+    client, calls = make_client({"Replies": [make_reply(judul="HMETD")]})
+    for kw in KEYWORDS[:3]:
+        replies = fetch_replies_for_keyword(kw, "20240101", "20240102", client=client)
+        assert len(replies) == 1
+    assert calls.count("https://www.idx.co.id/") == 1
+    assert client.stats["api_requests"] == 3
+    assert client.stats["warmups"] == 1
+    assert client.stats["requests_saved"] == 2
+
+
+class PagedClient:
+    """Stand-in for IdxClient serving `total` numbered items."""
+
+    def __init__(self, total):
+        self.total = total
+        self.offsets = []
+
+    def get_json(self, params):
+        start = int(params["indexFrom"])
+        size = int(params["pageSize"])
+        self.offsets.append(start)
+        items = list(range(start, min(start + size, self.total)))
+        return {"ResultCount": self.total, "Replies": items}
+
+
+def test_iter_pages_parallel_keeps_offset_order():
+    client = PagedClient(total=95)
+    pages = list(iter_pages({}, page_size=10, concurrency=4, client=client))
+    items = [i for page in pages for i in page["Replies"]]
+    assert items == list(range(95))
+    assert sorted(client.offsets) == list(range(0, 95, 10))
+
+
+def test_iter_pages_respects_max_pages():
+    client = PagedClient(total=95)
+    pages = list(iter_pages({}, page_size=10, max_pages=3, concurrency=4, client=client))
+    assert len(pages) == 3
+
+
+def test_client_serves_repeat_queries_from_cache(tmp_path):
+    from scraper.cache import ResponseCache
+
+    client, calls = make_client({"Replies": [make_reply(judul="HMETD")]})
+    client.cache = ResponseCache(tmp_path / "cache.sqlite3")
+    for _ in range(2):
+        replies = fetch_replies_for_keyword("HMETD", "20240101", "20240102", client=client)
+        assert len(replies) == 1
+    assert client.stats["api_requests"] == 1
+    assert client.cache.stats["hits"] == 1
+
+
+def test_client_counts_compressed_wire_bytes():
+    class Raw:
+        def tell(self):
+            return 7
+
+    class GzipResponse(FakeResponse):
+        raw = Raw()
+
+    session = requests.Session()
+    session.get = lambda url, **kwargs: GzipResponse({"Replies": []})
+    client = IdxClient(session=session)
+    client.get_json({"keyword": "x"})
+    assert client.stats["bytes_received"] == len(b'{"Replies": []}')
+    assert client.stats["wire_bytes"] == 7
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from scraper import jsonlib
+
+DOC = {"Replies": [{"JudulPengumuman": "Ekspansi usaha é", "Id2": 7}], "ok": None}
+
+
+@pytest.mark.parametrize("name", jsonlib._BACKENDS)
+def test_backends_agree_with_stdlib(name):
+    picked, impl = jsonlib._select(name)
+    if picked != name:
+        pytest.skip(f"{name} not installed")
+    body = impl["dumps"](DOC, False)
+    assert isinstance(body, bytes)
+    assert json.loads(body) == DOC
+    assert impl["loads"](body) == DOC
+    assert impl["loads"](body.decode("utf-8")) == DOC
+    assert impl["dumps"](DOC, True).decode("utf-8") == json.dumps(
+        DOC, ensure_ascii=False, indent=2
+    )
+    with pytest.raises(ValueError):
+        impl["loads"](b"<html>challenge</html>")
+
+
+def test_read_write_json_round_trip(tmp_path):
+    path = tmp_path / "state.json"
+    jsonlib.write_json(path, DOC)
+    assert jsonlib.read_json(path) == DOC
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from scraper.jsonstream import iter_array_items
+
+
+def chunked(body: bytes, size: int):
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+PAYLOAD = {
+    "ResultCount": 12345,
+    "Replies": [
+        {"pengumuman": {"JudulPengumuman": 'Laporan [1], "kutip" {x}', "Id2": i}}
+        for i in range(5)
+    ]
+    + [{"pengumuman": {"JudulPengumuman": "Ekspansi usaha \u00e9 ñ"}}, 12, None],
+    "Tail": {"nested": [1, 2, {"Replies": "not this one"}]},
+}
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+def test_items_match_full_decode_for_any_chunking(size):
+    body = json.dumps(PAYLOAD, ensure_ascii=False).encode("utf-8")
+    meta = {}
+    items = list(iter_array_items(chunked(body, size), "Replies", meta))
+    assert items == PAYLOAD["Replies"]
+    assert meta == {"ResultCount": 12345, "Tail": PAYLOAD["Tail"]}
+
+
+def test_missing_null_and_empty_arrays():
+    assert list(iter_array_items([b"{}"])) == []
+    assert list(iter_array_items([b'{"Replies": null, "ResultCount": 0}'])) == []
+    assert list(iter_array_items([b'{"Replies": [ ]}'])) == []
+
+
+def test_items_are_yielded_before_the_stream_ends():
+    def chunks():
+        yield b'{"Replies": [{"a": 1}, '
+        raise RuntimeError("stream cut")
+
+    it = iter_array_items(chunks())
+    assert next(it) == {"a": 1}
+    with pytest.raises(RuntimeError):
+        next(it)
+
+
+def test_malformed_input_raises():
+    with pytest.raises(ValueError):
+        list(iter_array_items([b'{"Replies": [1 2]}']))
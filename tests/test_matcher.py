@@ -0,0 +1,67 @@
+from scraper.idx_api import DEFAULT_KEYWORDS
+from scraper.matcher import (
+    SEARCH_FIELD,
+    KeywordMatcher,
+    add_search_text,
+    classify_replies,
+    search_text,
+)
+
+
+def test_matcher_agrees_with_legacy_filter(synthetic_corpus, legacy_filter_reply):
+    matcher = KeywordMatcher(DEFAULT_KEYWORDS)
+    corpus = synthetic_corpus(300)
+    corpus.append({"attachments": [{"OriginalFilename": "dokumen_Penawaran_Tender.pdf"}]})
+    assert any(matcher.match_reply(r) for r in corpus)
+    for reply in corpus:
+        assert matcher.match_reply(reply) == legacy_filter_reply(reply, DEFAULT_KEYWORDS)
+
+
+def test_keywords_in_text_reports_overlapping_keywords():
+    matcher = KeywordMatcher(["Penawaran Tender", "Penawaran Tender Wajib", "MTO", "mto"])
+    assert matcher.keywords == ["Penawaran Tender", "Penawaran Tender Wajib", "MTO"]
+    found = matcher.keywords_in_text("Keterbukaan: PENAWARAN-TENDER_WAJIB (MTO)")
+    assert found == ["Penawaran Tender", "Penawaran Tender Wajib", "MTO"]
+    assert matcher.keywords_in_text("Laporan keuangan") == []
+
+
+def test_empty_keyword_list_matches_nothing():
+    matcher = KeywordMatcher(["", ""])
+    assert not matcher
+    assert not matcher.match_text("anything")
+
+
+def test_classify_replies_matches_per_reply_results(synthetic_corpus):
+    matcher = KeywordMatcher(DEFAULT_KEYWORDS)
+    corpus = synthetic_corpus(300) + [
+        {},
+        {"pengumuman": {"JudulPengumuman": "(MTO)\x1eHMETD"}},
+        {"attachments": [{"OriginalFilename": "Perjanjian_Jual_Beli.pdf"}]},
+    ]
+    mask = classify_replies(corpus, matcher)
+    assert mask == [matcher.match_reply(r) for r in corpus]
+    labels = classify_replies(corpus, matcher, keywords=True)
+    assert labels == [matcher.keywords_in_reply(r) for r in corpus]
+    assert labels[-2] == ["MTO", "HMETD"]
+    assert classify_replies([], matcher) == []
+
+
+def test_folding_of_diacritics_and_smart_quotes():
+    matcher = KeywordMatcher(["“Penawaran Tender”"])
+    assert matcher.match_text("PENAWÁRAN TÉNDER Sukarela")
+    assert matcher.match_reply(
+        {"attachments": [{"OriginalFilename": "Penawáran_Tendér.pdf"}]}
+    )
+
+
+def test_stored_search_text_is_used_without_renormalizing(synthetic_corpus):
+    matcher = KeywordMatcher(DEFAULT_KEYWORDS)
+    corpus = synthetic_corpus(200)
+    expected = classify_replies(corpus, matcher, keywords=True)
+    add_search_text(corpus)
+    assert all(r[SEARCH_FIELD] == search_text(r) for r in corpus)
+    assert classify_replies(corpus, matcher, keywords=True) == expected
+    # the stored field wins over the raw fields
+    reply = {"pengumuman": {"JudulPengumuman": "Laporan"}, SEARCH_FIELD: "hmetd"}
+    assert matcher.keywords_in_reply(reply) == ["HMETD"]
+    assert classify_replies([reply], matcher) == [True]
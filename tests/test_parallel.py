@@ -0,0 +1,47 @@
+import threading
+import time
+
+from scraper.parallel import ordered_map, split_concurrency
+
+
+def test_ordered_map_preserves_input_order():
+    def slow_square(x):
+        # later items finish first
+        time.sleep(0.01 * (5 - x))
+        return x * x
+
+    assert list(ordered_map(slow_square, range(5), concurrency=5)) == [0, 1, 4, 9, 16]
+
+
+def test_ordered_map_bounds_concurrency():
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(x):
+        with lock:
+            active.append(x)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(x)
+        return x
+
+    assert list(ordered_map(work, range(12), concurrency=3)) == list(range(12))
+    assert max(peak) <= 3
+
+
+def test_ordered_map_serial_when_concurrency_one():
+    threads = set()
+    list(ordered_map(lambda x: threads.add(threading.get_ident()), range(3), 1))
+    assert threads == {threading.get_ident()}
+
+
+def test_split_concurrency_never_exceeds_budget():
+    assert split_concurrency(8, 20) == (8, 1)
+    assert split_concurrency(8, 2) == (2, 4)
+    assert split_concurrency(1, 5) == (1, 1)
+    for budget in range(1, 10):
+        for items in range(1, 10):
+            outer, inner = split_concurrency(budget, items)
+            assert outer * inner <= budget
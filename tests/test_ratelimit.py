@@ -0,0 +1,59 @@
+import time
+
+import requests
+
+from scraper.idx_api import IdxClient
+from scraper.ratelimit import RateLimiter, parse_retry_after
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_token_bucket_limits_rate():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    # first token is free, the other five wait ~1/50 s each
+    assert time.monotonic() - start >= 0.09
+
+
+def test_backoff_delay_grows_and_honours_retry_after():
+    limiter = RateLimiter(base_delay=1, max_delay=8, jitter=0)
+    assert [limiter.backoff_delay(a) for a in range(5)] == [1, 2, 4, 8, 8]
+    assert limiter.backoff_delay(0, retry_after=3) == 3
+
+
+class Resp:
+    def __init__(self, status, headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+        self.content = b'{"Replies": []}'
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=self)
+
+    def json(self):
+        return {"Replies": []}
+
+
+def test_client_retries_429_with_retry_after():
+    statuses = [429, 200]
+    session = requests.Session()
+
+    def fake_get(url, **kwargs):
+        if "GetAnnouncement" not in url:
+            return Resp(200)
+        return Resp(statuses.pop(0), {"Retry-After": "0"})
+
+    session.get = fake_get
+    limiter = RateLimiter(rate=0)
+    client = IdxClient(session=session, rate_limiter=limiter)
+    assert client.get_json({"keyword": "x"}) == {"Replies": []}
+    assert client.stats["api_requests"] == 2
+    assert limiter.stats["backoffs"] == 1
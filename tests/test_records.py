@@ -0,0 +1,43 @@
+from export_idx_keywords_csv import collect_rows, read_rows_csv, write_rows_csv
+from scraper.records import Announcement
+
+
+def reply(id2, kode, judul, tgl):
+    return {
+        "pengumuman": {
+            "Id2": id2,
+            "Kode_Emiten": kode,
+            "JudulPengumuman": judul,
+            "TglPengumuman": tgl,
+            "PerihalPengumuman": "not kept",
+        },
+        "attachments": [],
+    }
+
+
+def test_announcement_keeps_only_exported_fields():
+    a = Announcement.from_reply(reply(7, "BBRI ", " HMETD ", "2024-01-05T08:00:00"))
+    assert not hasattr(a, "__dict__")
+    assert (a.id2, a.key) == ("7", ("BBRI", "HMETD", "2024-01-05T08:00:00"))
+    kode = "".join(["BB", "RI"])
+    b = Announcement.from_reply(reply(8, kode, "HMETD", "2024-01-05T08:00:00"))
+    assert a.kode is b.kode  # interned
+    assert a == b and len({a, b}) == 1
+
+
+def test_rows_round_trip_through_merge(tmp_path):
+    rows = []
+    collect_rows(
+        [
+            reply(1, "BBRI", "HMETD", "2024-01-05T08:00:00"),
+            reply(2, "BBRI", "HMETD", "2024-01-05T08:00:00"),
+        ],
+        rows,
+    )
+    assert all(isinstance(a, Announcement) for a in rows)
+    out = tmp_path / "out.csv"
+    # the repeated key is dropped on write
+    assert write_rows_csv(rows, out) == 1
+    newer = [Announcement("TLKM", "RUPS", "2024-02-01T08:00:00")]
+    assert write_rows_csv(newer, out, merge=True) == 2
+    assert [r["Kode_Emiten"] for r in read_rows_csv(out)] == ["TLKM", "BBRI"]
@@ -0,0 +1,97 @@
+from export_idx_keywords_csv import collect_rows, read_rows_csv, write_rows_csv
+from scraper.seen_index import CHANGED, NEW, SEEN, BloomFilter, SeenIndex
+
+
+def reply(id2, judul, tgl="2024-01-05T08:00:00"):
+    return {
+        "pengumuman": {
+            "Id2": id2,
+            "Kode_Emiten": "BBRI",
+            "JudulPengumuman": judul,
+            "TglPengumuman": tgl,
+        }
+    }
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bf = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bf.add(str(i))
+    assert all(str(i) in bf for i in range(1000))
+    false_positives = sum(str(i) in bf for i in range(1000, 11000))
+    assert false_positives < 300
+
+
+def test_index_persists_and_detects_edits(tmp_path):
+    path = tmp_path / "seen.sqlite3"
+    index = SeenIndex(path, capacity=1000)
+    assert index.check_and_add(reply("1", "HMETD")) == NEW
+    assert index.check_and_add(reply("1", "HMETD")) == SEEN
+    assert index.commit() == 1
+    index.close()
+
+    index = SeenIndex(path, capacity=1000)
+    assert len(index) == 1
+    assert index.classify(reply("1", "HMETD")) == SEEN
+    assert index.classify(reply("1", "HMETD (revisi)")) == CHANGED
+    assert index.classify(reply("2", "HMETD")) == NEW
+    index.close()
+
+    # a stale or missing filter is rebuilt from the table
+    (tmp_path / "seen.sqlite3.bloom").unlink()
+    index = SeenIndex(path, capacity=1000)
+    assert index.classify(reply("1", "HMETD")) == SEEN
+    index.close()
+
+
+def test_collect_rows_skips_ids_seen_in_earlier_runs(tmp_path):
+    path = tmp_path / "seen.sqlite3"
+    index = SeenIndex(path)
+    rows = []
+    collect_rows([reply("1", "HMETD"), reply("1", "HMETD")], rows, index=index)
+    index.commit()
+    index.close()
+    assert len(rows) == 1
+
+    index = SeenIndex(path)
+    rows = []
+    replies = [reply("1", "HMETD"), reply("1", "HMETD (revisi)"), reply("2", "RUPS")]
+    collect_rows(replies, rows, index=index)
+    index.close()
+    assert [a.judul for a in rows] == ["HMETD (revisi)", "RUPS"]
+
+
+def test_uncommitted_additions_are_dropped(tmp_path):
+    path = tmp_path / "seen.sqlite3"
+    index = SeenIndex(path, capacity=1000)
+    # e.g. the run failed before its CSV was written
+    index.check_and_add(reply("1", "HMETD"))
+    index.close()
+
+    index = SeenIndex(path, capacity=1000)
+    assert len(index) == 0
+    assert index.check_and_add(reply("1", "HMETD")) == NEW
+    index.commit()
+    index.close()
+    assert len(SeenIndex(path, capacity=1000)) == 1
+
+
+def test_changed_announcement_replaces_its_earlier_row(tmp_path):
+    path = tmp_path / "seen.sqlite3"
+    out = tmp_path / "out.csv"
+    for replies in (
+        [reply("1", "HMETD"), reply("2", "RUPS")],
+        [reply("1", "HMETD (revisi)"), reply("2", "RUPS")],
+    ):
+        index = SeenIndex(path)
+        rows = []
+        collect_rows(replies, rows, index=index)
+        write_rows_csv(rows, out, merge=True, index=index)
+        index.commit()
+        index.close()
+    assert index.changed == {"1"}
+    rows = read_rows_csv(out)
+    assert sorted((r["Id2"], r["Judul_Pengumuman"]) for r in rows) == [
+        ("1", "HMETD (revisi)"),
+        ("2", "RUPS"),
+    ]
@@ -0,0 +1,41 @@
+from scraper.sharding import calendar_windows, plan_shards, split_window
+
+
+def test_calendar_windows_month_clips_range():
+    assert calendar_windows("20240115", "20240310") == [
+        ("20240115", "20240131"),
+        ("20240201", "20240229"),
+        ("20240301", "20240310"),
+    ]
+
+
+def test_calendar_windows_year():
+    assert calendar_windows("20221201", "20240105", unit="year") == [
+        ("20221201", "20221231"),
+        ("20230101", "20231231"),
+        ("20240101", "20240105"),
+    ]
+
+
+def test_split_window():
+    assert split_window(("20240101", "20240131")) == (
+        ("20240101", "20240116"),
+        ("20240117", "20240131"),
+    )
+    assert split_window(("20240101", "20240101")) is None
+
+
+def test_plan_shards_splits_dense_windows():
+    # 10 results per day in January, nothing in February
+    def count(window):
+        start, end = int(window[0]), int(window[1])
+        if start >= 20240201:
+            return 0
+        return 10 * (min(end, 20240131) - start + 1)
+
+    shards = plan_shards("20240101", "20240229", count, threshold=100, concurrency=4)
+    assert all(c <= 100 for _, _, c in shards)
+    # newest first, contiguous coverage of January, empty February dropped
+    assert shards[0][1] == "20240131"
+    assert shards[-1][0] == "20240101"
+    assert sum(c for _, _, c in shards) == 310
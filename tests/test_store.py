@@ -0,0 +1,57 @@
+from export_idx_keywords_csv import read_rows_csv, store_export
+from scraper.matcher import KeywordMatcher
+from scraper.store import AnnouncementStore
+
+
+def _reply(id2, kode, judul, tgl, files=()):
+    return {
+        "pengumuman": {
+            "Id2": id2,
+            "Kode_Emiten": kode + " ",
+            "JudulPengumuman": judul,
+            "TglPengumuman": tgl,
+        },
+        "attachments": [{"OriginalFilename": f} for f in files],
+    }
+
+
+def test_upsert_is_idempotent_and_replaces_edits(tmp_path):
+    store = AnnouncementStore(tmp_path / "a.sqlite3")
+    store.upsert([_reply("1", "BBRI", "HMETD", "2024-03-01T08:00:00"), {}])
+    store.upsert([_reply("1", "BBRI", "HMETD (revisi)", "2024-03-01T08:00:00")])
+    assert store.count() == 1
+    assert store.stats == {"upserted": 2, "skipped": 1}
+    (reply,) = store.replies()
+    assert reply["pengumuman"]["JudulPengumuman"] == "HMETD (revisi)"
+    assert reply["pengumuman"]["Kode_Emiten"] == "BBRI"
+    store.close()
+
+
+def test_replies_filter_by_emiten_date_and_keywords(tmp_path):
+    store = AnnouncementStore(tmp_path / "a.sqlite3", batch_size=2)
+    for r in [
+        _reply("1", "BBRI", "Laporan", "2023-12-31T23:00:00", ["HMETD_2023.pdf"]),
+        _reply("2", "BBRI", "HMETD", "2024-06-01T08:00:00"),
+        _reply("3", "TLKM", "HMETD", "2024-06-02T08:00:00"),
+        _reply("4", "BBRI", "Laporan keuangan", "2024-12-31T16:00:00"),
+    ]:
+        store.add(r)
+    store.flush()
+    ids = lambda rs: [r["pengumuman"]["Id2"] for r in rs]
+    assert ids(store.replies()) == ["4", "3", "2", "1"]
+    assert ids(store.replies(kode="bbri", date_from="20240101", date_to="20241231")) == ["4", "2"]
+    hmetd = KeywordMatcher(["HMETD"])
+    assert ids(store.replies(kode="BBRI", matcher=hmetd)) == ["2", "1"]
+    store.close()
+
+
+def test_store_export_writes_csv_without_fetching(tmp_path):
+    store = AnnouncementStore(tmp_path / "a.sqlite3")
+    store.upsert([
+        _reply("1", "BBRI", "Penawaran Tender", "2024-06-01T08:00:00"),
+        _reply("2", "TLKM", "Laporan", "2024-06-02T08:00:00"),
+    ])
+    out = tmp_path / "out.csv"
+    assert store_export(store, ["Penawaran Tender"], out) == 1
+    assert read_rows_csv(out)[0]["Kode_Emiten"] == "BBRI"
+    store.close()
@@ -0,0 +1,77 @@
+from scraper.idx_api import iter_new_replies
+from scraper.watermark import NEW, OLDER, SEEN, Watermark
+
+
+def reply(id2, tgl):
+    return {"pengumuman": {"Id2": id2, "TglPengumuman": tgl}}
+
+
+def test_classify_and_commit():
+    wm = Watermark()
+    assert wm.classify(reply("a", "2025-10-13T10:00:00")) == NEW
+    wm.observe(reply("a", "2025-10-13T10:00:00"))
+    wm.observe(reply("b", "2025-10-12T09:00:00"))
+    # nothing applied until commit
+    assert wm.newest is None
+    assert wm.commit() == 2
+    assert wm.newest == "2025-10-13T10:00:00"
+    assert wm.date_from() == "20251013"
+    assert wm.classify(reply("a", "2025-10-13T10:00:00")) == SEEN
+    assert wm.classify(reply("c", "2025-10-13T10:00:00")) == NEW
+    assert wm.classify(reply("d", "2025-10-11T00:00:00")) == OLDER
+
+
+def test_observe_keeps_one_entry_per_id2():
+    wm = Watermark()
+    full = reply("a", "2025-10-13T10:00:00")
+    full["attachments"] = [{"OriginalFilename": "x.pdf"}]
+    for _ in range(3):
+        # the same announcement matched by several keywords
+        wm.observe(full)
+    wm.observe(reply("b", "2025-10-12T09:00:00"))
+    wm.observe(reply(None, "2025-10-14T07:00:00"))
+    assert wm._pending == {
+        "a": "2025-10-13T10:00:00",
+        "b": "2025-10-12T09:00:00",
+        None: "2025-10-14T07:00:00",
+    }
+    assert wm.commit() == 2
+    assert wm.newest == "2025-10-14T07:00:00"
+    assert wm.recent_ids == ["a", "b"]
+    assert wm.commit() == 0
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    path = tmp_path / "wm.json"
+    wm = Watermark()
+    wm.update([reply("a", "2025-10-13T10:00:00")])
+    wm.save(path)
+    loaded = Watermark.load(path)
+    assert loaded.newest == "2025-10-13T10:00:00"
+    assert loaded.classify(reply("a", "2025-10-13T10:00:00")) == SEEN
+    assert Watermark.load(tmp_path / "missing.json").newest is None
+
+
+class NewestFirstClient:
+    def __init__(self, replies):
+        self.replies = replies
+        self.requests = 0
+
+    def get_json(self, params):
+        self.requests += 1
+        start = int(params["indexFrom"])
+        size = int(params["pageSize"])
+        return {
+            "ResultCount": len(self.replies),
+            "Replies": self.replies[start : start + size],
+        }
+
+
+def test_iter_new_replies_stops_at_watermark():
+    replies = [reply(str(i), "2025-10-%02dT08:00:00" % (30 - i)) for i in range(25)]
+    wm = Watermark()
+    wm.update([replies[3]])  # newest known is the 4th newest item
+    client = NewestFirstClient(replies)
+    new = list(iter_new_replies({}, wm, page_size=10, client=client))
+    assert [r["pengumuman"]["Id2"] for r in new] == ["0", "1", "2"]
+    assert client.requests == 1